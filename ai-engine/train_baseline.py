@@ -0,0 +1,246 @@
+"""
+Train the baseline zone risk model served by the backend
+(app.core.inference.LogisticRiskModel).
+
+Samples are per-zone feature vectors over fixed windows of
+location_events (same FEATURES as the live scorer); the label is
+"an SOS was raised in this zone during the next window". --feature-store
+reads the rows the backend materialized (zone_activity_v2), i.e. the
+exact values served at the time; --synthetic generates a simulated
+history instead of reading the database.
+
+    python train_baseline.py [--window-minutes 10] [--days 30] [--feature-store | --synthetic]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND)
+
+from app.core.feature_vector import FEATURES, feature_vector  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "zone_risk_baseline.json")
+
+
+# --------------------------------
+# Samples
+# --------------------------------
+def _new_totals():
+    # count, rssi_sum, rssi_sq_sum, rssi_count, sos, devices, tourists
+    return [0, 0.0, 0.0, 0, 0, set(), set()]
+
+
+def _samples(windows: dict):
+    """
+    {(zone_id, window index): totals} -> X, y. A window's label is
+    whether the same zone raised an SOS in the following window.
+    """
+    X, y = [], []
+    for (zone_id, index), totals in windows.items():
+        following = windows.get((zone_id, index + 1))
+        count, rssi_sum, rssi_sq_sum, rssi_count, sos, devices, tourists = totals
+        X.append(feature_vector((count, rssi_sum, rssi_sq_sum, rssi_count, sos, len(devices), len(tourists))))
+        y.append(1.0 if following and following[4] else 0.0)
+    return np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64)
+
+
+def load_history(window_minutes: int, days: int):
+    from sqlalchemy import select
+
+    from app.database import SessionLocal
+    from app.models.location_event import LocationEvent
+
+    table = LocationEvent.__table__
+    since = datetime.utcnow() - timedelta(days=days)
+    width = window_minutes * 60
+    windows = {}
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(
+                table.c.zone_id, table.c.device_id, table.c.tourist_id,
+                table.c.rssi, table.c.sos_flag, table.c.timestamp,
+            )
+            .where(table.c.timestamp >= since, table.c.zone_id.is_not(None))
+            .execution_options(yield_per=50000)
+        )
+        for zone_id, device_id, tourist_id, rssi, sos, ts in result:
+            key = (zone_id, int(ts.timestamp() // width))
+            totals = windows.get(key)
+            if totals is None:
+                totals = windows[key] = _new_totals()
+            totals[0] += 1
+            if rssi is not None:
+                totals[1] += rssi
+                totals[2] += rssi * rssi
+                totals[3] += 1
+            if sos:
+                totals[4] += 1
+            totals[5].add(device_id)
+            if tourist_id is not None:
+                totals[6].add(tourist_id)
+    finally:
+        db.close()
+
+    return _samples(windows)
+
+
+def load_feature_store(days: int):
+    """
+    Samples from materialized zone_activity_v2 rows. The label comes
+    from the same zone's row one window later (no row: no activity,
+    so no SOS), so features and labels never overlap in time.
+    """
+    from app.database import SessionLocal
+    from app.services.feature_store import get_feature_set, rows_between, watermark
+
+    feature_set = get_feature_set("zone_activity_v2")
+    sos = FEATURES.index("sos_count")
+
+    db = SessionLocal()
+    try:
+        last = watermark(db, feature_set)
+        if last is None:
+            return np.empty((0, len(FEATURES))), np.empty(0)
+        rows = {
+            (zone_id, as_of): values
+            for zone_id, as_of, values in rows_between(
+                db, feature_set, last - timedelta(days=days), last + feature_set.interval
+            )
+        }
+    finally:
+        db.close()
+
+    X, y = [], []
+    for (zone_id, as_of), values in rows.items():
+        # The following window is only known once it was materialized
+        if as_of + feature_set.window > last:
+            continue
+        following = rows.get((zone_id, as_of + feature_set.window))
+        X.append(values)
+        y.append(1.0 if following and following[sos] else 0.0)
+    return np.asarray(X, dtype=np.float64).reshape(-1, len(FEATURES)), np.asarray(y, dtype=np.float64)
+
+
+def synthetic_history(zones: int = 300, windows_per_zone: int = 200, seed: int = 7):
+    """
+    Crowded zones and zones with recent SOS activity are more likely
+    to raise an SOS next; enough structure to sanity-check the pipeline.
+    """
+    rng = random.Random(seed)
+    windows = {}
+    for zone_id in range(zones):
+        popularity = rng.lognormvariate(2.5, 1.0)
+        hot = 0.0
+        for index in range(windows_per_zone):
+            crowd = max(1, int(rng.gauss(popularity, popularity / 3)))
+            totals = _new_totals()
+            # Probability of at least one SOS in this window
+            sos_p = min(0.01 * crowd ** 0.5 + hot, 0.5)
+            for _ in range(crowd * 3):
+                rssi = rng.uniform(-95, -40)
+                totals[0] += 1
+                totals[1] += rssi
+                totals[2] += rssi * rssi
+                totals[3] += 1
+                if rng.random() < sos_p / (crowd * 3):
+                    totals[4] += 1
+                totals[5].add(rng.randrange(crowd))
+                totals[6].add(rng.randrange(crowd))
+            hot = 0.15 if totals[4] else hot * 0.5
+            windows[(zone_id, index)] = totals
+    return _samples(windows)
+
+
+# --------------------------------
+# Logistic regression (standardized, L2, full-batch gradient descent)
+# --------------------------------
+def train(X, y, epochs: int = 2000, lr: float = 0.5, l2: float = 1e-3):
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Z = (X - mean) / std
+
+    # Rare positives: weight them up so the model does not just predict 0
+    positive = max(y.mean(), 1e-6)
+    sample_weight = np.where(y == 1, 0.5 / positive, 0.5 / max(1 - positive, 1e-6))
+
+    w = np.zeros(Z.shape[1])
+    b = 0.0
+    n = len(y)
+    for _ in range(epochs):
+        p = 1.0 / (1.0 + np.exp(-(Z @ w + b)))
+        error = (p - y) * sample_weight
+        w -= lr * (Z.T @ error / n + l2 * w)
+        b -= lr * error.sum() / n
+    return mean, std, w, b
+
+
+def evaluate(X, y, mean, std, w, b) -> dict:
+    p = 1.0 / (1.0 + np.exp(-(((X - mean) / std) @ w + b)))
+    order = np.argsort(p)
+    ranks = np.empty(len(p))
+    ranks[order] = np.arange(1, len(p) + 1)
+    positives = y.sum()
+    negatives = len(y) - positives
+    auc = (ranks[y == 1].sum() - positives * (positives + 1) / 2) / (positives * negatives) if positives and negatives else None
+    return {"auc": None if auc is None else round(float(auc), 4), "positive_rate": round(float(y.mean()), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--window-minutes", type=int, default=10)
+    parser.add_argument("--days", type=int, default=30)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--feature-store", action="store_true")
+    source.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        X, y = synthetic_history()
+    elif args.feature_store:
+        # Materialized with the feature set's own window
+        from app.services.feature_store import get_feature_set
+
+        X, y = load_feature_store(args.days)
+        args.window_minutes = get_feature_set("zone_activity_v2").window_minutes
+    else:
+        X, y = load_history(args.window_minutes, args.days)
+    if len(y) == 0 or y.min() == y.max():
+        sys.exit("Need windows with and without a following SOS to train; try --synthetic")
+
+    # Chronology is not preserved across zones, so hold out a random 20%
+    rng = np.random.default_rng(7)
+    test = rng.random(len(y)) < 0.2
+    mean, std, w, b = train(X[~test], y[~test])
+
+    spec = {
+        "name": "zone-risk-logistic-v1",
+        "features": list(FEATURES),
+        "mean": mean.tolist(),
+        "std": std.tolist(),
+        "weights": w.tolist(),
+        "bias": float(b),
+        "window_minutes": args.window_minutes,
+        "trained_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "samples": int(len(y)),
+        "source": "synthetic" if args.synthetic else "feature_store" if args.feature_store else "location_events",
+        "metrics": evaluate(X[test], y[test], mean, std, w, b),
+    }
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(spec, f, indent=2)
+    print(f"{spec['samples']} samples, holdout {spec['metrics']} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
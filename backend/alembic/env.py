@@ -15,8 +15,16 @@ from app.models.user import User
 from app.models.incident import Incident
 from app.models.location import Location
 from app.models.location_event import LocationEvent
+from app.models.location_rollup import LocationRollup
+from app.models.zone_density_sketch import ZoneDensitySketch
+from app.models.feature_row import FeatureRow
+from app.models.feature_watermark import FeatureWatermark
 from app.models.iot_device import IoTDevice
+from app.models.sos_event import SOSEvent
+from app.models.notification import Notification
+from app.models.escalation import Escalation
 from app.models.zone_status import ZoneStatus
+from app.models.token_revocation import TokenRevocation
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,43 @@
+"""add_token_revocations
+
+Revision ID: 9b1e4c2d7f10
+Revises: 328a17d83031
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4c2d7f10'
+down_revision: Union[str, Sequence[str], None] = '328a17d83031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'token_revocations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=64), nullable=True),
+        sa.Column('subject', sa.String(length=255), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti'),
+    )
+    op.create_index(op.f('ix_token_revocations_subject'), 'token_revocations', ['subject'], unique=False)
+    op.create_index(op.f('ix_token_revocations_revoked_at'), 'token_revocations', ['revoked_at'], unique=False)
+    op.create_index(op.f('ix_token_revocations_expires_at'), 'token_revocations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_token_revocations_expires_at'), table_name='token_revocations')
+    op.drop_index(op.f('ix_token_revocations_revoked_at'), table_name='token_revocations')
+    op.drop_index(op.f('ix_token_revocations_subject'), table_name='token_revocations')
+    op.drop_table('token_revocations')
@@ -0,0 +1,49 @@
+"""add_escalations
+
+Revision ID: b6d3f8a1c2e4
+Revises: a5c2e7f9d1b3
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d3f8a1c2e4'
+down_revision: Union[str, Sequence[str], None] = 'a5c2e7f9d1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('incidents', sa.Column('severity', sa.String(length=20), server_default='medium', nullable=False))
+    op.create_table(
+        'escalations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('ref', sa.String(length=32), nullable=False),
+        sa.Column('tourist_id', sa.Integer(), nullable=True),
+        sa.Column('zone_id', sa.Integer(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('next_tier', sa.Integer(), nullable=False),
+        sa.Column('next_at', sa.DateTime(), nullable=True),
+        sa.Column('opened_at', sa.DateTime(), nullable=False),
+        sa.Column('acknowledged_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'ref', name='uq_escalations_kind_ref'),
+    )
+    op.create_index('ix_escalations_status_next_at', 'escalations', ['status', 'next_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_escalations_status_next_at', table_name='escalations')
+    op.drop_table('escalations')
+    op.drop_column('incidents', 'severity')
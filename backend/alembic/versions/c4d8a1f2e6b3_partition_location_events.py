@@ -0,0 +1,145 @@
+"""partition_location_events
+
+Revision ID: c4d8a1f2e6b3
+Revises: 9b1e4c2d7f10
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+from app.services.partition_service import ensure_partitions
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8a1f2e6b3'
+down_revision: Union[str, Sequence[str], None] = '9b1e4c2d7f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, tourist_id, device_id, zone_id, rssi, latitude, longitude, source, sos_flag, timestamp"
+
+LEGACY_INDEXES = ('id', 'tourist_id', 'device_id', 'zone_id', 'source', 'timestamp')
+COMPOSITE_INDEXES = {
+    'ix_location_events_tourist_id_timestamp': ['tourist_id', 'timestamp'],
+    'ix_location_events_zone_id_timestamp': ['zone_id', 'timestamp'],
+}
+
+
+def _event_columns():
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tourist_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('device_id', sa.String(length=50), nullable=False),
+        sa.Column('zone_id', sa.Integer(), nullable=True),
+        sa.Column('rssi', sa.Float(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('sos_flag', sa.Boolean(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+    ]
+
+
+def _drop_legacy_indexes(table: str) -> None:
+    existing = {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+    for column in LEGACY_INDEXES:
+        name = f'ix_location_events_{column}'
+        if name in existing:
+            op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    has_events = sa.inspect(bind).has_table('location_events')
+
+    op.create_table(
+        'location_rollups',
+        sa.Column('zone_id', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('event_count', sa.Integer(), nullable=False),
+        sa.Column('tourist_count', sa.Integer(), nullable=False),
+        sa.Column('sos_count', sa.Integer(), nullable=False),
+        sa.Column('rssi_sum', sa.Float(), nullable=False),
+        sa.Column('rssi_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('zone_id', 'bucket'),
+    )
+
+    if bind.dialect.name != 'postgresql':
+        # SQLite fallback: one table, fewer indexes, retention by row deletes
+        if has_events:
+            _drop_legacy_indexes('location_events')
+        else:
+            op.create_table('location_events', *_event_columns(), sa.PrimaryKeyConstraint('id'))
+        for name, columns in COMPOSITE_INDEXES.items():
+            op.create_index(name, 'location_events', columns, unique=False)
+        return
+
+    if has_events:
+        _drop_legacy_indexes('location_events')
+        op.rename_table('location_events', 'location_events_legacy')
+        op.execute("ALTER TABLE location_events_legacy ALTER COLUMN id DROP DEFAULT")
+        op.execute("ALTER SEQUENCE IF EXISTS location_events_id_seq OWNED BY NONE")
+        op.execute("ALTER TABLE location_events_legacy DROP CONSTRAINT IF EXISTS location_events_pkey")
+    op.execute("CREATE SEQUENCE IF NOT EXISTS location_events_id_seq")
+
+    # The partition key has to be part of the primary key
+    op.create_table(
+        'location_events',
+        *_event_columns(),
+        sa.PrimaryKeyConstraint('id', 'timestamp', name='location_events_pkey'),
+        postgresql_partition_by='RANGE (timestamp)',
+    )
+    op.execute("ALTER TABLE location_events ALTER COLUMN id SET DEFAULT nextval('location_events_id_seq')")
+    op.execute("ALTER SEQUENCE location_events_id_seq OWNED BY location_events.id")
+    for name, columns in COMPOSITE_INDEXES.items():
+        op.create_index(name, 'location_events', columns, unique=False)
+
+    now = datetime.utcnow()
+    start = now - timedelta(days=1)
+    if has_events:
+        oldest = bind.execute(sa.text("SELECT min(timestamp) FROM location_events_legacy")).scalar()
+        if oldest is not None:
+            start = max(min(start, oldest), now - timedelta(days=settings.LOCATION_RETENTION_DAYS))
+    # Older rows land in the default partition; maintenance rolls them up
+    ensure_partitions(bind, start, now + timedelta(days=settings.LOCATION_PARTITIONS_AHEAD + 1))
+
+    if has_events:
+        op.execute(f"INSERT INTO location_events ({COLUMNS}) SELECT {COLUMNS} FROM location_events_legacy")
+        op.execute("SELECT setval('location_events_id_seq', coalesce((SELECT max(id) FROM location_events), 0) + 1, false)")
+        op.drop_table('location_events_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name != 'postgresql':
+        for name in COMPOSITE_INDEXES:
+            op.drop_index(name, table_name='location_events')
+        for column in LEGACY_INDEXES:
+            op.create_index(f'ix_location_events_{column}', 'location_events', [column], unique=False)
+        op.drop_table('location_rollups')
+        return
+
+    op.rename_table('location_events', 'location_events_partitioned')
+    op.execute("ALTER TABLE location_events_partitioned ALTER COLUMN id DROP DEFAULT")
+    op.execute("ALTER SEQUENCE location_events_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE location_events_partitioned DROP CONSTRAINT location_events_pkey")
+    for name in COMPOSITE_INDEXES:
+        op.drop_index(name, table_name='location_events_partitioned')
+
+    op.create_table('location_events', *_event_columns(), sa.PrimaryKeyConstraint('id'))
+    op.execute("ALTER TABLE location_events ALTER COLUMN id SET DEFAULT nextval('location_events_id_seq')")
+    op.execute("ALTER SEQUENCE location_events_id_seq OWNED BY location_events.id")
+    for column in LEGACY_INDEXES:
+        op.create_index(f'ix_location_events_{column}', 'location_events', [column], unique=False)
+
+    op.execute(f"INSERT INTO location_events ({COLUMNS}) SELECT {COLUMNS} FROM location_events_partitioned")
+    op.drop_table('location_events_partitioned')
+    op.drop_table('location_rollups')
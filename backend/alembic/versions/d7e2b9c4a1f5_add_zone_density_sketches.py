@@ -0,0 +1,39 @@
+"""add_zone_density_sketches
+
+Revision ID: d7e2b9c4a1f5
+Revises: c4d8a1f2e6b3
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e2b9c4a1f5'
+down_revision: Union[str, Sequence[str], None] = 'c4d8a1f2e6b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'zone_density_sketches',
+        sa.Column('zone_id', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+        sa.Column('devices', sa.LargeBinary(), nullable=False),
+        sa.Column('tourists', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('zone_id', 'bucket'),
+    )
+    op.create_index(op.f('ix_zone_density_sketches_bucket'), 'zone_density_sketches', ['bucket'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_zone_density_sketches_bucket'), table_name='zone_density_sketches')
+    op.drop_table('zone_density_sketches')
@@ -0,0 +1,48 @@
+"""add_feature_store
+
+Revision ID: e3a9f1c7b2d4
+Revises: d7e2b9c4a1f5
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9f1c7b2d4'
+down_revision: Union[str, Sequence[str], None] = 'd7e2b9c4a1f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'feature_rows',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('feature_set', sa.String(length=64), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('as_of', sa.DateTime(), nullable=False),
+        sa.Column('values', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_feature_rows_set_entity_as_of', 'feature_rows', ['feature_set', 'entity_id', 'as_of'], unique=False)
+    op.create_index('ix_feature_rows_set_as_of', 'feature_rows', ['feature_set', 'as_of'], unique=False)
+    op.create_table(
+        'feature_watermarks',
+        sa.Column('feature_set', sa.String(length=64), nullable=False),
+        sa.Column('first_as_of', sa.DateTime(), nullable=True),
+        sa.Column('as_of', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('feature_set'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('feature_watermarks')
+    op.drop_index('ix_feature_rows_set_as_of', table_name='feature_rows')
+    op.drop_index('ix_feature_rows_set_entity_as_of', table_name='feature_rows')
+    op.drop_table('feature_rows')
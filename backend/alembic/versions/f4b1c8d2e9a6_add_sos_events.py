@@ -0,0 +1,48 @@
+"""add_sos_events
+
+Revision ID: f4b1c8d2e9a6
+Revises: e3a9f1c7b2d4
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b1c8d2e9a6'
+down_revision: Union[str, Sequence[str], None] = 'e3a9f1c7b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sos_events',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('location_event_id', sa.Integer(), nullable=True),
+        sa.Column('tourist_id', sa.Integer(), nullable=True),
+        sa.Column('device_id', sa.String(length=50), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('located_at', sa.DateTime(), nullable=True),
+        sa.Column('received_at', sa.DateTime(), nullable=False),
+        sa.Column('broadcast_at', sa.DateTime(), nullable=True),
+        sa.Column('persisted_at', sa.DateTime(), nullable=True),
+        sa.Column('acknowledged_at', sa.DateTime(), nullable=True),
+        sa.Column('acknowledged_by', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['tourist_id'], ['users.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['acknowledged_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_sos_events_received_at'), 'sos_events', ['received_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sos_events_received_at'), table_name='sos_events')
+    op.drop_table('sos_events')
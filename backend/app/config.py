@@ -1,11 +1,168 @@
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the asyncpg / aiosqlite driver
+    ASYNC_DATABASE_URL: str | None = None
+    # Comma-separated read-replica URLs for dashboard / aggregation reads
+    DATABASE_REPLICA_URLS: str = ""
+
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 60
 
+    # Verified-token / principal caches in get_current_principal
+    AUTH_CACHE_MAX_ENTRIES: int = 100000
+    AUTH_PRINCIPAL_TTL_SECONDS: int = 300
+
+    # How often each worker pulls revocations made by other workers
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 5
+
+    # Password hashing (0 workers = hash inline on the event loop)
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Rows per validate / hash / insert transaction in bulk imports
+    BULK_IMPORT_BATCH_SIZE: int = 500
+
+    # WebSocket topic routing
+    WS_GRID_CELL_DEG: float = 0.05
+
+    # location_events partitioning (PostgreSQL) and retention
+    LOCATION_PARTITION_INTERVAL: str = "day"  # day / hour
+    LOCATION_PARTITIONS_AHEAD: int = 2
+    LOCATION_RETENTION_DAYS: int = 30
+    LOCATION_MAINTENANCE_SECONDS: int = 3600
+
+    # Sliding-window zone features (per-process, fed by ingestion).
+    # Only enable with a single worker: with several, each window sees
+    # a fraction of the pings and the one worker holding the scoring
+    # lock would score zones from its share alone. Off = SQL path.
+    ZONE_FEATURES_STREAMING: bool = False
+    ZONE_FEATURE_BUCKET_SECONDS: int = 60
+    ZONE_FEATURE_MAX_WINDOW_MINUTES: int = 60
+
+    # Per-bucket HyperLogLog crowd-density sketches (standard error
+    # 1.04 / sqrt(2 ** precision), ~2.3% at 11); persisted for history
+    ZONE_SKETCH_PRECISION: int = 11
+    ZONE_SKETCH_PERSIST_SECONDS: int = 30
+    ZONE_SKETCH_RETENTION_DAYS: int = 7
+
+    # SOS fast lane: reserved threads (and as many connections) so an
+    # SOS never queues behind routine pings
+    SOS_WORKERS: int = 2
+    SOS_DEVICE_CACHE_SECONDS: int = 60
+    SOS_LATENCY_WINDOW: int = 1000  # recent SOS per stage for p50 / p99
+    SOS_DEDUP_SECONDS: int = 30  # device retries within this window repeat the first SOS
+
+    # Notification outbox and dispatcher
+    NOTIFY_ENABLED: bool = True
+    NOTIFY_PROVIDERS: str = "local"  # comma-separated channels to dispatch
+    NOTIFY_DEFAULT_CHANNEL: str = "local"
+    NOTIFY_WORKERS: int = 4  # concurrent provider calls per process
+    NOTIFY_CLAIM_BATCH: int = 500  # max rows leased per channel per poll
+    NOTIFY_POLL_SECONDS: float = 2
+    NOTIFY_SEND_TIMEOUT_SECONDS: float = 10
+    NOTIFY_LEASE_SECONDS: int = 120  # claimed rows return to the queue after this
+    NOTIFY_MAX_ATTEMPTS: int = 6
+    NOTIFY_RETRY_BASE_SECONDS: float = 5  # doubled per attempt, jittered
+    NOTIFY_RETRY_MAX_SECONDS: float = 900
+    NOTIFY_RETENTION_DAYS: int = 7  # sent / failed rows
+    NOTIFY_LOCAL_MAX_BATCH: int = 100
+    NOTIFY_LOCAL_FAILURE_RATE: float = 0.0
+
+    # Escalation of SOS / high-severity incidents until acknowledged.
+    # Tiers are audience:seconds-after-opening, audiences being
+    # zone_operators, authorities and emergency_contact; a tier that
+    # reaches nobody falls through to the next one at once
+    ESCALATION_ENABLED: bool = True
+    ESCALATION_TIERS: str = "zone_operators:0,authorities:60,emergency_contact:120"
+    ESCALATION_INCIDENT_SEVERITIES: str = "high,critical"
+    ESCALATION_ZONE_OPERATORS: Dict[int, List[int]] = {}  # zone_id -> user ids (JSON)
+    ESCALATION_CHANNEL: str = "local"  # authorities and zone operators
+    ESCALATION_CONTACT_CHANNEL: str = "local"  # emergency contact numbers; "sms" once configured
+    ESCALATION_DEDUP_SECONDS: int = 300  # one alert per recipient per escalation; outlive the last tier
+    ESCALATION_RATE_LIMIT: int = 10  # alerts per recipient per window
+    ESCALATION_RATE_WINDOW_SECONDS: int = 600
+    ESCALATION_SYNC_SECONDS: float = 15
+
+    # Periodic zone risk scoring
+    RISK_SCORING_ENABLED: bool = True
+    RISK_SCORING_INTERVAL_SECONDS: float = 30
+    RISK_FEATURE_WINDOW_MINUTES: int = 10
+
+    # Zone status snapshot: how often each worker pulls rows written
+    # by other workers
+    ZONE_STATUS_SYNC_SECONDS: float = 5
+
+    # Feature store: materialized zone / tourist feature rows
+    FEATURE_STORE_ENABLED: bool = True
+    FEATURE_STORE_POLL_SECONDS: int = 60
+    FEATURE_STORE_BACKFILL_HOURS: int = 24
+    # Rows are append-only: a tick is only written once device-timestamped
+    # events that arrive late (offline buffering, retries) are in
+    FEATURE_STORE_LATENESS_SECONDS: int = 600
+    FEATURE_STORE_RETENTION_DAYS: int = 90
+
+    # Risk model (defaults to ai-engine/models/zone_risk_baseline.json)
+    RISK_MODEL_PATH: str | None = None
+    INFERENCE_MAX_BATCH: int = 256
+    INFERENCE_MAX_WAIT_MS: float = 5
+
+    # Cold-tier trajectory archive (0 days = disabled); keep it
+    # shorter than the retention window or retention drops rows first
+    ARCHIVE_AFTER_DAYS: int = 7
+    ARCHIVE_DIR: str = "archive/location_events"
+
+    # Rows per Parquet row group / Arrow batch in event exports
+    EXPORT_ROW_GROUP_SIZE: int = 50000
+
+    # Cross-worker broadcast backplane: local / unix / redis
+    WS_BACKPLANE: str = "local"
+    WS_BACKPLANE_SOCKET_DIR: str = "/tmp/sts-backplane"
+    WS_BACKPLANE_CHANNEL: str = "sts:broadcast"
+    WS_BACKPLANE_MAX_BYTES: int = 65536
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Dashboard stream resume
+    WS_REPLAY_BUFFER_SIZE: int = 1000
+    WS_SNAPSHOT_MAX_ENTITIES: int = 50000
+
+    # Frames at least this large are deflated for clients that opt in
+    WS_COMPRESS_MIN_BYTES: int = 1024
+
+    # Live map position stream
+    POSITION_STREAM_MAX_HZ: float = 1.0
+    POSITION_GRID_CELL_DEG: float = 0.01
+    POSITION_CLUSTER_BELOW_ZOOM: int = 13
+    POSITION_TTL_SECONDS: int = 900
+
+    # Streaming trajectory anomaly detection (per-process state)
+    ANOMALY_DETECTION_ENABLED: bool = True
+    ANOMALY_MAX_TOURISTS: int = 100_000  # ~450 bytes each
+    ANOMALY_WARMUP_POINTS: int = 20
+    ANOMALY_SPEED_MPS: float = 7.0  # sustained; ~25 km/h
+    ANOMALY_STRAY_METERS: float = 3000
+    ANOMALY_STRAY_Z: float = 4.0
+    ANOMALY_IDLE_MINUTES: int = 60
+    ANOMALY_REST_MINUTES: int = 240  # a stop this long marks a rest place
+    ANOMALY_COOLDOWN_MINUTES: int = 30
+    ANOMALY_SWEEP_SECONDS: int = 60
+    # Pings are timed by the server clock on arrival; device-timestamped
+    # IoT pings older than this (offline buffers) are not checked
+    ANOMALY_MAX_LAG_SECONDS: int = 120
+    # Also open an incident per anomaly (otherwise WebSocket alert only)
+    ANOMALY_CREATE_INCIDENTS: bool = False
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,81 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The few user fields authorization needs, cached between requests.
+    """
+    id: int
+    email: str
+    role: str
+
+
+class ExpiringCache:
+    """
+    Thread-safe LRU map whose entries carry their own expiry time.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, expires_at: float):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Verified JWT payloads, keyed by token digest, valid until `exp`
+token_cache = ExpiringCache(settings.AUTH_CACHE_MAX_ENTRIES)
+
+# email -> Principal; the TTL bounds staleness across workers
+principal_cache = ExpiringCache(settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def cache_principal(principal: Principal):
+    principal_cache.set(
+        principal.email,
+        principal,
+        time.time() + settings.AUTH_PRINCIPAL_TTL_SECONDS,
+    )
+
+
+def invalidate_principal(email: str):
+    """
+    Call whenever a user's profile or role changes.
+    """
+    principal_cache.pop(email)
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import socket
+from pathlib import Path
+from typing import Callable
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Called with the raw encoded envelope for every message from a peer
+OnMessage = Callable[[bytes], None]
+
+# Redis resubscribe backoff (seconds), doubled per failed attempt
+_RETRY_MIN = 0.5
+_RETRY_MAX = 30.0
+
+
+# =========================================================
+# Base / In-Process
+# =========================================================
+class Backplane:
+    """
+    Pub/sub channel that carries encoded broadcasts between workers.
+
+    The base class is the single-process backplane: nothing leaves
+    this worker. Delivery is at-most-once for every implementation,
+    a publish that cannot be delivered is dropped, never retried.
+    """
+
+    # False: no peers, so broadcasts are not published at all
+    shared = False
+
+    async def start(self, on_message: OnMessage) -> None:
+        pass
+
+    async def publish(self, payload: bytes) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+# =========================================================
+# Unix Datagram Sockets (single host, many workers)
+# =========================================================
+class UnixSocketBackplane(Backplane):
+    """
+    Every worker binds one datagram socket inside a shared directory
+    and publishes by sending the payload to all other sockets there.
+    """
+
+    shared = True
+
+    def __init__(self, socket_dir: str, name: str | None = None):
+        self.socket_dir = Path(socket_dir)
+        self.path = self.socket_dir / f"{name or os.getpid()}.sock"
+        self._sock: socket.socket | None = None
+
+    async def start(self, on_message: OnMessage) -> None:
+        self.socket_dir.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(self.path))
+        sock.setblocking(False)
+        self._sock = sock
+
+        def _readable():
+            while True:
+                try:
+                    payload = sock.recv(settings.WS_BACKPLANE_MAX_BYTES)
+                except (BlockingIOError, InterruptedError):
+                    return
+                on_message(payload)
+
+        asyncio.get_running_loop().add_reader(sock.fileno(), _readable)
+
+    async def publish(self, payload: bytes) -> None:
+        if not self._sock:
+            return
+
+        for peer in self.socket_dir.glob("*.sock"):
+            if peer == self.path:
+                continue
+            try:
+                self._sock.sendto(payload, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Worker exited without cleaning up its socket
+                peer.unlink(missing_ok=True)
+            except BlockingIOError:
+                logger.warning("Backplane peer %s is full, dropping message", peer.name)
+            except OSError as exc:
+                logger.warning("Backplane send to %s failed: %s", peer.name, exc)
+
+    async def stop(self) -> None:
+        if not self._sock:
+            return
+        asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        self.path.unlink(missing_ok=True)
+
+
+# =========================================================
+# Redis Pub/Sub (many hosts)
+# =========================================================
+class RedisBackplane(Backplane):
+    """
+    Publishes on a Redis channel. Any client exposing the
+    `redis.asyncio` interface (`publish`, `pubsub().subscribe/listen`)
+    works, so a local stand-in such as fakeredis can be injected.
+    """
+
+    shared = True
+
+    def __init__(self, url: str | None = None, channel: str = "sts:broadcast", client=None):
+        self.url = url
+        self.channel = channel
+        self._client = client
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, on_message: OnMessage) -> None:
+        if self._client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as exc:
+                raise RuntimeError(
+                    "WS_BACKPLANE=redis requires the 'redis' package"
+                ) from exc
+            self._client = redis.from_url(self.url)
+
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._task = asyncio.create_task(self._listen(on_message))
+
+    async def _listen(self, on_message: OnMessage) -> None:
+        """
+        Deliver channel messages until cancelled. A lost connection
+        (or a listen() that ends) resubscribes with backoff; messages
+        published meanwhile are lost, as with any at-most-once peer.
+        """
+        delay = _RETRY_MIN
+        while True:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self._client.pubsub()
+                    await self._pubsub.subscribe(self.channel)
+                    logger.info("Redis backplane resubscribed to %s", self.channel)
+
+                async for item in self._pubsub.listen():
+                    delay = _RETRY_MIN
+                    if item.get("type") != "message":
+                        continue
+                    try:
+                        on_message(item["data"])
+                    except Exception:
+                        logger.exception("Redis backplane message dropped")
+                raise ConnectionError("pub/sub stream ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Redis backplane subscription lost (%s), retrying in %.1fs", exc, delay)
+                await self._close_pubsub()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _RETRY_MAX)
+
+    async def _close_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.aclose()
+        except Exception:
+            pass
+
+    async def publish(self, payload: bytes) -> None:
+        try:
+            await self._client.publish(self.channel, payload)
+        except Exception as exc:
+            logger.warning("Redis backplane publish failed: %s", exc)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(self.channel)
+            except Exception as exc:
+                logger.warning("Redis backplane unsubscribe failed: %s", exc)
+            await self._close_pubsub()
+
+
+# =========================================================
+# Factory
+# =========================================================
+def create_backplane() -> Backplane:
+    kind = settings.WS_BACKPLANE
+
+    if kind == "unix":
+        return UnixSocketBackplane(settings.WS_BACKPLANE_SOCKET_DIR)
+    if kind == "redis":
+        return RedisBackplane(settings.REDIS_URL, settings.WS_BACKPLANE_CHANNEL)
+    if kind == "local":
+        return Backplane()
+
+    raise ValueError(f"Unknown WS_BACKPLANE: {kind}")
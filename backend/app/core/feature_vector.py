@@ -0,0 +1,46 @@
+from typing import List
+
+# No app imports: ai-engine/train_baseline.py uses this module without
+# the backend's settings or database.
+
+# Column order of every feature vector / matrix row
+FEATURES = (
+    "event_count",
+    "avg_rssi",
+    "rssi_var",
+    "unique_devices",
+    "unique_tourists",
+    "sos_count",
+    "sos_rate",
+)
+
+# Counts: floats in the model matrix, ints in API responses
+COUNT_FEATURES = frozenset({"event_count", "unique_devices", "unique_tourists", "sos_count"})
+
+# Per-tourist features over a window (feature store)
+TOURIST_FEATURES = (
+    "event_count",
+    "zone_count",
+    "sos_count",
+    "avg_rssi",
+    "seconds_since_seen",
+)
+
+
+def feature_vector(totals: tuple) -> List[float]:
+    """
+    (count, rssi_sum, rssi_sq_sum, rssi_count, sos, unique devices,
+    unique tourists) -> values in FEATURES order.
+    """
+    count, rssi_sum, rssi_sq_sum, rssi_count, sos, devices, tourists = totals
+    mean = rssi_sum / rssi_count if rssi_count else 0.0
+    variance = max(rssi_sq_sum / rssi_count - mean * mean, 0.0) if rssi_count else 0.0
+    return [
+        float(count),
+        mean,
+        variance,
+        float(devices),
+        float(tourists),
+        float(sos),
+        sos / count if count else 0.0,
+    ]
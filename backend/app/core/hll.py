@@ -0,0 +1,158 @@
+import hashlib
+import math
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+_VERSION = 1
+_SPARSE = 0
+_DENSE = 1
+
+# 2 ** -rank for every possible register value
+_INVERSE_POWERS = tuple(2.0 ** -rank for rank in range(65))
+_INVERSE_POWERS_NP = None if np is None else np.array(_INVERSE_POWERS)
+
+
+def _hash64(value) -> int:
+    # Stable across processes (unlike hash()), so persisted sketches merge
+    digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch with 2 ** precision registers and a
+    standard error of about 1.04 / sqrt(2 ** precision).
+
+    Small sketches stay sparse (register -> rank) and switch to a dense
+    bytearray past 2 ** precision / 16 registers, so quiet zone buckets
+    cost a few hundred bytes instead of the full register array.
+    """
+
+    __slots__ = ("precision", "_sparse", "_dense")
+
+    def __init__(self, precision: int = 11):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._sparse: dict | None = {}
+        self._dense: bytearray | None = None
+
+    @property
+    def size(self) -> int:
+        return 1 << self.precision
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(self.size)
+
+    # -------------------------
+    # Updates
+    # -------------------------
+    def add(self, value):
+        h = _hash64(value)
+        bits = 64 - self.precision
+        index = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        self._set(index, rank)
+
+    def _set(self, index: int, rank: int):
+        if self._dense is not None:
+            if rank > self._dense[index]:
+                self._dense[index] = rank
+            return
+
+        if rank > self._sparse.get(index, 0):
+            self._sparse[index] = rank
+            if len(self._sparse) > self.size >> 4:
+                self._densify()
+
+    def _densify(self):
+        dense = bytearray(self.size)
+        for index, rank in self._sparse.items():
+            dense[index] = rank
+        self._dense = dense
+        self._sparse = None
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        In-place union. Idempotent: merging the same sketch twice
+        changes nothing, so re-sent or re-loaded sketches are safe.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+
+        if other._dense is None:
+            for index, rank in other._sparse.items():
+                self._set(index, rank)
+            return self
+
+        if self._dense is None:
+            self._densify()
+        if np is not None:
+            mine = np.frombuffer(self._dense, dtype=np.uint8)
+            np.maximum(mine, np.frombuffer(other._dense, dtype=np.uint8), out=mine)
+        else:
+            self._dense = bytearray(map(max, self._dense, other._dense))
+        return self
+
+    def copy(self) -> "HyperLogLog":
+        clone = HyperLogLog(self.precision)
+        clone._sparse = None if self._sparse is None else dict(self._sparse)
+        clone._dense = None if self._dense is None else bytearray(self._dense)
+        return clone
+
+    # -------------------------
+    # Estimate
+    # -------------------------
+    def count(self) -> int:
+        m = self.size
+        if self._dense is None:
+            if not self._sparse:
+                return 0
+            zeros = m - len(self._sparse)
+            total = zeros + sum(_INVERSE_POWERS[rank] for rank in self._sparse.values())
+        else:
+            zeros = self._dense.count(0)
+            if np is not None:
+                total = float(_INVERSE_POWERS_NP[np.frombuffer(self._dense, dtype=np.uint8)].sum())
+            else:
+                total = sum(_INVERSE_POWERS[rank] for rank in self._dense)
+
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / total
+        # Small-range correction (linear counting); 64-bit hashes need
+        # no large-range one
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    # -------------------------
+    # Serialization
+    # -------------------------
+    def to_bytes(self) -> bytes:
+        if self._dense is not None:
+            return bytes((_VERSION, self.precision, _DENSE)) + bytes(self._dense)
+
+        body = b"".join(struct.pack("<HB", index, rank) for index, rank in sorted(self._sparse.items()))
+        return bytes((_VERSION, self.precision, _SPARSE)) + body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        version, precision, mode = data[0], data[1], data[2]
+        if version != _VERSION:
+            raise ValueError(f"Unsupported sketch version {version}")
+
+        sketch = cls(precision)
+        if mode == _DENSE:
+            sketch._dense = bytearray(data[3:])
+            sketch._sparse = None
+        else:
+            sketch._sparse = {index: rank for index, rank in struct.iter_unpack("<HB", data[3:])}
+        return sketch
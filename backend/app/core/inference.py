@@ -0,0 +1,129 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LogisticRiskModel:
+    """
+    Standardized logistic regression exported by
+    ai-engine/train_baseline.py. predict() is one vectorized call
+    for the whole batch.
+    """
+
+    def __init__(self, spec: dict):
+        import numpy as np
+
+        self.name = spec.get("name", "logistic")
+        self.features = tuple(spec["features"])
+        self._mean = np.asarray(spec["mean"], dtype=np.float64)
+        self._std = np.asarray(spec["std"], dtype=np.float64)
+        self._weights = np.asarray(spec["weights"], dtype=np.float64)
+        self._bias = float(spec["bias"])
+        self._np = np
+
+    @classmethod
+    def load(cls, path: str) -> "LogisticRiskModel":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def predict(self, rows: Sequence[Sequence[float]]) -> List[float]:
+        np = self._np
+        if len(rows) == 0:
+            return []
+        x = (np.asarray(rows, dtype=np.float64) - self._mean) / self._std
+        return (1.0 / (1.0 + np.exp(-(x @ self._weights + self._bias)))).tolist()
+
+
+class InferenceBatcher:
+    """
+    Collects concurrent score() calls for up to INFERENCE_MAX_WAIT_MS
+    (or INFERENCE_MAX_BATCH rows) and runs them as one predict() on a
+    dedicated worker thread, so the event loop never runs the model.
+    """
+
+    def __init__(self, max_batch: int, max_wait_ms: float):
+        self.model = None
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self.stats = {"requests": 0, "batches": 0, "max_batch": 0, "predict_ms_total": 0.0}
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self, model):
+        if self._task is not None:
+            return
+        self.model = model
+        # One thread: batched predict() calls run one at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        # Warm up (lazy imports, first allocations) before real traffic
+        self._executor.submit(model.predict, [[0.0] * len(model.features)])
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+    async def score(self, row: Sequence[float]) -> float:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    def _predict(self, rows) -> List[float]:
+        started = time.perf_counter()
+        scores = self.model.predict(rows)
+        self.stats["predict_ms_total"] += (time.perf_counter() - started) * 1000
+        return scores
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            pending = [(row, future) for row, future in batch if not future.cancelled()]
+            if not pending:
+                continue
+
+            try:
+                scores = await loop.run_in_executor(self._executor, self._predict, [row for row, _ in pending])
+            except Exception as exc:
+                logger.exception("Batched inference failed")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for (_, future), score in zip(pending, scores):
+                if not future.done():
+                    future.set_result(score)
+
+            self.stats["requests"] += len(pending)
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(pending))
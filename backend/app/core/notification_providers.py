@@ -0,0 +1,91 @@
+import asyncio
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import List
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class OutgoingNotification:
+    id: int
+    recipient: str
+    message: str
+
+
+# =========================================================
+# Base
+# =========================================================
+class NotificationProvider:
+    """
+    Delivers notifications for one channel. `send` gets up to
+    `max_batch` notifications and returns one error (None = delivered)
+    per notification, in order; raising fails the whole batch. Either
+    way failed notifications are retried by the dispatcher, so `send`
+    itself never retries.
+
+    Providers with a multi-recipient API (bulk SMS, FCM multicast,
+    SES bulk email) set `max_batch` above 1; the dispatcher then
+    groups due notifications into one call.
+    """
+
+    name = "base"
+    max_batch = 1
+
+    async def send(self, batch: List[OutgoingNotification]) -> List[str | None]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+# =========================================================
+# Local (development / tests)
+# =========================================================
+class LocalProvider(NotificationProvider):
+    """
+    Logs instead of sending and keeps the last deliveries in `sent`.
+    `failure_rate` and `latency_seconds` simulate a flaky, slow
+    provider.
+    """
+
+    name = "local"
+
+    def __init__(self, max_batch: int = 100, failure_rate: float = 0.0, latency_seconds: float = 0.0):
+        self.max_batch = max_batch
+        self.failure_rate = failure_rate
+        self.latency_seconds = latency_seconds
+        self.sent: deque = deque(maxlen=10000)
+        self.calls = 0
+
+    async def send(self, batch: List[OutgoingNotification]) -> List[str | None]:
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        errors = []
+        for notification in batch:
+            if random.random() < self.failure_rate:
+                errors.append("simulated failure")
+                continue
+            logger.info("[NOTIFY] %s: %s", notification.recipient, notification.message)
+            self.sent.append(notification)
+            errors.append(None)
+        return errors
+
+
+# =========================================================
+# Factory
+# =========================================================
+def create_provider(name: str) -> NotificationProvider:
+    if name == "local":
+        return LocalProvider(
+            max_batch=settings.NOTIFY_LOCAL_MAX_BATCH,
+            failure_rate=settings.NOTIFY_LOCAL_FAILURE_RATE,
+        )
+
+    raise ValueError(f"Unknown notification provider: {name}")
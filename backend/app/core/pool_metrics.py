@@ -0,0 +1,112 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Checkout wait times and timeouts for one connection pool.
+    Utilization is read from the pool itself when reported.
+    """
+
+    # Upper bounds (ms) of the checkout-latency histogram buckets
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.buckets = [0] * (len(self.BUCKETS_MS) + 1)
+
+    def record(self, wait: float, timed_out: bool = False):
+        wait_ms = wait * 1000
+        index = next(
+            (i for i, bound in enumerate(self.BUCKETS_MS) if wait_ms <= bound),
+            len(self.BUCKETS_MS),
+        )
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.buckets[index] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_histogram_ms": {
+                    **{f"le_{bound}": count for bound, count in zip(self.BUCKETS_MS, self.buckets)},
+                    "inf": self.buckets[-1],
+                },
+            }
+
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + pool._max_overflow
+            data.update({
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "utilization": round(pool.checkedout() / capacity, 3) if capacity > 0 else None,
+            })
+        return data
+
+
+# engine name -> metrics, e.g. "primary", "replica-0", "async-primary"
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def metered_pool(base, metrics: PoolMetrics):
+    """
+    A pool class that times how long each checkout waits for a
+    connection. Bound as a class attribute so recreate() keeps it.
+    """
+
+    class MeteredPool(base):
+        _metrics = metrics
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._metrics.pool = self
+
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                connection = super().connect()
+            except PoolTimeoutError:
+                self._metrics.record(time.perf_counter() - start, timed_out=True)
+                raise
+            self._metrics.record(time.perf_counter() - start)
+            return connection
+
+    MeteredPool.__name__ = f"Metered{base.__name__}"
+    return MeteredPool
+
+
+def register(name: str) -> PoolMetrics:
+    metrics = pool_metrics.get(name)
+    if metrics is None:
+        metrics = pool_metrics[name] = PoolMetrics(name)
+    return metrics
+
+
+def report() -> dict:
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
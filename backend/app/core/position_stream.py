@@ -0,0 +1,261 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List, Set, Tuple
+
+from fastapi import WebSocket
+
+from app.config import settings
+from app.utils.encoding import dumps
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Cell = Tuple[int, int]
+
+
+class Viewport:
+    def __init__(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, zoom: int):
+        if min_lat > max_lat or min_lng > max_lng:
+            raise ValueError("Invalid bbox: min corner must be below max corner")
+        self.min_lat, self.min_lng = min_lat, min_lng
+        self.max_lat, self.max_lng = max_lat, max_lng
+        self.zoom = zoom
+
+    def contains(self, lat: float, lng: float) -> bool:
+        return self.min_lat <= lat <= self.max_lat and self.min_lng <= lng <= self.max_lng
+
+    @property
+    def clustered(self) -> bool:
+        return self.zoom < settings.POSITION_CLUSTER_BELOW_ZOOM
+
+
+class PositionStream:
+    """
+    Latest position per tourist, grid-indexed, pushed to map clients
+    at most POSITION_STREAM_MAX_HZ times per second.
+
+    Ingestion (sync endpoints, worker threads) only updates dicts
+    under a lock; one loop task coalesces everything that changed
+    since the last tick into a single frame per client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # tourist_id -> (lat, lng, ts)
+        self.latest: Dict[int, Tuple[float, float, float]] = {}
+        self._cells: Dict[Cell, Set[int]] = {}
+
+        # Changed since the last tick (coalesced per tourist)
+        self._dirty: Set[int] = set()
+        self._gone: Dict[int, Tuple[float, float]] = {}
+        # Position clients last saw for dirty tourists, to catch exits
+        self._moved_from: Dict[int, Tuple[float, float]] = {}
+
+        self.clients: Dict[WebSocket, Viewport] = {}
+        self._task: asyncio.Task | None = None
+        self._last_prune = time.time()
+
+    # -------------------------
+    # Ingestion
+    # -------------------------
+    def update(self, tourist_id: int, latitude: float, longitude: float, ts: float | None = None):
+        ts = ts or time.time()
+        cell = _cell(latitude, longitude)
+
+        with self._lock:
+            previous = self.latest.get(tourist_id)
+            if previous is not None:
+                if tourist_id not in self._dirty:
+                    self._moved_from[tourist_id] = (previous[0], previous[1])
+                old_cell = _cell(previous[0], previous[1])
+                if old_cell != cell:
+                    self._remove_from_cell(old_cell, tourist_id)
+
+            self.latest[tourist_id] = (latitude, longitude, ts)
+            self._cells.setdefault(cell, set()).add(tourist_id)
+            self._dirty.add(tourist_id)
+            self._gone.pop(tourist_id, None)
+
+    def _remove_from_cell(self, cell: Cell, tourist_id: int):
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(tourist_id)
+            if not members:
+                del self._cells[cell]
+
+    def _prune(self, now: float):
+        cutoff = now - settings.POSITION_TTL_SECONDS
+        for tourist_id, (lat, lng, ts) in list(self.latest.items()):
+            if ts < cutoff:
+                del self.latest[tourist_id]
+                self._remove_from_cell(_cell(lat, lng), tourist_id)
+                self._dirty.discard(tourist_id)
+                self._moved_from.pop(tourist_id, None)
+                self._gone[tourist_id] = (lat, lng)
+
+    # -------------------------
+    # Clients
+    # -------------------------
+    async def connect(self, websocket: WebSocket):
+        await websocket.accept()
+
+    def disconnect(self, websocket: WebSocket):
+        self.clients.pop(websocket, None)
+
+    async def set_viewport(self, websocket: WebSocket, viewport: Viewport):
+        """
+        Register the viewport and send everything currently inside it.
+        """
+        self.clients[websocket] = viewport
+
+        with self._lock:
+            ids = self._ids_in(viewport, self._cells)
+            frame = self._frame(viewport, ids, gone=[])
+
+        await websocket.send_text(frame.decode())
+
+    # -------------------------
+    # Tick Loop
+    # -------------------------
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        interval = 1.0 / settings.POSITION_STREAM_MAX_HZ
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Position stream flush failed")
+
+    async def flush(self):
+        now = time.time()
+        frames: List[Tuple[WebSocket, bytes]] = []
+
+        with self._lock:
+            if now - self._last_prune >= settings.POSITION_TTL_SECONDS / 10:
+                self._prune(now)
+                self._last_prune = now
+
+            dirty, self._dirty = self._dirty, set()
+            gone, self._gone = self._gone, {}
+            moved_from, self._moved_from = self._moved_from, {}
+
+            if not (dirty or gone) or not self.clients:
+                return
+
+            dirty_cells: Dict[Cell, Set[int]] = {}
+            for tourist_id in dirty:
+                lat, lng, _ = self.latest[tourist_id]
+                dirty_cells.setdefault(_cell(lat, lng), set()).add(tourist_id)
+
+            for websocket, viewport in self.clients.items():
+                gone_ids = [
+                    tourist_id
+                    for tourist_id, (lat, lng) in gone.items()
+                    if viewport.contains(lat, lng)
+                ]
+                # Moved out of view: only indexed under the new cell
+                gone_ids += [
+                    tourist_id
+                    for tourist_id, (lat, lng) in moved_from.items()
+                    if viewport.contains(lat, lng) and not viewport.contains(*self.latest[tourist_id][:2])
+                ]
+                changed = self._ids_in(viewport, dirty_cells)
+
+                if not changed and not gone_ids:
+                    continue
+
+                if viewport.clustered:
+                    # Clusters must reflect every tourist in view, not just movers
+                    changed = self._ids_in(viewport, self._cells)
+
+                frames.append((websocket, self._frame(viewport, changed, gone_ids)))
+
+        for websocket, frame in frames:
+            try:
+                await websocket.send_text(frame.decode())
+            except Exception as exc:
+                logger.warning("Dropping position stream client: %s", exc)
+                self.disconnect(websocket)
+
+    # -------------------------
+    # Helpers (call with lock held)
+    # -------------------------
+    def _ids_in(self, viewport: Viewport, cells: Dict[Cell, Set[int]]) -> List[int]:
+        lo_x, lo_y = _cell(viewport.min_lat, viewport.min_lng)
+        hi_x, hi_y = _cell(viewport.max_lat, viewport.max_lng)
+
+        # Walk whichever side is smaller: viewport cells or indexed cells
+        if (hi_x - lo_x + 1) * (hi_y - lo_y + 1) <= len(cells):
+            candidates = (
+                cells.get((x, y), ())
+                for x in range(lo_x, hi_x + 1)
+                for y in range(lo_y, hi_y + 1)
+            )
+        else:
+            candidates = (
+                members
+                for (x, y), members in cells.items()
+                if lo_x <= x <= hi_x and lo_y <= y <= hi_y
+            )
+
+        ids = []
+        for members in candidates:
+            for tourist_id in members:
+                lat, lng, _ = self.latest[tourist_id]
+                if viewport.contains(lat, lng):
+                    ids.append(tourist_id)
+        return ids
+
+    def _frame(self, viewport: Viewport, ids: List[int], gone: List[int]) -> bytes:
+        if viewport.clustered:
+            return dumps({
+                "type": "position_clusters",
+                "zoom": viewport.zoom,
+                "clusters": self._cluster(viewport.zoom, ids),
+            })
+
+        return dumps({
+            "type": "positions",
+            "points": [
+                {"id": tourist_id, "lat": lat, "lng": lng, "ts": ts}
+                for tourist_id in ids
+                for lat, lng, ts in (self.latest[tourist_id],)
+            ],
+            "gone": gone,
+        })
+
+    def _cluster(self, zoom: int, ids: List[int]) -> List[dict]:
+        # Roughly one cluster per quarter of a map tile at this zoom
+        size = 360.0 / (2 ** zoom) / 4
+        buckets: Dict[Cell, List[float]] = {}
+
+        for tourist_id in ids:
+            lat, lng, _ = self.latest[tourist_id]
+            bucket = buckets.setdefault((int(lat // size), int(lng // size)), [0.0, 0.0, 0])
+            bucket[0] += lat
+            bucket[1] += lng
+            bucket[2] += 1
+
+        return [
+            {"lat": lat_sum / count, "lng": lng_sum / count, "count": count}
+            for lat_sum, lng_sum, count in buckets.values()
+        ]
+
+
+def _cell(latitude: float, longitude: float) -> Cell:
+    size = settings.POSITION_GRID_CELL_DEG
+    return int(latitude // size), int(longitude // size)
+
+
+positions = PositionStream()
@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Dict
+
+
+class RevocationList:
+    """
+    Per-worker set of revoked tokens, checked on every request.
+
+    Lookups are plain dict hits. Entries are dropped once every token
+    they could match has expired, so memory stays bounded by the
+    number of revocations within one token lifetime.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # jti -> token exp (unix seconds)
+        self._jtis: Dict[str, float] = {}
+
+        # subject -> (revoked_at, prune_after); tokens issued at or
+        # before revoked_at are rejected (iat has millisecond precision)
+        self._subjects: Dict[str, tuple] = {}
+
+    def revoke_jti(self, jti: str, expires_at: float):
+        with self._lock:
+            self._jtis[jti] = expires_at
+
+    def revoke_subject(self, subject: str, revoked_at: float, expires_at: float):
+        with self._lock:
+            current = self._subjects.get(subject)
+            if current is None or current[0] < revoked_at:
+                self._subjects[subject] = (revoked_at, expires_at)
+
+    def is_revoked(self, payload: dict) -> bool:
+        jti = payload.get("jti")
+        if jti is not None and jti in self._jtis:
+            return True
+
+        subject = self._subjects.get(payload.get("sub"))
+        if subject is not None:
+            return float(payload.get("iat") or 0) <= subject[0]
+
+        return False
+
+    def prune(self, now: float | None = None):
+        now = now or time.time()
+        with self._lock:
+            self._jtis = {j: exp for j, exp in self._jtis.items() if exp > now}
+            self._subjects = {s: v for s, v in self._subjects.items() if v[1] > now}
+
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._subjects)
+
+
+revocations = RevocationList()
@@ -0,0 +1,43 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, Iterable
+
+
+class StageLatency:
+    """
+    Latency of each pipeline stage, measured from the event's receipt,
+    over the last `window` events per stage (plus lifetime counts).
+    """
+
+    def __init__(self, stages: Iterable[str], window: int = 1000):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {stage: deque(maxlen=window) for stage in stages}
+        self._counts: Dict[str, int] = {stage: 0 for stage in self._samples}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._samples[stage].append(seconds)
+            self._counts[stage] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        return {
+            stage: {
+                "count": counts[stage],
+                "p50_ms": _percentile_ms(values, 0.50),
+                "p99_ms": _percentile_ms(values, 0.99),
+                "max_ms": round(values[-1] * 1000, 3) if values else None,
+            }
+            for stage, values in samples.items()
+        }
+
+
+def _percentile_ms(ordered: list, q: float) -> float | None:
+    # Nearest rank
+    if not ordered:
+        return None
+    return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)] * 1000, 3)
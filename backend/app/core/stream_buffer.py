@@ -0,0 +1,98 @@
+from collections import OrderedDict, deque
+from typing import Dict, List, Tuple
+
+from app.config import settings
+
+
+def entity_key(message: dict) -> Tuple[str, int] | None:
+    """
+    ("incident", 12) for "incident_created" / "incident_updated" etc.
+    Messages without an entity id are not compacted.
+    """
+    msg_type = message.get("type") or ""
+    data = message.get("data")
+
+    if "_" not in msg_type or not isinstance(data, dict) or data.get("id") is None:
+        return None
+
+    return msg_type.rsplit("_", 1)[0], data["id"]
+
+
+class StreamBuffer:
+    """
+    Sequenced record of everything this worker delivered to dashboards.
+
+    `recent` is a bounded ring of raw messages used to replay deltas.
+    `entities` is a compacted view (latest merged state per entity)
+    used to build snapshots for clients that fell off the ring.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_entities: int | None = None,
+    ):
+        self.seq = 0
+        self.recent: deque = deque(maxlen=size or settings.WS_REPLAY_BUFFER_SIZE)
+        self.max_entities = max_entities or settings.WS_SNAPSHOT_MAX_ENTITIES
+
+        # key -> (seq, merged data, routing), oldest update first
+        self.entities: "OrderedDict[tuple, Tuple[int, dict, dict]]" = OrderedDict()
+
+        # Highest seq dropped from the compacted view
+        self.compacted_floor = 0
+        self.seeded = False
+
+    def append(self, message: dict, routing: dict) -> int:
+        self.seq += 1
+        self.recent.append((self.seq, message, routing))
+
+        key = entity_key(message)
+        if key is not None:
+            previous = self.entities.pop(key, None)
+            data = {**previous[1], **message["data"]} if previous else dict(message["data"])
+            self.entities[key] = (self.seq, data, routing)
+            self._evict()
+
+        return self.seq
+
+    def seed(self, key: tuple, data: dict, routing: dict):
+        """
+        Load persisted state without overriding newer live updates.
+        """
+        if key in self.entities:
+            return
+        self.entities[key] = (0, data, routing)
+        self.entities.move_to_end(key, last=False)
+        self._evict()
+
+    def _evict(self):
+        while len(self.entities) > self.max_entities:
+            _, (seq, _, _) = self.entities.popitem(last=False)
+            self.compacted_floor = max(self.compacted_floor, seq)
+
+    # -------------------------
+    # Replay
+    # -------------------------
+    def since(self, last_seq: int) -> List[Tuple[int, dict, dict]] | None:
+        """
+        Messages after `last_seq`, or None if the ring no longer has them.
+        """
+        if last_seq >= self.seq:
+            return []
+        if not self.recent or self.recent[0][0] > last_seq + 1:
+            return None
+        return [item for item in self.recent if item[0] > last_seq]
+
+    def can_snapshot(self, last_seq: int) -> bool:
+        return last_seq >= self.compacted_floor
+
+    def snapshot(self, last_seq: int = 0) -> List[Tuple[tuple, dict, dict]]:
+        """
+        Latest state of every entity changed after `last_seq`.
+        """
+        return [
+            (key, data, routing)
+            for key, (seq, data, routing) in self.entities.items()
+            if last_seq == 0 or seq > last_seq
+        ]
@@ -0,0 +1,119 @@
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Hashable, List
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel (Varghese & Lauck): `slots` buckets of `tick`
+    seconds. A timer goes into the bucket of the first tick at or
+    after its deadline and fires on the pass where the deadline has
+    come; timers further out than one revolution just stay put until
+    a later pass. Schedule and cancel are O(1); advancing visits one
+    bucket per elapsed tick.
+
+    Timers fire up to one tick late, never early. Timestamps are
+    passed in, so it runs the same against a replayed clock.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512):
+        self.tick = tick
+        self.slots = slots
+        self._buckets: List[Dict[Hashable, float]] = [{} for _ in range(slots)]
+        self._slot_of: Dict[Hashable, int] = {}
+        self._current: int | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._slot_of)
+
+    def schedule(self, key: Hashable, deadline: float):
+        """
+        (Re)arm `key`; a past deadline fires on the next advance.
+        """
+        index = math.ceil(deadline / self.tick)
+        with self._lock:
+            self._cancel(key)
+            if self._current is not None:
+                index = max(index, self._current + 1)
+            slot = index % self.slots
+            self._buckets[slot][key] = deadline
+            self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._cancel(key)
+
+    def _cancel(self, key: Hashable) -> bool:
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._buckets[slot][key]
+        return True
+
+    def advance(self, now: float | None = None) -> List[Hashable]:
+        """
+        Move the wheel to `now`; returns the keys that fired, in
+        deadline order.
+        """
+        now = time.time() if now is None else now
+        target = math.floor(now / self.tick)
+        fired = []
+
+        with self._lock:
+            if self._current is None:
+                # First pass: nothing is known to be visited yet
+                self._current = target - self.slots
+            # Past one revolution every bucket is visited once anyway
+            first = max(self._current + 1, target - self.slots + 1)
+            for index in range(first, target + 1):
+                bucket = self._buckets[index % self.slots]
+                due = [key for key, deadline in bucket.items() if deadline <= now]
+                for key in due:
+                    fired.append((bucket.pop(key), key))
+                    del self._slot_of[key]
+            self._current = max(self._current, target)
+
+        fired.sort(key=lambda item: item[0])
+        return [key for _, key in fired]
+
+
+class SlidingWindowLimiter:
+    """
+    At most `limit` events per key within `window_seconds`. Keys are
+    kept LRU-bounded, so memory stays flat during a storm.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = 100_000):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._events: "OrderedDict[Hashable, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: Hashable, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            events = self._events.get(key)
+            if events is None:
+                events = self._events[key] = deque()
+                if len(self._events) > self.max_keys:
+                    self._events.popitem(last=False)
+            else:
+                self._events.move_to_end(key)
+
+            while events and events[0] <= now - self.window_seconds:
+                events.popleft()
+            if len(events) >= self.limit:
+                return False
+            events.append(now)
+            return True
@@ -0,0 +1,260 @@
+import math
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List
+
+_EARTH_RADIUS_M = 6_371_000.0
+
+# Per-tourist state is one fixed-size array('d'); these are its slots
+(
+    _N, _HEAD,
+    _SPEED_MEAN, _SPEED_VAR,
+    _C_LAT, _C_LNG, _DIST_MEAN, _DIST_VAR,
+    _ANCHOR_LAT, _ANCHOR_LNG, _STILL_SINCE, _IDLE_FLAGGED,
+    _REST_LAT, _REST_LNG,
+    _ALERT_SPEED, _ALERT_STRAY, _ALERT_IDLE,
+    _RING,
+) = range(18)
+
+RING_POINTS = 5
+
+# Speed EWMA weight per ping; the usual area (centroid and distance
+# from it) decays by time instead, so dense pings do not drag it
+# along an excursion before it is flagged
+_SPEED_ALPHA = 0.1
+_AREA_TAU_SECONDS = 3 * 3600
+
+# Segment speeds above this are GPS jumps; kept out of the EWMA
+# during warm-up (afterwards anything above speed_mps is)
+_SPEED_CLIP_MPS = 50.0
+
+# Moves within this radius do not end a stationary episode
+_STILL_RADIUS_M = 75.0
+_REST_RADIUS_M = 250.0
+
+# Tourists checked per lock acquisition during a sweep
+_SWEEP_CHUNK = 1000
+
+KINDS = ("speed", "stray", "inactivity")
+_ALERT_SLOT = {"speed": _ALERT_SPEED, "stray": _ALERT_STRAY, "inactivity": _ALERT_IDLE}
+
+
+def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    # Equirectangular: plenty for the few-km distances compared here
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return _EARTH_RADIUS_M * math.hypot(x, y)
+
+
+@dataclass(slots=True)
+class Anomaly:
+    kind: str
+    tourist_id: int
+    latitude: float
+    longitude: float
+    timestamp: float
+    # How far past its threshold the observation was (1.0 = at it)
+    score: float
+    detail: dict = field(default_factory=dict)
+
+
+class TrajectoryAnomalyDetector:
+    """
+    Per-tourist streaming checks over location pings:
+
+    - speed: sustained speed over the recent-points ring is above
+      `speed_mps` and well above the tourist's own EWMA speed
+    - stray: distance from the EWMA centroid of the tourist's path is
+      above `stray_m` and `stray_z` deviations past its EWMA
+    - inactivity: no movement beyond a small radius (or no pings) for
+      `idle_minutes`, away from the tourist's rest place (the last spot
+      they stayed at for `rest_minutes`, e.g. their hotel; until then
+      where they were first seen)
+
+    State is a fixed-size array per tourist and at most `max_tourists`
+    are tracked (least recently seen evicted), so memory is bounded.
+    Pure computation: no I/O, timestamps come from the events, so a
+    replayed log behaves exactly like live traffic.
+    """
+
+    def __init__(
+        self,
+        max_tourists: int = 100_000,
+        warmup_points: int = 20,
+        speed_mps: float = 7.0,
+        stray_m: float = 3000.0,
+        stray_z: float = 4.0,
+        idle_minutes: float = 60,
+        rest_minutes: float = 240,
+        cooldown_minutes: float = 30,
+    ):
+        self.max_tourists = max_tourists
+        self.warmup_points = warmup_points
+        self.speed_mps = speed_mps
+        self.stray_m = stray_m
+        self.stray_z = stray_z
+        self.idle_seconds = idle_minutes * 60
+        self.rest_seconds = rest_minutes * 60
+        self.cooldown_seconds = cooldown_minutes * 60
+
+        self._states: "OrderedDict[int, array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    # -------------------------
+    # Streaming update
+    # -------------------------
+    def observe(self, tourist_id: int, latitude: float, longitude: float, ts: float) -> List[Anomaly]:
+        with self._lock:
+            state = self._states.get(tourist_id)
+            if state is None:
+                self._states[tourist_id] = self._new_state(latitude, longitude, ts)
+                if len(self._states) > self.max_tourists:
+                    self._states.popitem(last=False)
+                return []
+            self._states.move_to_end(tourist_id)
+            return self._observe(state, tourist_id, latitude, longitude, ts)
+
+    def _new_state(self, latitude: float, longitude: float, ts: float) -> array:
+        state = array("d", [0.0]) * (_RING + 3 * RING_POINTS)
+        state[_N] = 1
+        state[_C_LAT], state[_C_LNG] = latitude, longitude
+        state[_ANCHOR_LAT], state[_ANCHOR_LNG], state[_STILL_SINCE] = latitude, longitude, ts
+        # Until a long stop is seen, where the tourist was first seen
+        # (check-in, hotel) stands in for the rest place
+        state[_REST_LAT], state[_REST_LNG] = latitude, longitude
+        state[_ALERT_SPEED] = state[_ALERT_STRAY] = state[_ALERT_IDLE] = -math.inf
+        state[_RING], state[_RING + 1], state[_RING + 2] = latitude, longitude, ts
+        return state
+
+    def _observe(self, state: array, tourist_id: int, lat: float, lng: float, ts: float) -> List[Anomaly]:
+        head = int(state[_HEAD])
+        slot = _RING + 3 * head
+        last_lat, last_lng, last_ts = state[slot], state[slot + 1], state[slot + 2]
+        dt = ts - last_ts
+        if dt <= 0:
+            # Duplicate or out-of-order ping
+            return []
+
+        found = []
+        warm = state[_N] >= self.warmup_points
+        segment = distance_m(last_lat, last_lng, lat, lng)
+        speed = segment / dt
+
+        # Speed: path length over the ring, so one GPS jump is not enough
+        speeding = False
+        if warm:
+            path, oldest_ts = segment, last_ts
+            previous = (last_lat, last_lng)
+            for back in range(1, RING_POINTS):
+                ring_slot = _RING + 3 * ((head - back) % RING_POINTS)
+                point = (state[ring_slot], state[ring_slot + 1])
+                path += distance_m(point[0], point[1], *previous)
+                previous, oldest_ts = point, state[ring_slot + 2]
+            sustained = path / (ts - oldest_ts) if ts > oldest_ts else 0.0
+            usual = state[_SPEED_MEAN] + 3 * math.sqrt(state[_SPEED_VAR])
+            speeding = sustained > self.speed_mps and sustained > usual
+            if speeding:
+                found.append(Anomaly(
+                    "speed", tourist_id, lat, lng, ts, sustained / max(self.speed_mps, usual),
+                    {"speed_mps": round(sustained, 2), "usual_mps": round(state[_SPEED_MEAN], 2)},
+                ))
+        # Excursions stay out of the baseline, or it would absorb them
+        ceiling = self.speed_mps if warm else _SPEED_CLIP_MPS
+        if not speeding and speed <= ceiling:
+            _ewma(state, _SPEED_MEAN, _SPEED_VAR, speed, _SPEED_ALPHA)
+
+        # Stray: far outside the tourist's usual area
+        from_center = distance_m(state[_C_LAT], state[_C_LNG], lat, lng)
+        limit = max(self.stray_m, state[_DIST_MEAN] + self.stray_z * math.sqrt(state[_DIST_VAR]))
+        if warm and from_center > limit:
+            found.append(Anomaly(
+                "stray", tourist_id, lat, lng, ts, from_center / limit,
+                {"distance_m": round(from_center), "usual_m": round(state[_DIST_MEAN])},
+            ))
+        area_alpha = 1 - math.exp(-dt / _AREA_TAU_SECONDS)
+        # Points already past the stray floor never widen the baseline
+        if from_center <= self.stray_m:
+            _ewma(state, _DIST_MEAN, _DIST_VAR, from_center, area_alpha)
+        # The centroid keeps following, so a tourist who moves on to a
+        # new area stops being flagged once it catches up
+        state[_C_LAT] += area_alpha * (lat - state[_C_LAT])
+        state[_C_LNG] += area_alpha * (lng - state[_C_LNG])
+
+        # Inactivity: stationary episode bookkeeping
+        if distance_m(state[_ANCHOR_LAT], state[_ANCHOR_LNG], lat, lng) > _STILL_RADIUS_M:
+            if last_ts - state[_STILL_SINCE] >= self.rest_seconds:
+                state[_REST_LAT], state[_REST_LNG] = state[_ANCHOR_LAT], state[_ANCHOR_LNG]
+            state[_ANCHOR_LAT], state[_ANCHOR_LNG], state[_STILL_SINCE] = lat, lng, ts
+            state[_IDLE_FLAGGED] = 0
+        elif warm:
+            anomaly = self._inactivity(state, tourist_id, ts, last_ts)
+            if anomaly:
+                found.append(anomaly)
+
+        head = (head + 1) % RING_POINTS
+        slot = _RING + 3 * head
+        state[slot], state[slot + 1], state[slot + 2] = lat, lng, ts
+        state[_HEAD] = head
+        state[_N] += 1
+
+        return [anomaly for anomaly in found if self._allow(state, anomaly)]
+
+    def _inactivity(self, state: array, tourist_id: int, now: float, last_ts: float) -> Anomaly | None:
+        still = now - state[_STILL_SINCE]
+        if state[_IDLE_FLAGGED] or still < self.idle_seconds:
+            return None
+        if distance_m(state[_REST_LAT], state[_REST_LNG], state[_ANCHOR_LAT], state[_ANCHOR_LNG]) <= _REST_RADIUS_M:
+            return None
+
+        state[_IDLE_FLAGGED] = 1
+        return Anomaly(
+            "inactivity", tourist_id, state[_ANCHOR_LAT], state[_ANCHOR_LNG], now, still / self.idle_seconds,
+            {"still_minutes": round(still / 60, 1), "silent_minutes": round((now - last_ts) / 60, 1)},
+        )
+
+    def _allow(self, state: array, anomaly: Anomaly) -> bool:
+        slot = _ALERT_SLOT[anomaly.kind]
+        if anomaly.timestamp - state[slot] < self.cooldown_seconds:
+            return False
+        state[slot] = anomaly.timestamp
+        return True
+
+    # -------------------------
+    # Periodic sweep (tourists that went silent)
+    # -------------------------
+    def sweep(self, now: float) -> List[Anomaly]:
+        """
+        Inactivity for tourists whose pings stopped altogether; the
+        per-event check only sees tourists that are still pinging.
+
+        Walks the tourists in chunks, releasing the lock in between,
+        so ingestion threads never wait for a whole sweep.
+        """
+        found = []
+        with self._lock:
+            tourist_ids = list(self._states)
+
+        for start in range(0, len(tourist_ids), _SWEEP_CHUNK):
+            with self._lock:
+                for tourist_id in tourist_ids[start:start + _SWEEP_CHUNK]:
+                    state = self._states.get(tourist_id)
+                    if state is None or state[_N] < self.warmup_points or state[_IDLE_FLAGGED]:
+                        continue
+                    last_ts = state[_RING + 3 * int(state[_HEAD]) + 2]
+                    anomaly = self._inactivity(state, tourist_id, now, last_ts)
+                    if anomaly and self._allow(state, anomaly):
+                        found.append(anomaly)
+        return found
+
+
+def _ewma(state: array, mean: int, var: int, value: float, alpha: float):
+    # Incremental EWMA mean / variance (West, 1979)
+    diff = value - state[mean]
+    increment = alpha * diff
+    state[mean] += increment
+    state[var] = (1 - alpha) * (state[var] + diff * increment)
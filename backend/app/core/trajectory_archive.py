@@ -0,0 +1,279 @@
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# -------------------------
+# File Layout (little-endian)
+# -------------------------
+# header   : magic, version, day start (unix s), tourists, rows
+# index    : per tourist, sorted by id -> (tourist_id, first row, row count)
+# columns  : one contiguous array each, rows grouped by tourist, time-ordered
+#   ts     u32  ms since day start for a tourist's first row, then deltas
+#   lat    i32  degrees * 1e7   (NULL_COORD when missing)
+#   lng    i32  degrees * 1e7
+#   zone   i32  (NULL_ZONE when missing)
+#   flags  u8   bit 0 = SOS, bits 1-2 = source
+MAGIC = b"STSA"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHqIIQ")
+_INDEX_ENTRY = struct.Struct("<qQII")
+_COLUMNS = (("ts", "I", 4), ("lat", "i", 4), ("lng", "i", 4), ("zone", "i", 4), ("flags", "B", 1))
+
+COORD_SCALE = 10_000_000
+NULL_COORD = -(2 ** 31)
+NULL_ZONE = -1
+
+# Anonymous pings are kept under this id
+ANONYMOUS = 0
+
+SOURCES = ("GNSS", "BLE", "RFID")
+_SOURCE_CODES = {name: code for code, name in enumerate(SOURCES, start=1)}
+
+for _code, _width in (("I", 4), ("i", 4), ("B", 1)):
+    assert array(_code).itemsize == _width
+
+
+@dataclass(slots=True)
+class ArchivedPoint:
+    tourist_id: int
+    timestamp: datetime
+    latitude: float | None
+    longitude: float | None
+    zone_id: int | None
+    source: str
+    sos_flag: bool
+
+
+def _to_fixed(value: float | None) -> int:
+    return NULL_COORD if value is None else round(value * COORD_SCALE)
+
+
+def _from_fixed(value: int) -> float | None:
+    return None if value == NULL_COORD else value / COORD_SCALE
+
+
+def _flags(source: str, sos: bool) -> int:
+    return (_SOURCE_CODES.get((source or "").upper(), 0) << 1) | int(bool(sos))
+
+
+def _source(flags: int) -> str:
+    code = (flags >> 1) & 0b11
+    return SOURCES[code - 1] if code else "OTHER"
+
+
+# -------------------------
+# Writer
+# -------------------------
+class DayWriter:
+    """
+    Streams one day's points into `path`. Points must arrive grouped
+    by tourist id (ascending) and time-ordered within a tourist, e.g.
+    straight from an ORDER BY tourist_id, timestamp cursor.
+
+    Columns are buffered up to `buffer_rows` and spooled to temporary
+    files next to `path`, so memory stays flat whatever the size of
+    the day; close() writes header and index, appends the spooled
+    columns and replaces `path` atomically.
+    """
+
+    def __init__(self, path: str, day: datetime, buffer_rows: int = 65536):
+        self.path = path
+        self.day = day
+        self.day_end = day + timedelta(days=1)
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+
+        directory = os.path.dirname(path) or "."
+        self._spools = {name: tempfile.TemporaryFile(dir=directory) for name, _, _ in _COLUMNS}
+        self._columns = {name: array(code) for name, code, _ in _COLUMNS}
+        self._index: List[list] = []
+        self._last: Tuple[int, datetime] | None = None
+        self._previous = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.discard()
+
+    def add(self, point: ArchivedPoint):
+        if not self.day <= point.timestamp < self.day_end:
+            raise ValueError(f"{point.timestamp} is outside archive day {self.day:%Y-%m-%d}")
+        if self._last is not None and (point.tourist_id, point.timestamp) < self._last:
+            raise ValueError("Points must be ordered by tourist id, then timestamp")
+
+        if self._last is None or point.tourist_id != self._last[0]:
+            self._index.append([point.tourist_id, self.rows, 0])
+            self._previous = 0
+        self._last = (point.tourist_id, point.timestamp)
+        self._index[-1][2] += 1
+
+        offset = (point.timestamp - self.day) // timedelta(milliseconds=1)
+        columns = self._columns
+        columns["ts"].append(offset - self._previous)
+        self._previous = offset
+        columns["lat"].append(_to_fixed(point.latitude))
+        columns["lng"].append(_to_fixed(point.longitude))
+        columns["zone"].append(NULL_ZONE if point.zone_id is None else point.zone_id)
+        columns["flags"].append(_flags(point.source, point.sos_flag))
+
+        self.rows += 1
+        if len(columns["ts"]) >= self.buffer_rows:
+            self._spill()
+
+    def _spill(self):
+        for name, code, _ in _COLUMNS:
+            self._columns[name].tofile(self._spools[name])
+            self._columns[name] = array(code)
+
+    def close(self) -> int:
+        """
+        Write the file; returns the number of rows.
+        """
+        self._spill()
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, int(_unix(self.day)), len(self._index), 0, self.rows))
+            for entry in self._index:
+                f.write(_INDEX_ENTRY.pack(*entry, 0))
+            for name, _, _ in _COLUMNS:
+                spool = self._spools[name]
+                spool.seek(0)
+                shutil.copyfileobj(spool, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.discard()
+        return self.rows
+
+    def discard(self):
+        for spool in self._spools.values():
+            spool.close()
+
+
+def write_day(path: str, day: datetime, points: Iterable[ArchivedPoint]) -> int:
+    """
+    Write one day's points (any order) to `path` atomically. Sorts in
+    memory; use DayWriter directly for ordered streams.
+    Returns the number of rows written.
+    """
+    with DayWriter(path, day) as writer:
+        for point in sorted(points, key=lambda p: (p.tourist_id, p.timestamp)):
+            writer.add(point)
+        return writer.close()
+
+
+# -------------------------
+# Reader (memory-mapped)
+# -------------------------
+class ArchiveDay:
+    """
+    Read-only view over one day file. Only the header, the index
+    pages touched by the binary search and the requested tourist's
+    column slices are ever paged in.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, day_start, self.tourists, _, self.rows = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a v{VERSION} trajectory archive")
+        self.day = datetime.utcfromtimestamp(day_start)
+
+        self._index_at = _HEADER.size
+        offset = self._index_at + self.tourists * _INDEX_ENTRY.size
+        self._columns: Dict[str, Tuple[int, str, int]] = {}
+        for name, code, width in _COLUMNS:
+            self._columns[name] = (offset, code, width)
+            offset += self.rows * width
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _entry(self, position: int) -> Tuple[int, int, int]:
+        tourist_id, first, count, _ = _INDEX_ENTRY.unpack_from(
+            self._map, self._index_at + position * _INDEX_ENTRY.size
+        )
+        return tourist_id, first, count
+
+    def _find(self, tourist_id: int) -> Tuple[int, int] | None:
+        lo, hi = 0, self.tourists
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < tourist_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.tourists:
+            found, first, count = self._entry(lo)
+            if found == tourist_id:
+                return first, count
+        return None
+
+    def _slice(self, name: str, first: int, count: int) -> memoryview:
+        offset, code, width = self._columns[name]
+        start = offset + first * width
+        return memoryview(self._map)[start:start + count * width].cast(code)
+
+    def _points(self, tourist_id: int, first: int, count: int) -> Iterator[ArchivedPoint]:
+        ts, lat, lng = self._slice("ts", first, count), self._slice("lat", first, count), self._slice("lng", first, count)
+        zone, flags = self._slice("zone", first, count), self._slice("flags", first, count)
+
+        try:
+            elapsed = 0
+            for i in range(count):
+                elapsed += ts[i]
+                yield ArchivedPoint(
+                    tourist_id=tourist_id,
+                    timestamp=self.day + timedelta(milliseconds=elapsed),
+                    latitude=_from_fixed(lat[i]),
+                    longitude=_from_fixed(lng[i]),
+                    zone_id=None if zone[i] == NULL_ZONE else zone[i],
+                    source=_source(flags[i]),
+                    sos_flag=bool(flags[i] & 1),
+                )
+        finally:
+            # Views pin the map; release them so close() can unmap
+            for view in (ts, lat, lng, zone, flags):
+                view.release()
+
+    def trajectory(self, tourist_id: int, start: datetime, end: datetime) -> List[ArchivedPoint]:
+        found = self._find(tourist_id)
+        if found is None:
+            return []
+
+        points = []
+        rows = self._points(tourist_id, *found)
+        for point in rows:
+            if point.timestamp >= end:
+                break
+            if point.timestamp >= start:
+                points.append(point)
+        rows.close()
+        return points
+
+    def iter_points(self) -> Iterator[ArchivedPoint]:
+        for position in range(self.tourists):
+            yield from self._points(*self._entry(position))
+
+
+def _unix(value: datetime) -> float:
+    return (value - datetime(1970, 1, 1)).total_seconds()
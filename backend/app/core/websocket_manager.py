@@ -1,20 +1,429 @@
-from typing import List
+import asyncio
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, Set, Tuple
 from fastapi import WebSocket
 
+from app.config import settings
+from app.core.backplane import Backplane
+from app.core.stream_buffer import StreamBuffer
+from app.utils.encoding import EncodedMessage, dumps, loads, with_field
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Maximum number of grid cells a single bbox subscription may cover
+MAX_BBOX_CELLS = 10_000
+
+
+def grid_cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    """
+    Map a coordinate to its fixed-size grid cell.
+    """
+    size = settings.WS_GRID_CELL_DEG
+    return int(latitude // size), int(longitude // size)
+
+
+def bbox_cells(
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+) -> List[Tuple[int, int]]:
+    """
+    All grid cells overlapped by a bounding box.
+    """
+    lo_x, lo_y = grid_cell(min_lat, min_lng)
+    hi_x, hi_y = grid_cell(max_lat, max_lng)
+
+    if hi_x < lo_x or hi_y < lo_y:
+        raise ValueError("Invalid bbox: min corner must be below max corner")
+
+    if (hi_x - lo_x + 1) * (hi_y - lo_y + 1) > MAX_BBOX_CELLS:
+        raise ValueError("bbox too large, narrow the viewport")
+
+    return [
+        (x, y)
+        for x in range(lo_x, hi_x + 1)
+        for y in range(lo_y, hi_y + 1)
+    ]
+
+
+class Subscription:
+    """
+    Topics a single dashboard connection is interested in.
+
+    Empty `types` means every message type; empty scope (no zones,
+    tourists or bbox) means messages for any zone / tourist / area.
+    """
+
+    def __init__(self):
+        self.types: Set[str] = set()
+        self.scopes: Set[tuple] = set()
+
+    @classmethod
+    def from_request(cls, data: dict) -> "Subscription":
+        sub = cls()
+        sub.types = {str(t) for t in data.get("types") or []}
+
+        for zone_id in data.get("zones") or []:
+            sub.scopes.add(("zone", int(zone_id)))
+
+        for tourist_id in data.get("tourists") or []:
+            sub.scopes.add(("tourist", int(tourist_id)))
+
+        bbox = data.get("bbox")
+        if bbox:
+            if len(bbox) != 4:
+                raise ValueError("bbox must be [min_lat, min_lng, max_lat, max_lng]")
+            for cell in bbox_cells(*map(float, bbox)):
+                sub.scopes.add(("cell", cell))
+
+        return sub
+
+    def matches(self, msg_type: str | None, scopes: List[tuple]) -> bool:
+        """
+        Single-connection check, used for replays only; live routing
+        goes through the manager's indexes.
+        """
+        if self.types and msg_type not in self.types:
+            return False
+        if self.scopes and scopes:
+            return any(scope in self.scopes for scope in scopes)
+        return True
+
+
+def routing_scopes(routing: dict) -> List[tuple]:
+    scopes = []
+    if routing.get("zone_id") is not None:
+        scopes.append(("zone", routing["zone_id"]))
+    if routing.get("tourist_id") is not None:
+        scopes.append(("tourist", routing["tourist_id"]))
+    location = routing.get("location")
+    if location is not None and None not in location:
+        scopes.append(("cell", grid_cell(*location)))
+    return scopes
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.subscriptions: Dict[WebSocket, Subscription] = {}
+
+        # Inverted indexes: topic -> subscribed connections
+        self._by_type: Dict[str, Set[WebSocket]] = {}
+        self._by_scope: Dict[tuple, Set[WebSocket]] = {}
+
+        # Connections without a type / scope filter
+        self._any_type: Set[WebSocket] = set()
+        self._any_scope: Set[WebSocket] = set()
+
+        # Connections that accept deflated binary frames
+        self._compressed: Set[WebSocket] = set()
+
+        # Cross-worker fan-out
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.backplane: Backplane = Backplane()
+        self._seq = 0
+        self._last_seq: Dict[str, int] = {}
+        self._inbox: asyncio.Queue | None = None
+        self._inbox_task: asyncio.Task | None = None
+        self._remote_handlers: Dict[str, Callable[[dict], None]] = {}
+
+        # Sequenced replay ring + compacted entity state
+        self.stream = StreamBuffer()
+        self._seed_lock = asyncio.Lock()
+
+    async def start(self, backplane: Backplane):
+        """
+        Attach a backplane so broadcasts reach every worker.
+        """
+        self._inbox = asyncio.Queue(maxsize=10_000)
+        self._inbox_task = asyncio.create_task(self._drain_inbox())
+        self.backplane = backplane
+        await backplane.start(self._on_backplane_message)
+
+    async def stop(self):
+        await self.backplane.stop()
+        self.backplane = Backplane()
+        if self._inbox_task:
+            self._inbox_task.cancel()
+            self._inbox_task = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self.subscribe(websocket, Subscription())
+
+        # Clients keep (epoch, seq) to resume after a reconnect
+        await self.send(websocket, {
+            "type": "hello",
+            "epoch": self.worker_id,
+            "seq": self.stream.seq,
+        })
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        self._compressed.discard(websocket)
+        self._unindex(websocket)
+
+    def set_compression(self, websocket: WebSocket, enabled: bool):
+        if enabled:
+            self._compressed.add(websocket)
+        else:
+            self._compressed.discard(websocket)
+
+    # -------------------------
+    # Subscriptions
+    # -------------------------
+    def subscribe(self, websocket: WebSocket, subscription: Subscription):
+        """
+        Replace the connection's subscription and re-index it.
+        """
+        self._unindex(websocket)
+        self.subscriptions[websocket] = subscription
+
+        if subscription.types:
+            for msg_type in subscription.types:
+                self._by_type.setdefault(msg_type, set()).add(websocket)
+        else:
+            self._any_type.add(websocket)
+
+        if subscription.scopes:
+            for scope in subscription.scopes:
+                self._by_scope.setdefault(scope, set()).add(websocket)
+        else:
+            self._any_scope.add(websocket)
+
+    def _unindex(self, websocket: WebSocket):
+        subscription = self.subscriptions.pop(websocket, None)
+        if not subscription:
+            return
+
+        for msg_type in subscription.types:
+            _discard(self._by_type, msg_type, websocket)
+        for scope in subscription.scopes:
+            _discard(self._by_scope, scope, websocket)
+
+        self._any_type.discard(websocket)
+        self._any_scope.discard(websocket)
+
+    def recipients(
+        self,
+        msg_type: str | None,
+        scopes: Iterable[tuple] = (),
+    ) -> Set[WebSocket]:
+        """
+        Resolve subscribers for a message purely through the indexes.
+        """
+        by_type = self._any_type
+        if msg_type in self._by_type:
+            by_type = by_type | self._by_type[msg_type]
+
+        scopes = list(scopes)
+        if not scopes:
+            # Unscoped messages go to everyone interested in the type
+            return set(by_type)
+
+        by_scope = set(self._any_scope)
+        for scope in scopes:
+            by_scope |= self._by_scope.get(scope, set())
+
+        return by_type & by_scope
+
+    # -------------------------
+    # Broadcast
+    # -------------------------
+    async def broadcast(
+        self,
+        message: dict,
+        zone_id: int | None = None,
+        tourist_id: int | None = None,
+        location: Tuple[float, float] | None = None,
+    ):
+        routing = {
+            "zone_id": zone_id,
+            "tourist_id": tourist_id,
+            "location": location,
+        }
+
+        # Encoded once: the same bytes go to peer workers and, with the
+        # local seq prepended, to every dashboard on each of them
+        body = dumps(message)
+        if self.backplane.shared:
+            self._seq += 1
+            header = dumps({"origin": self.worker_id, "seq": self._seq, "routing": routing})
+            await self.backplane.publish(header + b"\n" + body)
+
+        await self._deliver(message, routing, body)
+
+    async def _deliver(self, message: dict, routing: dict, body: bytes):
+        seq = self.stream.append(message, routing)
+
+        # Every recipient gets the same frame
+        encoded = EncodedMessage(raw=with_field(body, "seq", seq))
+
+        for connection in self.recipients(message.get("type"), routing_scopes(routing)):
+            try:
+                await self._send_encoded(connection, encoded)
+            except Exception as exc:
+                logger.warning("Dropping dashboard connection: %s", exc)
+                self.disconnect(connection)
+
+    async def send(self, websocket: WebSocket, message: dict):
+        await self._send_encoded(websocket, EncodedMessage(message))
+
+    async def _send_encoded(self, websocket: WebSocket, encoded: EncodedMessage):
+        if (
+            websocket in self._compressed
+            and len(encoded.raw) >= settings.WS_COMPRESS_MIN_BYTES
+        ):
+            await websocket.send_bytes(encoded.deflated)
+        else:
+            await websocket.send_text(encoded.text)
+
+    # -------------------------
+    # Resume
+    # -------------------------
+    async def resume(
+        self,
+        websocket: WebSocket,
+        epoch: str | None,
+        last_seq: int,
+        loader: Callable[[], Awaitable[list]],
+    ):
+        """
+        Catch a reconnecting client up to the live stream.
+
+        Same epoch and still in the ring -> replay the missed deltas.
+        Same epoch but off the ring      -> snapshot of changed entities.
+        Other epoch (restart / worker)   -> full snapshot from memory,
+                                            seeded once from `loader`.
+        Live delivery to the client is paused meanwhile so nothing is
+        sent out of order.
+        """
+        subscription = self.subscriptions.get(websocket) or Subscription()
+        self._unindex(websocket)
+
+        try:
+            if epoch != self.worker_id:
+                last_seq = 0
+
+            missed = self.stream.since(last_seq) if last_seq else None
+
+            if missed is None:
+                if not self.stream.can_snapshot(last_seq):
+                    await self.send(websocket, {"type": "resync_required", "seq": self.stream.seq})
+                    return
+                if last_seq == 0:
+                    await self._ensure_seeded(loader)
+                    if not self.stream.can_snapshot(0):
+                        await self.send(websocket, {"type": "resync_required", "seq": self.stream.seq})
+                        return
+
+                cursor = self.stream.seq
+                await self.send(
+                    websocket,
+                    self._snapshot_message(subscription, last_seq, cursor),
+                )
+            else:
+                cursor = last_seq
+
+            # Drain until caught up; no await between the final empty
+            # read and re-subscribing, so no live message can slip by
+            while True:
+                missed = self.stream.since(cursor)
+                if missed is None:
+                    await self.send(websocket, {"type": "resync_required", "seq": self.stream.seq})
+                    return
+                if not missed:
+                    break
+                for seq, message, routing in missed:
+                    cursor = seq
+                    if subscription.matches(message.get("type"), routing_scopes(routing)):
+                        await self.send(websocket, {**message, "seq": seq})
+        finally:
+            self.subscribe(websocket, subscription)
+
+    def _snapshot_message(self, subscription: Subscription, last_seq: int, seq: int) -> dict:
+        groups: Dict[str, list] = {}
+        for (entity, _), data, routing in self.stream.snapshot(last_seq):
+            if subscription.types and not any(t.startswith(f"{entity}_") for t in subscription.types):
+                continue
+            if subscription.scopes and not subscription.matches(None, routing_scopes(routing)):
+                continue
+            groups.setdefault(f"{entity}s", []).append(data)
+
+        return {
+            "type": "snapshot",
+            "epoch": self.worker_id,
+            "seq": seq,
+            "full": last_seq == 0,
+            "data": groups,
+        }
+
+    async def _ensure_seeded(self, loader: Callable[[], Awaitable[list]]):
+        # One DB load per worker, however many clients reconnect at once
+        async with self._seed_lock:
+            if self.stream.seeded:
+                return
+            for key, data, routing in await loader():
+                self.stream.seed(key, data, routing)
+            self.stream.seeded = True
+
+    # -------------------------
+    # Backplane Inbox
+    # -------------------------
+    def on_remote(self, message_type: str, handler: Callable[[dict], None]):
+        """
+        Call `handler` with every `message_type` broadcast by another
+        worker, before it is delivered, so local state can follow it.
+        """
+        self._remote_handlers[message_type] = handler
+
+    def _on_backplane_message(self, payload: bytes):
+        try:
+            self._inbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("Backplane inbox full, dropping message")
+
+    async def _drain_inbox(self):
+        while True:
+            payload = await self._inbox.get()
+            try:
+                # header JSON, newline, message JSON (never re-encoded)
+                header, _, body = payload.partition(b"\n")
+                envelope = loads(header)
+                origin, seq = envelope["origin"], envelope["seq"]
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Malformed backplane message dropped")
+                continue
+
+            # Own echo (Redis) or duplicate / out-of-order replay
+            if origin == self.worker_id or seq <= self._last_seq.get(origin, 0):
+                continue
+            self._last_seq[origin] = seq
+
+            try:
+                message = loads(body)
+                handler = self._remote_handlers.get(message.get("type"))
+                if handler is not None:
+                    handler(message)
+                await self._deliver(message, envelope["routing"], body)
+            except Exception:
+                logger.exception("Failed to deliver backplane message")
+
+
+def _discard(index: Dict, key, websocket: WebSocket):
+    members = index.get(key)
+    if members is None:
+        return
+    members.discard(websocket)
+    if not members:
+        del index[key]
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_json(message)
 
 manager = ConnectionManager()
@@ -0,0 +1,208 @@
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from app.config import settings
+from app.core.hll import HyperLogLog
+
+
+class _Bucket:
+    __slots__ = (
+        "index", "count", "rssi_sum", "rssi_sq_sum", "rssi_count", "sos",
+        "devices", "tourists", "dirty",
+    )
+
+    def __init__(self, index: int, precision: int):
+        self.index = index
+        self.count = 0
+        self.rssi_sum = 0.0
+        self.rssi_sq_sum = 0.0
+        self.rssi_count = 0
+        self.sos = 0
+        # Distinct BLE devices / tourists, approximate but mergeable
+        self.devices = HyperLogLog(precision)
+        self.tourists = HyperLogLog(precision)
+        # Sketches changed since the last persist
+        self.dirty = False
+
+
+class ZoneFeatureWindow:
+    """
+    Per-zone ring buffers of fixed-width time buckets, fed by location
+    ingestion, so windowed zone features cost O(buckets in window)
+    instead of a scan over location_events.
+
+    State is per process: it only sees pings ingested by this worker.
+    Callers only read it with ZONE_FEATURES_STREAMING (off by default,
+    meant for single-worker deployments) and otherwise use SQL; the
+    sketches are fed either way: persisted, they supply the unique_*
+    risk features and density stats (density_service).
+
+    Distinct devices / tourists are HyperLogLog sketches, so a window
+    costs a merge of its buckets' registers rather than a set union,
+    and sketches can be persisted and merged across restarts.
+    """
+
+    def __init__(self, bucket_seconds: int, max_window_minutes: int, precision: int = 11):
+        self.bucket_seconds = bucket_seconds
+        self.precision = precision
+        self.size = math.ceil(max_window_minutes * 60 / bucket_seconds) + 1
+        self.started_at = time.time()
+        self._zones: Dict[int, List[_Bucket | None]] = {}
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Ingestion
+    # -------------------------
+    def record(
+        self,
+        zone_id: int,
+        device_id: str,
+        rssi: float | None = None,
+        sos: bool = False,
+        ts: float | None = None,
+        tourist_id: int | None = None,
+    ):
+        now_index = int(time.time() // self.bucket_seconds)
+        # Device clocks ahead of ours count towards the current bucket
+        index = min(int((ts or time.time()) // self.bucket_seconds), now_index)
+        if index <= now_index - self.size:
+            return
+
+        with self._lock:
+            ring = self._zones.get(zone_id)
+            if ring is None:
+                ring = self._zones[zone_id] = [None] * self.size
+
+            bucket = self._bucket(ring, index)
+            bucket.count += 1
+            if rssi is not None:
+                bucket.rssi_sum += rssi
+                bucket.rssi_sq_sum += rssi * rssi
+                bucket.rssi_count += 1
+            if sos:
+                bucket.sos += 1
+            bucket.devices.add(device_id)
+            if tourist_id is not None:
+                bucket.tourists.add(tourist_id)
+            bucket.dirty = True
+
+    def _bucket(self, ring: List[_Bucket | None], index: int) -> _Bucket:
+        bucket = ring[index % self.size]
+        if bucket is None or bucket.index != index:
+            bucket = ring[index % self.size] = _Bucket(index, self.precision)
+        return bucket
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def _buckets(self, window_minutes: int) -> int:
+        return math.ceil(window_minutes * 60 / self.bucket_seconds)
+
+    def covers(self, window_minutes: int) -> bool:
+        """
+        True once the ring has been collecting for the whole window
+        and the window fits in it; otherwise callers use SQL.
+        """
+        if self._buckets(window_minutes) >= self.size:
+            return False
+        return time.time() - window_minutes * 60 >= self.started_at
+
+    def zones(self) -> List[int]:
+        with self._lock:
+            return list(self._zones)
+
+    def window_indexes(self, window_minutes: int) -> range:
+        now_index = int(time.time() // self.bucket_seconds)
+        return range(now_index - self._buckets(window_minutes) + 1, now_index + 1)
+
+    def totals(self, zone_ids: Iterable[int], window_minutes: int) -> Dict[int, tuple]:
+        """
+        zone_id -> (count, rssi_sum, rssi_sq_sum, rssi_count, sos,
+        unique devices, unique tourists) over the window; the distinct
+        counts are HyperLogLog estimates.
+        """
+        indexes = self.window_indexes(window_minutes)
+        totals = {}
+
+        with self._lock:
+            for zone_id in zone_ids:
+                count = rssi_count = sos = 0
+                rssi_sum = rssi_sq_sum = 0.0
+                devices = HyperLogLog(self.precision)
+                tourists = HyperLogLog(self.precision)
+
+                ring = self._zones.get(zone_id)
+                for index in indexes if ring is not None else ():
+                    bucket = ring[index % self.size]
+                    if bucket is None or bucket.index != index:
+                        continue
+                    count += bucket.count
+                    rssi_sum += bucket.rssi_sum
+                    rssi_sq_sum += bucket.rssi_sq_sum
+                    rssi_count += bucket.rssi_count
+                    sos += bucket.sos
+                    devices.merge(bucket.devices)
+                    tourists.merge(bucket.tourists)
+
+                totals[zone_id] = (count, rssi_sum, rssi_sq_sum, rssi_count, sos, devices.count(), tourists.count())
+
+        return totals
+
+    # -------------------------
+    # Density sketches
+    # -------------------------
+    def sketches(self, zone_id: int, indexes: range) -> Dict[int, Tuple[HyperLogLog, HyperLogLog]]:
+        """
+        bucket index -> copies of its (devices, tourists) sketches, for
+        the zone's buckets in `indexes`.
+        """
+        found = {}
+        with self._lock:
+            ring = self._zones.get(zone_id)
+            for index in indexes if ring is not None else ():
+                bucket = ring[index % self.size]
+                if bucket is not None and bucket.index == index:
+                    found[index] = (bucket.devices.copy(), bucket.tourists.copy())
+        return found
+
+    def take_dirty(self) -> List[Tuple[int, int, HyperLogLog, HyperLogLog]]:
+        """
+        (zone_id, bucket index, devices, tourists) copies of every
+        bucket whose sketches changed since the last call.
+        """
+        dirty = []
+        with self._lock:
+            for zone_id, ring in self._zones.items():
+                for bucket in ring:
+                    if bucket is not None and bucket.dirty:
+                        dirty.append((zone_id, bucket.index, bucket.devices.copy(), bucket.tourists.copy()))
+                        bucket.dirty = False
+        return dirty
+
+    def restore(self, zone_id: int, index: int, devices: HyperLogLog, tourists: HyperLogLog, dirty: bool = False):
+        """
+        Merge persisted (or unsaved, with dirty=True) sketches back
+        into the ring. Buckets that no longer fit are ignored.
+        """
+        now_index = int(time.time() // self.bucket_seconds)
+        if not now_index - self.size < index <= now_index:
+            return
+
+        with self._lock:
+            ring = self._zones.get(zone_id)
+            if ring is None:
+                ring = self._zones[zone_id] = [None] * self.size
+
+            bucket = self._bucket(ring, index)
+            bucket.devices.merge(devices)
+            bucket.tourists.merge(tourists)
+            bucket.dirty = bucket.dirty or dirty
+
+
+zone_windows = ZoneFeatureWindow(
+    settings.ZONE_FEATURE_BUCKET_SECONDS,
+    settings.ZONE_FEATURE_MAX_WINDOW_MINUTES,
+    settings.ZONE_SKETCH_PRECISION,
+)
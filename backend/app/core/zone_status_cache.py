@@ -0,0 +1,83 @@
+import hashlib
+import threading
+from typing import Dict, Iterable
+
+from app.utils.encoding import dumps
+
+
+class ZoneStatusCache:
+    """
+    Per-worker copy of zone_status, kept as ready-to-send JSON.
+
+    Every zone's entry is encoded once when it changes and the full
+    map is the concatenation of those entries, so a read is a dict
+    lookup or an attribute read with no query and no serialization.
+    The ETag is a hash of the map body, identical across workers
+    holding the same data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._zones: Dict[int, dict] = {}
+        self._encoded: Dict[int, bytes] = {}
+        self.version = 0
+        self.loaded = False
+        self._publish()
+
+    def __len__(self) -> int:
+        return len(self._zones)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def apply(self, rows: Iterable[dict]) -> int:
+        """
+        Merge serialized zone_status rows; rows older than the cached
+        entry are ignored, so a late sync never rolls a zone back.
+        Returns the number of zones that changed.
+        """
+        changed = 0
+        with self._lock:
+            for row in rows:
+                zone_id = row["zone_id"]
+                current = self._zones.get(zone_id)
+                if current is not None and (current == row or current["updated_at"] > row["updated_at"]):
+                    continue
+                self._zones[zone_id] = row
+                self._encoded[zone_id] = dumps(row)
+                changed += 1
+            if changed:
+                self._publish()
+        return changed
+
+    def replace(self, rows: Iterable[dict]):
+        rows = list(rows)
+        with self._lock:
+            self._zones = {row["zone_id"]: row for row in rows}
+            self._encoded = {row["zone_id"]: dumps(row) for row in rows}
+            self.loaded = True
+            self._publish()
+
+    def _publish(self):
+        # Entries are already JSON; joining them is the whole encode
+        body = b"[" + b",".join(self._encoded[zone_id] for zone_id in sorted(self._encoded)) + b"]"
+        self.version += 1
+        # Swapped together by one assignment, so readers never pair a
+        # body with another body's ETag
+        self._map = (body, '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"')
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    @property
+    def map(self) -> tuple:
+        """
+        (JSON array of every zone, ETag).
+        """
+        return self._map
+
+    def get(self, zone_id: int) -> bytes | None:
+        return self._encoded.get(zone_id)
+
+
+zone_statuses = ZoneStatusCache()
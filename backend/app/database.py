@@ -1,9 +1,148 @@
+from itertools import cycle
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
+from app.core.pool_metrics import metered_pool, register
+
+
+# -------------------------
+# Pool Configuration
+# -------------------------
+def _pool_options(url: str, name: str, pool_class) -> dict:
+    """
+    Sized, pre-pinged, metered QueuePool settings for one engine.
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+
+    return {
+        "poolclass": metered_pool(pool_class, register(name)),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _replica_urls() -> list[str]:
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+
+def _create_engine(url: str, name: str):
+    return create_engine(url, echo=False, **_pool_options(url, name, QueuePool))
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
 SessionLocal = sessionmaker(bind=engine)
 
+
+# -------------------------
+# SOS Engine (reserved connections)
+# -------------------------
+# SOS writes get a pool of their own so they never wait behind routine
+# ingestion for a connection. In-memory SQLite is one database per
+# engine, so there it shares the primary.
+def _create_sos_engine():
+    options = _pool_options(settings.DATABASE_URL, "sos", QueuePool)
+    if not options:
+        return engine
+    options.update(pool_size=settings.SOS_WORKERS, max_overflow=0)
+    return create_engine(settings.DATABASE_URL, echo=False, **options)
+
+
+SOSSessionLocal = sessionmaker(bind=_create_sos_engine())
+
+
+# -------------------------
+# Read Replicas (round-robin, primary when none configured)
+# -------------------------
+# Replicas lag the primary: only route reads that tolerate slightly
+# stale data (dashboard lists, aggregation), never read-your-writes.
+_read_factories = [
+    sessionmaker(bind=_create_engine(url, f"replica-{i}"))
+    for i, url in enumerate(_replica_urls())
+] or [SessionLocal]
+_next_read_factory = cycle(_read_factories)
+
+
+def ReadSessionLocal():
+    return next(_next_read_factory)()
+
+
+# -------------------------
+# Async Engine (asyncpg / aiosqlite)
+# -------------------------
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Derive the async driver URL from a sync one, e.g.
+    postgresql://... -> postgresql+asyncpg://...
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _create_async_engine(url: str, name: str):
+    return create_async_engine(
+        url,
+        echo=False,
+        **_pool_options(url, name, AsyncAdaptedQueuePool),
+    )
+
+
+# Created lazily so the sync path keeps working without the async drivers
+_async_engine = None
+_async_session_factory = None
+_async_read_factories = None
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _create_async_engine(
+            settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+            "async-primary",
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(),
+            expire_on_commit=False,
+        )
+    return _async_session_factory()
+
+
+def AsyncReadSessionLocal() -> AsyncSession:
+    global _async_read_factories
+    if _async_read_factories is None:
+        _async_read_factories = cycle([
+            async_sessionmaker(
+                _create_async_engine(async_database_url(url), f"async-replica-{i}"),
+                expire_on_commit=False,
+            )
+            for i, url in enumerate(_replica_urls())
+        ] or [AsyncSessionLocal])
+    return next(_async_read_factories)()
+
+
 class Base(DeclarativeBase):
     pass
@@ -4,7 +4,16 @@ from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import SessionLocal
+from app.core.auth_cache import (
+    Principal,
+    cache_principal,
+    invalidate_principal,
+    principal_cache,
+    token_cache,
+    token_digest,
+)
+from app.core.revocation import revocations
+from app.database import AsyncReadSessionLocal, AsyncSessionLocal, ReadSessionLocal, SessionLocal
 from app.models.user import User
 from app.models.iot_device import IoTDevice
 
@@ -23,14 +32,33 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Read-only, may lag the primary (replica when configured)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
 # -------------------------
-# Current User (JWT)
+# Token Verification (cached)
 # -------------------------
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
+def _verify_token(token: str) -> dict:
+    digest = token_digest(token)
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
 
     try:
         payload = jwt.decode(
@@ -38,23 +66,81 @@ def get_current_user(
             settings.JWT_SECRET,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        email: str | None = payload.get("sub")
-
-        if not email:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
-
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
 
-    user = db.query(User).filter(User.email == email).first()
+    if not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+    # Cached only as long as the token itself is valid
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(digest, payload, float(exp))
+
+    return payload
+
+# -------------------------
+# Verified, Non-Revoked Token Payload
+# -------------------------
+def get_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> dict:
+    payload = _verify_token(credentials.credentials)
+
+    if revocations.is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+
+    return payload
+
+# -------------------------
+# Current Principal (no DB on cache hit)
+# -------------------------
+def get_current_principal(
+    payload: dict = Depends(get_token_payload),
+    db: Session = Depends(get_db)
+) -> Principal:
+    email: str = payload["sub"]
+
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+
+    row = (
+        db.query(User.id, User.email, User.role)
+        .filter(User.email == email)
+        .first()
+    )
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    principal = Principal(id=row.id, email=row.email, role=row.role)
+    cache_principal(principal)
+    return principal
+
+# -------------------------
+# Current User (full row)
+# -------------------------
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    user = db.get(User, principal.id)
 
     if not user:
+        invalidate_principal(principal.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
@@ -66,8 +152,8 @@ def get_current_user(
 # Role Guards
 # -------------------------
 def require_tourist(
-    user: User = Depends(get_current_user)
-) -> User:
+    user: Principal = Depends(get_current_principal)
+) -> Principal:
     if user.role != "tourist":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -77,8 +163,8 @@ def require_tourist(
 
 
 def require_authority(
-    user: User = Depends(get_current_user)
-) -> User:
+    user: Principal = Depends(get_current_principal)
+) -> Principal:
     if user.role != "authority":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -91,7 +177,7 @@ def require_authority(
 # -------------------------
 def get_current_iot_device(
     x_api_key: str = Header(...),
-    db: Session = Depends(SessionLocal)
+    db: Session = Depends(get_db)
 ) -> IoTDevice:
     device = (
         db.query(IoTDevice)
@@ -1,11 +1,63 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import auth, incident, tourist, location, iot, websocket
+from app.core.backplane import create_backplane
+from app.core import pool_metrics
+from app.core.position_stream import positions
+from app.core.websocket_manager import manager
+from app.database import SessionLocal
+from app.routers import auth, incident, tourist, location, iot, websocket, export, zone, features, sos, notification
+from app.services.anomaly_service import anomalies
+from app.services.escalation_service import escalations
+from app.services.density_service import start_density_persistence, stop_density_persistence
+from app.services.feature_store import start_feature_store, stop_feature_store
+from app.services.notification_service import dispatcher, outbox_depth
+from app.services.partition_service import start_partition_maintenance, stop_partition_maintenance
+from app.services.revocation_service import start_revocation_sync, stop_revocation_sync
+from app.services.risk_model import risk_inference, start_risk_inference, stop_risk_inference
+from app.services.risk_scoring_service import risk_scheduler
+from app.services.sos_service import latency_report, shutdown_sos_pool
+from app.services.zone_status_service import start_zone_status_sync, stop_zone_status_sync
+from app.utils.helpers import shutdown_hash_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await manager.start(create_backplane())
+    positions.start()
+    anomalies.start()
+    dispatcher.start()
+    await escalations.start()
+    start_revocation_sync()
+    start_partition_maintenance()
+    start_density_persistence()
+    start_feature_store()
+    start_risk_inference()
+    await start_zone_status_sync()
+    risk_scheduler.start()
+    yield
+    await risk_scheduler.stop()
+    await stop_zone_status_sync()
+    await stop_risk_inference()
+    await stop_feature_store()
+    await stop_density_persistence()
+    await stop_partition_maintenance()
+    await stop_revocation_sync()
+    await escalations.stop()
+    await dispatcher.stop()
+    await anomalies.stop()
+    await positions.stop()
+    await manager.stop()
+    shutdown_sos_pool()
+    shutdown_hash_pool()
+
 
 app = FastAPI(
     title="Smart Tourist Safety System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -27,7 +79,76 @@ app.include_router(tourist.router, tags=["Tourists"])
 app.include_router(location.router, tags=["Location"])
 app.include_router(iot.router, tags=["IoT"])
 app.include_router(websocket.router, tags=["Websocket"])
+app.include_router(export.router, tags=["Exports"])
+app.include_router(zone.router, tags=["Zones"])
+app.include_router(features.router, tags=["Features"])
+app.include_router(sos.router, tags=["SOS"])
+app.include_router(notification.router, tags=["Notifications"])
 
 @app.get("/")
 def health_check():
     return {"status": "Backend running"}
+
+
+@app.get("/health/db")
+def database_pool_health():
+    """
+    Per-engine pool utilization and checkout latency.
+    """
+    return pool_metrics.report()
+
+
+@app.get("/health/risk-scoring")
+def risk_scoring_health():
+    """
+    Cycle / scoring latency and skipped-cycle counters.
+    """
+    return risk_scheduler.stats
+
+
+@app.get("/health/inference")
+def inference_health():
+    """
+    Batched model inference counters.
+    """
+    return {"model": risk_inference.model.name if risk_inference.model else None, **risk_inference.stats}
+
+
+@app.get("/health/anomalies")
+def anomaly_health():
+    """
+    Trajectory anomaly detector counters.
+    """
+    return {"tracked_tourists": len(anomalies.detector), **anomalies.stats}
+
+
+@app.get("/health/sos")
+def sos_health():
+    """
+    SOS fast lane counters and p50 / p99 latency from receipt to
+    broadcast, persisted and acknowledged.
+    """
+    return latency_report()
+
+
+@app.get("/health/notifications")
+def notification_health():
+    """
+    Outbox depth by status, dispatcher throughput, failure rates and
+    provider / delivery latency.
+    """
+    db = SessionLocal()
+    try:
+        depth = outbox_depth(db)
+    finally:
+        db.close()
+    return {"outbox": depth, **dispatcher.report()}
+
+
+@app.get("/health/escalations")
+def escalation_health():
+    """
+    Escalations opened / acknowledged / exhausted, timers pending on
+    this worker and alerts suppressed by dedup or rate limiting.
+    """
+    return escalations.report()
@@ -0,0 +1,87 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, Float, Text, DateTime, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Escalation(Base):
+    """
+    Escalation state of one SOS or incident. Timers live in each
+    worker's timer wheel; this row is what they are rebuilt from after
+    a restart, and advancing `next_tier` here is what makes exactly
+    one worker send each tier.
+    """
+    __tablename__ = "escalations"
+    __table_args__ = (
+        UniqueConstraint("kind", "ref", name="uq_escalations_kind_ref"),
+        Index("ix_escalations_status_next_at", "status", "next_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # sos / incident, and the SOS id or incident id
+    kind: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False
+    )
+
+    ref: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False
+    )
+
+    tourist_id: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True
+    )
+
+    # Zone the tourist was last seen in; picks the zone operators
+    zone_id: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True
+    )
+
+    latitude: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True
+    )
+
+    longitude: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True
+    )
+
+    summary: Mapped[str] = mapped_column(
+        Text,
+        nullable=False
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(20),  # active / acknowledged / exhausted
+        default="active",
+        nullable=False
+    )
+
+    # Index into the configured tiers of the next tier to send
+    next_tier: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False
+    )
+
+    next_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
+
+    opened_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+
+    acknowledged_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
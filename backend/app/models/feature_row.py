@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, DateTime, JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class FeatureRow(Base):
+    """
+    One materialized feature vector: `feature_set` values for one
+    entity (zone / tourist) over the window ending at `as_of`.
+    Append-only; value order is the feature set's definition.
+    """
+    __tablename__ = "feature_rows"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    feature_set: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False
+    )
+
+    entity_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+
+    # End of the window (exclusive); the row is valid from here on
+    as_of: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False
+    )
+
+    values: Mapped[list] = mapped_column(
+        JSON,
+        nullable=False
+    )
+
+    __table_args__ = (
+        # Point-in-time lookups per entity
+        Index("ix_feature_rows_set_entity_as_of", "feature_set", "entity_id", "as_of"),
+        # Latest tick / watermark / training scans
+        Index("ix_feature_rows_set_as_of", "feature_set", "as_of"),
+    )
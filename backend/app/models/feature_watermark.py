@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class FeatureWatermark(Base):
+    """
+    Range of ticks materialized per feature set. Ticks with no active
+    entities write no rows, so neither bound can come from the rows.
+    """
+    __tablename__ = "feature_watermarks"
+
+    feature_set: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True
+    )
+
+    # First tick still stored (moves forward with retention)
+    first_as_of: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
+
+    # Last tick materialized
+    as_of: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
@@ -21,6 +21,14 @@ class Incident(Base):
         default="open"
     )
 
+    # low / medium / high / critical; high and critical escalate
+    severity: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="medium",
+        server_default="medium"
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
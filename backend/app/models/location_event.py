@@ -6,6 +6,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -13,12 +14,21 @@ from app.database import Base
 
 
 class LocationEvent(Base):
+    """
+    On PostgreSQL this is a table range-partitioned by `timestamp`
+    (primary key (id, timestamp)), see app.services.partition_service.
+    Only the composite indexes below are kept: every extra index is
+    written on every ping.
+    """
     __tablename__ = "location_events"
+    __table_args__ = (
+        Index("ix_location_events_tourist_id_timestamp", "tourist_id", "timestamp"),
+        Index("ix_location_events_zone_id_timestamp", "zone_id", "timestamp"),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
-        primary_key=True,
-        index=True
+        primary_key=True
     )
 
     # Tourist being tracked (nullable because some RFID/BLE pings
@@ -26,22 +36,19 @@ class LocationEvent(Base):
     tourist_id: Mapped[int | None] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="SET NULL"),
-        nullable=True,
-        index=True
+        nullable=True
     )
 
     # ESP32 / Gateway device ID
     device_id: Mapped[str] = mapped_column(
         String(50),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Optional zone / geofence ID
     zone_id: Mapped[int | None] = mapped_column(
         Integer,
-        nullable=True,
-        index=True
+        nullable=True
     )
 
     # BLE signal strength
@@ -64,8 +71,7 @@ class LocationEvent(Base):
     # Data source type
     source: Mapped[str] = mapped_column(
         String(20),  # BLE / RFID / GNSS
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # SOS triggered by device or wristband
@@ -79,6 +85,5 @@ class LocationEvent(Base):
     timestamp: Mapped[datetime] = mapped_column(
         DateTime,
         default=datetime.utcnow,
-        nullable=False,
-        index=True
+        nullable=False
     )
@@ -0,0 +1,56 @@
+from datetime import datetime
+from sqlalchemy import Integer, Float, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class LocationRollup(Base):
+    """
+    Per-zone, per-minute summary of location events, kept after the
+    raw events age out of the retention window.
+    """
+    __tablename__ = "location_rollups"
+
+    zone_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True
+    )
+
+    # Start of the minute (UTC)
+    bucket: Mapped[datetime] = mapped_column(
+        DateTime,
+        primary_key=True
+    )
+
+    event_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    # Distinct tourists seen in the minute
+    tourist_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    sos_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    # Sum / count rather than an average so buckets can be merged
+    rssi_sum: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0
+    )
+
+    rssi_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
@@ -0,0 +1,89 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Notification(Base):
+    """
+    Outbox: a notification is written here first and sent by the
+    dispatcher afterwards, so request handlers never wait on a
+    provider and nothing is lost if a worker dies mid-send.
+    """
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # Due-row scan of the dispatcher
+        Index("ix_notification_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    user_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    # Provider name (local / sms / email / push ...)
+    channel: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False
+    )
+
+    # Phone number, email address or device token for the channel
+    recipient: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False
+    )
+
+    message: Mapped[str] = mapped_column(
+        Text,
+        nullable=False
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(20),  # pending / sending / sent / failed
+        default="pending",
+        nullable=False
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False
+    )
+
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+
+    # Set while a dispatcher holds the row; an expired lease (worker
+    # died mid-send) makes it claimable again
+    claim_token: Mapped[str | None] = mapped_column(
+        String(32),
+        nullable=True
+    )
+
+    lease_until: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
+
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
+
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
@@ -0,0 +1,85 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, Float, Text, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class SOSEvent(Base):
+    """
+    One SOS and when it passed each stage of the fast lane. The raw
+    ping is still written to location_events (`location_event_id`;
+    no foreign key, that table is partitioned on PostgreSQL).
+    """
+    __tablename__ = "sos_events"
+
+    # Assigned on receipt, before anything is written
+    id: Mapped[str] = mapped_column(
+        String(32),
+        primary_key=True
+    )
+
+    location_event_id: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True
+    )
+
+    tourist_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True
+    )
+
+    device_id: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False
+    )
+
+    message: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True
+    )
+
+    # Last known position from the live position stream, if any
+    latitude: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True
+    )
+
+    longitude: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True
+    )
+
+    located_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
+
+    # Stage timestamps
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True
+    )
+
+    broadcast_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
+
+    persisted_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
+
+    acknowledged_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True
+    )
+
+    acknowledged_by: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True
+    )
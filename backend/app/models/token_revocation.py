@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Single token (logout / stolen device)
+    jti: Mapped[str | None] = mapped_column(
+        String(64),
+        unique=True,
+        nullable=True
+    )
+
+    # Every token of a user issued before revoked_at (deactivation)
+    subject: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        index=True
+    )
+
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        index=True
+    )
+
+    # After this no affected token can still be valid -> prunable
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True
+    )
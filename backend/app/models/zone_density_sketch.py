@@ -0,0 +1,47 @@
+from datetime import datetime
+from sqlalchemy import Integer, DateTime, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ZoneDensitySketch(Base):
+    """
+    HyperLogLog sketches of the distinct devices / tourists seen in a
+    zone during one bucket. Workers merge theirs into the stored row,
+    so a row covers every worker's pings.
+    """
+    __tablename__ = "zone_density_sketches"
+
+    zone_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True
+    )
+
+    # Start of the bucket (UTC)
+    bucket: Mapped[datetime] = mapped_column(
+        DateTime,
+        primary_key=True,
+        index=True
+    )
+
+    bucket_seconds: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+
+    devices: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False
+    )
+
+    tourists: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False
+    )
@@ -1,21 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_db
+from app.dependencies import get_async_db, get_db, get_token_payload, require_authority
+from app.models.user import User
 from app.schemas.user_schema import UserCreate, UserLogin
 from app.services.auth_service import create_user, authenticate
+from app.services.revocation_service import revoke_token, revoke_user_tokens
 from app.utils.jwt import create_token
 
 router = APIRouter()
 
 @router.post("/register")
-def register(data: UserCreate, db: Session = Depends(get_db)):
-    user = create_user(db, data.email, data.password, data.role, full_name=data.full_name, phone=data.phone, emergency_contact=data.emergency_contact, blood_group=data.blood_group, medical_conditions=data.medical_conditions, allergies=data.allergies, date_of_birth=data.date_of_birth, gender=data.gender, nationality=data.nationality)
+async def register(data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    user = await create_user(db, data.email, data.password, data.role, full_name=data.full_name, phone=data.phone, emergency_contact=data.emergency_contact, blood_group=data.blood_group, medical_conditions=data.medical_conditions, allergies=data.allergies, date_of_birth=data.date_of_birth, gender=data.gender, nationality=data.nationality)
     return {"id": user.id, "email": user.email}
 
 @router.post("/login")
-def login(data: UserLogin, db: Session = Depends(get_db)):
-    user = authenticate(db, data.email, data.password)
+async def login(data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate(db, data.email, data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -24,3 +27,21 @@ def login(data: UserLogin, db: Session = Depends(get_db)):
         "role": user.role
     })
     return {"access_token": token}
+
+
+@router.post("/logout")
+def logout(payload: dict = Depends(get_token_payload), db: Session = Depends(get_db)):
+    if not payload.get("jti"):
+        raise HTTPException(status_code=400, detail="Token cannot be revoked")
+
+    revoke_token(db, payload)
+    return {"status": "logged_out"}
+
+@router.post("/users/{user_id}/revoke-tokens")
+def revoke_tokens(user_id: int, db: Session = Depends(get_db), _=Depends(require_authority)):
+    user = db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    revoke_user_tokens(db, user.email)
+    return {"status": "tokens_revoked", "user_id": user_id}
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.database import ReadSessionLocal
+from app.dependencies import require_authority
+from app.services import export_service
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+# -----------------------------------
+# Authority: Location Events (Parquet / Arrow IPC)
+# -----------------------------------
+@router.get("/location-events")
+def export_location_events(
+    start: datetime,
+    end: datetime,
+    format: str = "parquet",
+    zone_id: int | None = None,
+    source: str | None = None,
+    tourist_id: int | None = None,
+    _=Depends(require_authority),
+):
+    """
+    Stream events in [start, end) as a columnar file, one row group
+    at a time, straight from a server-side cursor.
+    """
+    if format not in export_service.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(export_service.FORMATS)}")
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if export_service.pa is None:
+        raise HTTPException(status_code=501, detail="Columnar export is not available on this server")
+
+    filters = {"zone_id": zone_id, "source": source, "tourist_id": tourist_id}
+
+    def _stream():
+        db = ReadSessionLocal()
+        try:
+            yield from export_service.stream_export(db.connection(), format, start, end, **filters)
+        finally:
+            db.close()
+
+    media_type, extension = export_service.FORMATS[format]
+    filename = f"location_events_{start:%Y%m%dT%H%M}_{end:%Y%m%dT%H%M}.{extension}"
+    return StreamingResponse(
+        _stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.dependencies import get_read_db, require_authority
+from app.services import feature_store
+
+router = APIRouter(prefix="/features", tags=["Features"])
+
+
+def _feature_set(name: str) -> feature_store.FeatureSet:
+    try:
+        return feature_store.get_feature_set(name)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+# -----------------------------------
+# Authority: Feature Store
+# -----------------------------------
+@router.get("/sets")
+def list_feature_sets(db: Session = Depends(get_read_db), _=Depends(require_authority)):
+    return [
+        {
+            "name": feature_set.name,
+            "entity": feature_set.entity,
+            "features": list(feature_set.features),
+            "window_minutes": feature_set.window_minutes,
+            "interval_minutes": feature_set.interval_minutes,
+            "materialized_to": feature_store.watermark(db, feature_set),
+        }
+        for feature_set in feature_store.FEATURE_SETS.values()
+    ]
+
+
+@router.get("/{name}/latest")
+def latest_features(
+    name: str,
+    entity_id: List[int] | None = Query(None),
+    db: Session = Depends(get_read_db),
+    _=Depends(require_authority),
+):
+    """
+    Rows of the last materialized tick (online serving).
+    """
+    feature_set = _feature_set(name)
+    as_of, rows = feature_store.latest(db, feature_set, entity_id)
+    return {
+        "feature_set": name,
+        "as_of": as_of,
+        "features": list(feature_set.features),
+        "rows": rows,
+    }
+
+
+@router.get("/{name}/{entity_id}")
+def features_as_of(
+    name: str,
+    entity_id: int,
+    as_of: datetime,
+    db: Session = Depends(get_read_db),
+    _=Depends(require_authority),
+):
+    """
+    What would have been served for the entity at `as_of`.
+    """
+    feature_set = _feature_set(name)
+    if as_of.tzinfo is not None:
+        # Stored ticks are naive UTC
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+
+    values = feature_store.point_in_time(db, feature_set, [(entity_id, as_of)])[0]
+    if values is None:
+        raise HTTPException(status_code=404, detail="Not materialized up to as_of yet")
+
+    return {
+        "feature_set": name,
+        "entity_id": entity_id,
+        "as_of": feature_set.tick(as_of),
+        "values": dict(zip(feature_set.features, values)),
+    }
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import (
-    get_db,
+    get_async_db,
+    get_async_read_db,
     require_tourist,
     require_authority,
 )
-from app.models.user import User
+from app.core.auth_cache import Principal
 from app.schemas.incident_schema import (
     IncidentCreate,
     IncidentResponse,
@@ -33,11 +34,11 @@ router = APIRouter(prefix="/incidents", tags=["Incidents"])
 # Tourist: My Incidents
 # -------------------------
 @router.get("/my", response_model=list[IncidentResponse])
-def my_incidents(
-    db: Session = Depends(get_db),
-    user: User = Depends(require_tourist),
+async def my_incidents(
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(require_tourist),
 ):
-    return get_incidents_by_tourist(
+    return await get_incidents_by_tourist(
         db=db,
         tourist_id=user.id
     )
@@ -49,8 +50,8 @@ def my_incidents(
 @router.post("/", response_model=IncidentResponse)
 async def report_incident(
     data: IncidentCreate,
-    db: Session = Depends(get_db),
-    user: User = Depends(require_tourist),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(require_tourist),
 ):
     return await create_incident(
         db=db,
@@ -58,6 +59,7 @@ async def report_incident(
         description=data.description,
         latitude=data.latitude,
         longitude=data.longitude,
+        severity=data.severity,
     )
 
 
@@ -65,23 +67,23 @@ async def report_incident(
 # Authority: List Incidents
 # -------------------------
 @router.get("/", response_model=list[IncidentResponse])
-def list_incidents(
-    db: Session = Depends(get_db),
+async def list_incidents(
+    db: AsyncSession = Depends(get_async_read_db),
     _=Depends(require_authority),
 ):
-    return get_all_incidents(db)
+    return await get_all_incidents(db)
 
 
 # -------------------------
 # Authority: Incident Detail
 # -------------------------
 @router.get("/{incident_id}", response_model=IncidentResponse)
-def incident_detail(
+async def incident_detail(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     _=Depends(require_authority),
 ):
-    return get_incident_by_id(db, incident_id)
+    return await get_incident_by_id(db, incident_id)
 
 
 # -------------------------
@@ -91,7 +93,7 @@ def incident_detail(
 async def change_status(
     incident_id: int,
     data: IncidentStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _=Depends(require_authority),
 ):
     return await update_incident_status(
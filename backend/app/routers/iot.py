@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Header, HTTPException
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, get_current_iot_device
@@ -7,6 +7,13 @@ from app.schemas.location_event_schema import LocationEventCreate
 from app.schemas.iot_schema import IoTHeartbeat, IoTSOS
 from app.models.location_event import LocationEvent
 from app.models.iot_device import IoTDevice
+from app.core.position_stream import positions
+from app.core.zone_features import zone_windows
+from app.services.anomaly_service import anomalies
+from app.services.sos_service import authenticate_device, raise_sos
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/iot", tags=["IoT"])
 
@@ -18,11 +25,25 @@ def ingest_location(
     device: IoTDevice = Depends(get_current_iot_device)
 ):
     event = LocationEvent(
-        **data.model_dump(exclude_unset=True),
+        **data.model_dump(exclude_unset=True, exclude={"device_id"}),
         device_id=device.device_id
     )
+    # Read before commit; afterwards every attribute access reloads the row
+    tourist_id, zone_id, device_id = event.tourist_id, event.zone_id, event.device_id
+    latitude, longitude = event.latitude, event.longitude
+    rssi, sos = event.rssi, bool(event.sos_flag)
+    ts = event.timestamp.replace(tzinfo=timezone.utc).timestamp() if event.timestamp else None
+
     db.add(event)
     db.commit()
+
+    if tourist_id is not None and latitude is not None and longitude is not None:
+        positions.update(tourist_id, latitude, longitude)
+        anomalies.record(tourist_id, latitude, longitude, ts)
+
+    if zone_id is not None:
+        zone_windows.record(zone_id, device_id, rssi=rssi, sos=sos, ts=ts, tourist_id=tourist_id)
+
     return {"status": "location_event_saved"}
 
 
@@ -52,18 +73,28 @@ def heartbeat(
     }
 
 
+async def _sos_device(x_api_key: str = Header(...)) -> str:
+    # Not get_current_iot_device: that waits on the shared pool
+    device_id = await authenticate_device(x_api_key)
+    if device_id is None:
+        raise HTTPException(status_code=401, detail="Invalid or inactive IoT device")
+    return device_id
+
+
 @router.post("/sos")
-def sos_event(
+async def sos_event(
     data: IoTSOS,
-    db: Session = Depends(get_db),
-    device: IoTDevice = Depends(get_current_iot_device)
+    device_id: str = Depends(_sos_device)
 ):
-    event = LocationEvent(
-        tourist_id=data.tourist_id,
-        device_id=device.device_id,
-        source="SOS",
-        sos_flag=True
-    )
-    db.add(event)
-    db.commit()
-    return {"status": "sos_recorded"}
+    """
+    SOS fast lane: broadcast to dashboards, then persist on reserved
+    threads and connections. Responds once the SOS is stored; retries
+    (same idempotency_key, or the same tourist within SOS_DEDUP_SECONDS)
+    return the original SOS with `duplicate: true`.
+    """
+    try:
+        sos = await raise_sos(device_id, data.tourist_id, data.message, data.idempotency_key)
+    except Exception:
+        logger.exception("Persisting SOS from %s failed", device_id)
+        raise HTTPException(status_code=503, detail="SOS not stored, retry")
+    return {"status": "sos_recorded", **sos}
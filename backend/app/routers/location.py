@@ -4,7 +4,9 @@ from sqlalchemy.orm import Session
 from app.dependencies import get_db, require_tourist
 from app.schemas.location_schema import LocationUpdate
 from app.models.location import Location
-from app.models.user import User
+from app.core.auth_cache import Principal
+from app.core.position_stream import positions
+from app.services.anomaly_service import anomalies
 
 router = APIRouter()
 
@@ -12,7 +14,7 @@ router = APIRouter()
 def update_location(
     data: LocationUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(require_tourist)
+    user: Principal = Depends(require_tourist)
 ):
     location = Location(
         latitude=data.latitude,
@@ -21,4 +23,7 @@ def update_location(
     )
     db.add(location)
     db.commit()
+
+    positions.update(user.id, data.latitude, data.longitude)
+    anomalies.record(user.id, data.latitude, data.longitude)
     return {"status": "location updated"}
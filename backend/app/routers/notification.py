@@ -1,9 +1,25 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.dependencies import get_db, require_authority
 from app.services.notification_service import send_notification
 
 router = APIRouter()
 
+
 @router.post("/send")
-def notify(user_id: int, message: str):
-    send_notification(user_id, message)
-    return {"status": "sent"}
+def notify(
+    user_id: int,
+    message: str,
+    channel: str | None = None,
+    db: Session = Depends(get_db),
+    _=Depends(require_authority),
+):
+    """
+    Queue a notification; it is sent in the background.
+    """
+    try:
+        notification = send_notification(db, user_id, message, channel)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"status": "queued", "id": notification.id, "channel": notification.channel}
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.auth_cache import Principal
+from app.dependencies import require_authority
+from app.services.sos_service import acknowledge_sos
+
+router = APIRouter(prefix="/sos", tags=["SOS"])
+
+
+# -----------------------------------
+# Authority: Acknowledge SOS
+# -----------------------------------
+@router.post("/{sos_id}/ack")
+async def acknowledge(sos_id: str, user: Principal = Depends(require_authority)):
+    """
+    First acknowledgement wins; later ones report who was first.
+    """
+    result = await acknowledge_sos(sos_id, user.id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="SOS not found")
+    return result
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.dependencies import get_db, require_tourist, require_authority
-from app.models.user import User
-from app.schemas.tourist_schema import TouristResponse, TouristUpdate
+from app.dependencies import get_async_db, get_async_read_db, get_read_db, require_tourist, require_authority
+from app.core.auth_cache import Principal
+from app.schemas.location_event_schema import TrajectoryPoint
+from app.schemas.tourist_schema import TouristImportResult, TouristResponse, TouristUpdate
+from app.services.archive_service import get_trajectory
+from app.services.tourist_import_service import (
+    import_tourists,
+    iter_csv_rows,
+    iter_lines,
+    iter_ndjson_rows,
+)
 from app.services.tourist_service import (
     update_tourist_profile,
     get_all_tourists,
@@ -18,10 +28,11 @@ router = APIRouter(prefix="/tourists", tags=["Tourists"])
 # Tourist: Get Own Profile
 # -----------------------------------
 @router.get("/me", response_model=TouristResponse)
-def get_my_profile(
-    user: User = Depends(require_tourist),
+async def get_my_profile(
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(require_tourist),
 ):
-    return user
+    return await get_tourist_by_id(db, user.id)
 
 
 # -----------------------------------
@@ -30,8 +41,8 @@ def get_my_profile(
 @router.put("/me", response_model=TouristResponse)
 async def update_my_profile(
     data: TouristUpdate,
-    db: Session = Depends(get_db),
-    user: User = Depends(require_tourist),
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(require_tourist),
 ):
     updated_user = await update_tourist_profile(
         db=db,
@@ -54,25 +65,68 @@ async def update_my_profile(
 # Authority: List All Tourists
 # -----------------------------------
 @router.get("/", response_model=List[TouristResponse])
-def list_tourists(
-    db: Session = Depends(get_db),
-    _: User = Depends(require_authority),
+async def list_tourists(
+    db: AsyncSession = Depends(get_async_read_db),
+    _: Principal = Depends(require_authority),
+):
+    return await get_all_tourists(db)
+
+
+# -----------------------------------
+# Authority: Bulk Import (CSV / NDJSON)
+# -----------------------------------
+@router.post("/import", response_model=TouristImportResult)
+async def bulk_import_tourists(
+    request: Request,
+    format: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    _: Principal = Depends(require_authority),
 ):
-    return get_all_tourists(db)
+    """
+    Stream the raw request body (text/csv with a header row, or
+    application/x-ndjson) and import it batch by batch.
+    """
+    content_type = request.headers.get("content-type", "")
+    kind = format or ("ndjson" if "ndjson" in content_type or "json" in content_type else "csv")
+
+    if kind not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+
+    lines = iter_lines(request.stream())
+    rows = iter_csv_rows(lines) if kind == "csv" else iter_ndjson_rows(lines)
+
+    return await import_tourists(db, rows)
 
 
 # -----------------------------------
 # Authority: Get Tourist By ID
 # -----------------------------------
 @router.get("/{tourist_id}", response_model=TouristResponse)
-def get_tourist_by_id_route(
+async def get_tourist_by_id_route(
     tourist_id: int,
-    db: Session = Depends(get_db),
-    _: User = Depends(require_authority),
+    db: AsyncSession = Depends(get_async_db),
+    _: Principal = Depends(require_authority),
 ):
-    tourist = get_tourist_by_id(db, tourist_id)
+    tourist = await get_tourist_by_id(db, tourist_id)
 
     if not tourist:
         raise HTTPException(status_code=404, detail="Tourist not found")
 
     return tourist
+
+
+# -----------------------------------
+# Authority: Trajectory (hot + archived events)
+# -----------------------------------
+@router.get("/{tourist_id}/trajectory", response_model=List[TrajectoryPoint])
+def get_tourist_trajectory(
+    tourist_id: int,
+    start: datetime,
+    end: datetime,
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(require_authority),
+):
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    return get_trajectory(db, tourist_id, start, end)
@@ -1,5 +1,14 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from app.core.websocket_manager import manager
+import json
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.position_stream import positions, Viewport
+from app.core.revocation import revocations
+from app.core.websocket_manager import manager, Subscription
+from app.database import SessionLocal
+from app.dependencies import _verify_token
+from app.services.snapshot_service import load_dashboard_state
 
 router = APIRouter()
 
@@ -9,6 +18,122 @@ async def dashboard_websocket(websocket: WebSocket):
 
     try:
         while True:
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            await _handle_client_message(websocket, text)
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
+
+
+@router.websocket("/ws/positions")
+async def positions_websocket(websocket: WebSocket):
+    """
+    Live map positions. Clients declare what they are looking at:
+      {"action": "viewport", "bbox": [min_lat, min_lng, max_lat, max_lng], "zoom": 14}
+    and receive `positions` (or `position_clusters` at low zoom) frames.
+
+    Authorities only: the token goes in `?token=` (browsers cannot set
+    headers on a WebSocket) or an Authorization header.
+    """
+    if not _is_authority(websocket):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await positions.connect(websocket)
+
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                data = json.loads(text)
+            except ValueError:
+                continue  # keep-alive pings / plain text are ignored
+            if not isinstance(data, dict) or data.get("action") != "viewport":
+                continue
+            try:
+                bbox = [float(v) for v in data["bbox"]]
+                viewport = Viewport(*bbox, zoom=int(data.get("zoom", 15)))
+            except (KeyError, TypeError, ValueError) as exc:
+                await websocket.send_json({"type": "error", "detail": f"Invalid viewport: {exc}"})
+                continue
+            await positions.set_viewport(websocket, viewport)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        positions.disconnect(websocket)
+
+
+def _is_authority(websocket: WebSocket) -> bool:
+    token = websocket.query_params.get("token")
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    if not token:
+        return False
+
+    try:
+        payload = _verify_token(token)
+    except HTTPException:
+        return False
+    return not revocations.is_revoked(payload) and payload.get("role") == "authority"
+
+
+async def _handle_client_message(websocket: WebSocket, text: str):
+    """
+    Clients narrow what they receive with:
+      {"action": "subscribe", "types": [...], "zones": [...],
+       "tourists": [...], "bbox": [min_lat, min_lng, max_lat, max_lng]}
+      {"action": "unsubscribe"}  -> back to receiving everything
+
+    and catch up after a reconnect with:
+      {"action": "resume", "epoch": "<from hello>", "seq": <last seen>}
+
+    Large frames arrive as zlib-deflated binary after:
+      {"action": "options", "compression": "deflate"}
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return  # keep-alive pings / plain text are ignored
+
+    if not isinstance(data, dict):
+        return
+
+    action = data.get("action")
+
+    if action == "subscribe":
+        try:
+            subscription = Subscription.from_request(data)
+        except (TypeError, ValueError) as exc:
+            await websocket.send_json({"type": "error", "detail": str(exc)})
+            return
+        manager.subscribe(websocket, subscription)
+        await websocket.send_json({"type": "subscribed"})
+
+    elif action == "unsubscribe":
+        manager.subscribe(websocket, Subscription())
+        await websocket.send_json({"type": "subscribed"})
+
+    elif action == "options":
+        manager.set_compression(websocket, data.get("compression") == "deflate")
+        await websocket.send_json({"type": "options", "compression": data.get("compression")})
+
+    elif action == "resume":
+        try:
+            last_seq = int(data.get("seq") or 0)
+        except (TypeError, ValueError):
+            await websocket.send_json({"type": "error", "detail": "seq must be an integer"})
+            return
+        await manager.resume(websocket, data.get("epoch"), last_seq, _load_state)
+
+
+async def _load_state() -> list:
+    def _load():
+        db = SessionLocal()
+        try:
+            return load_dashboard_state(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(_load)
@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.zone_status_cache import zone_statuses
+from app.database import ReadSessionLocal
+from app.dependencies import require_authority
+from app.services import density_service
+from app.services.feature_service import ZoneFeatureMatrix, compute_zone_feature_matrix
+from app.services.risk_model import risk_inference
+from app.services.zone_service import risk_level
+
+router = APIRouter(prefix="/zones", tags=["Zones"])
+
+
+# -----------------------------------
+# Authority: Zone Risk Map (in-memory snapshot)
+# -----------------------------------
+@router.get("/status")
+def get_zone_statuses(request: Request, _=Depends(require_authority)):
+    """
+    Every zone's stored risk, as a list of ZoneStatusResponse. Served
+    pre-encoded from memory; clients polling with If-None-Match get
+    304 until a zone changes.
+    """
+    if not zone_statuses.loaded:
+        raise HTTPException(status_code=503, detail="Zone status snapshot is loading")
+
+    body, etag = zone_statuses.map
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{zone_id}/status")
+def get_zone_status(zone_id: int, _=Depends(require_authority)):
+    if not zone_statuses.loaded:
+        raise HTTPException(status_code=503, detail="Zone status snapshot is loading")
+
+    body = zone_statuses.get(zone_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Zone has no risk status yet")
+    return Response(content=body, media_type="application/json")
+
+
+def _zone_features(zone_id: int, window_minutes: int) -> ZoneFeatureMatrix:
+    db = ReadSessionLocal()
+    try:
+        return compute_zone_feature_matrix(db, window_minutes, zone_ids=[zone_id])
+    finally:
+        db.close()
+
+
+# -----------------------------------
+# Authority: Live Zone Risk
+# -----------------------------------
+@router.get("/{zone_id}/risk")
+async def get_zone_risk(zone_id: int, _=Depends(require_authority)):
+    """
+    Score the zone's current features; concurrent requests share one
+    batched model call.
+    """
+    window = settings.RISK_FEATURE_WINDOW_MINUTES
+    matrix = await run_in_threadpool(_zone_features, zone_id, window)
+    score = await risk_inference.score(matrix.rows[0])
+
+    return {
+        "zone_id": zone_id,
+        "risk_score": score,
+        "risk_level": risk_level(score),
+        "model": risk_inference.model.name,
+        "window_minutes": window,
+        "features": matrix.row(zone_id),
+    }
+
+
+def _zone_density(zone_id: int, window_minutes: int):
+    db = ReadSessionLocal()
+    try:
+        return density_service.zone_density(db, [zone_id], window_minutes)
+    finally:
+        db.close()
+
+
+# -----------------------------------
+# Authority: Crowd Density
+# -----------------------------------
+@router.get("/{zone_id}/stats")
+async def get_zone_stats(zone_id: int, window_minutes: int = 10, _=Depends(require_authority)):
+    """
+    Estimated distinct devices / tourists in the zone over the window,
+    merged from per-bucket HyperLogLog sketches.
+    """
+    if not 1 <= window_minutes <= settings.ZONE_SKETCH_RETENTION_DAYS * 24 * 60:
+        raise HTTPException(status_code=400, detail="window_minutes is outside the sketch retention")
+
+    density, source = await run_in_threadpool(_zone_density, zone_id, window_minutes)
+    devices, tourists = density[zone_id]
+
+    return {
+        "zone_id": zone_id,
+        "window_minutes": window_minutes,
+        "unique_devices": devices,
+        "unique_tourists": tourists,
+        "standard_error": round(density_service.standard_error(), 4),
+        "source": source,
+    }
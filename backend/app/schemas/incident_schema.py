@@ -1,11 +1,13 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Literal
 
 
 class IncidentCreate(BaseModel):
     description: str
     latitude: float
     longitude: float
+    severity: Literal["low", "medium", "high", "critical"] = "medium"
 
 
 class IncidentResponse(BaseModel):
@@ -15,6 +17,7 @@ class IncidentResponse(BaseModel):
     longitude: float
     tourist_id: int
     status: str
+    severity: str
     created_at: datetime
 
     class Config:
@@ -10,3 +10,5 @@ class IoTSOS(BaseModel):
     device_id: str
     tourist_id: int | None = None
     message: str | None = None
+    # Same key on a retry -> same SOS, also across workers
+    idempotency_key: str | None = Field(None, max_length=64)
@@ -72,3 +72,19 @@ class LocationEventResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TrajectoryPoint(BaseModel):
+    """
+    One point of a tourist trajectory (hot table or cold archive)
+    """
+
+    timestamp: datetime
+    latitude: Optional[float]
+    longitude: Optional[float]
+    zone_id: Optional[int]
+    source: str
+    sos_flag: bool
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 
@@ -36,3 +36,30 @@ class TouristUpdate(BaseModel):
     date_of_birth: Optional[date] = None
     gender: Optional[str] = None
     nationality: Optional[str] = None
+
+
+class TouristImportRow(BaseModel):
+    email: EmailStr
+    password: str
+
+    full_name: Optional[str] = None
+    phone: Optional[str] = None
+    emergency_contact: Optional[str] = None
+    blood_group: Optional[str] = None
+    medical_conditions: Optional[str] = None
+    allergies: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    gender: Optional[str] = None
+    nationality: Optional[str] = None
+
+
+class TouristImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class TouristImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TouristImportError]
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import List
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.trajectory_anomaly import KINDS, Anomaly, TrajectoryAnomalyDetector
+from app.core.websocket_manager import manager
+from app.database import AsyncSessionLocal
+from app.services.incident_service import create_incident
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def serialize_anomaly(anomaly: Anomaly) -> dict:
+    return {
+        "kind": anomaly.kind,
+        "tourist_id": anomaly.tourist_id,
+        "latitude": anomaly.latitude,
+        "longitude": anomaly.longitude,
+        "score": round(anomaly.score, 3),
+        "detected_at": datetime.fromtimestamp(anomaly.timestamp, timezone.utc).isoformat(),
+        **anomaly.detail,
+    }
+
+
+class AnomalyMonitor:
+    """
+    Feeds ingested pings through the trajectory detector and turns
+    what it flags into `tourist_anomaly` alerts (and, with
+    ANOMALY_CREATE_INCIDENTS, incidents).
+
+    Ingestion only runs the detector and queues results; one loop task
+    dispatches them and periodically sweeps for tourists gone silent.
+    """
+
+    def __init__(self):
+        self.detector = TrajectoryAnomalyDetector(
+            max_tourists=settings.ANOMALY_MAX_TOURISTS,
+            warmup_points=settings.ANOMALY_WARMUP_POINTS,
+            speed_mps=settings.ANOMALY_SPEED_MPS,
+            stray_m=settings.ANOMALY_STRAY_METERS,
+            stray_z=settings.ANOMALY_STRAY_Z,
+            idle_minutes=settings.ANOMALY_IDLE_MINUTES,
+            rest_minutes=settings.ANOMALY_REST_MINUTES,
+            cooldown_minutes=settings.ANOMALY_COOLDOWN_MINUTES,
+        )
+        self._pending: deque = deque()
+        self._task: asyncio.Task | None = None
+        self.stats = {"observed": 0, "stale": 0, "dispatched": 0, "failed": 0, **{kind: 0 for kind in KINDS}}
+
+    # -------------------------
+    # Ingestion
+    # -------------------------
+    def record(self, tourist_id: int, latitude: float, longitude: float, event_ts: float | None = None):
+        """
+        Pings from the app and from IoT devices are timed by this
+        server's clock, so one tourist's pings never mix clocks (and
+        go out of order); the sweep uses the same clock. A device
+        timestamp only serves to skip stale, buffered pings.
+        """
+        if not settings.ANOMALY_DETECTION_ENABLED:
+            return
+        now = time.time()
+        if event_ts is not None and now - event_ts > settings.ANOMALY_MAX_LAG_SECONDS:
+            self.stats["stale"] += 1
+            return
+        self.stats["observed"] += 1
+        found = self.detector.observe(tourist_id, latitude, longitude, now)
+        if found:
+            self._pending.extend(found)
+
+    # -------------------------
+    # Dispatch Loop
+    # -------------------------
+    def start(self):
+        if self._task is None and settings.ANOMALY_DETECTION_ENABLED:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        last_sweep = time.time()
+        while True:
+            await asyncio.sleep(1.0)
+            try:
+                if time.time() - last_sweep >= settings.ANOMALY_SWEEP_SECONDS:
+                    last_sweep = time.time()
+                    self._pending.extend(await run_in_threadpool(self.detector.sweep, last_sweep))
+                await self.dispatch()
+            except Exception:
+                logger.exception("Anomaly dispatch failed")
+
+    async def dispatch(self) -> List[Anomaly]:
+        sent = []
+        while self._pending:
+            anomaly = self._pending.popleft()
+            try:
+                await self._dispatch(anomaly)
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception("Dispatching %s anomaly for tourist %s failed", anomaly.kind, anomaly.tourist_id)
+                continue
+            self.stats[anomaly.kind] += 1
+            self.stats["dispatched"] += 1
+            sent.append(anomaly)
+        return sent
+
+    async def _dispatch(self, anomaly: Anomaly):
+        await manager.broadcast(
+            {"type": "tourist_anomaly", "data": serialize_anomaly(anomaly)},
+            tourist_id=anomaly.tourist_id,
+            location=(anomaly.latitude, anomaly.longitude),
+        )
+
+        if settings.ANOMALY_CREATE_INCIDENTS:
+            details = ", ".join(f"{key}={value}" for key, value in anomaly.detail.items())
+            async with AsyncSessionLocal() as db:
+                await create_incident(
+                    db,
+                    tourist_id=anomaly.tourist_id,
+                    description=f"Auto-detected {anomaly.kind} anomaly ({details})",
+                    latitude=anomaly.latitude,
+                    longitude=anomaly.longitude,
+                )
+
+
+anomalies = AnomalyMonitor()
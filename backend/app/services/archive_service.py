@@ -0,0 +1,186 @@
+import fcntl
+import heapq
+import os
+from itertools import chain
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.trajectory_archive import ANONYMOUS, SOURCES, ArchiveDay, ArchivedPoint, DayWriter
+from app.models.location_event import LocationEvent
+from app.services.partition_service import PARENT, rollup
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DAY = timedelta(days=1)
+
+
+def _day(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def archive_path(day: datetime) -> str:
+    return os.path.join(settings.ARCHIVE_DIR, f"{day:%Y-%m-%d}.sta")
+
+
+def _key(point: ArchivedPoint) -> tuple:
+    return (
+        point.tourist_id,
+        point.timestamp,
+        point.latitude,
+        point.longitude,
+        point.zone_id,
+        point.source,
+        point.sos_flag,
+    )
+
+
+def _archived(event) -> ArchivedPoint:
+    """
+    A hot row as it reads back from the archive (ms precision,
+    7-decimal coordinates), so hot and cold copies compare equal.
+    """
+    ts = event.timestamp
+    source = (event.source or "").upper()
+    return ArchivedPoint(
+        tourist_id=event.tourist_id if event.tourist_id is not None else ANONYMOUS,
+        timestamp=ts.replace(microsecond=ts.microsecond // 1000 * 1000),
+        latitude=None if event.latitude is None else round(event.latitude, 7),
+        longitude=None if event.longitude is None else round(event.longitude, 7),
+        zone_id=event.zone_id,
+        source=source if source in SOURCES else "OTHER",
+        sos_flag=bool(event.sos_flag),
+    )
+
+
+# --------------------------------
+# Archiver (hot table -> per-day files)
+# --------------------------------
+def _order(point: ArchivedPoint) -> tuple:
+    return (point.tourist_id, point.timestamp)
+
+
+def _merge(archived: Iterable[ArchivedPoint], hot: Iterable[ArchivedPoint]) -> Iterator[ArchivedPoint]:
+    """
+    Merge two streams ordered by (tourist, timestamp), dropping hot
+    rows already in the archive. Duplicates share an order key, so only
+    the current run of equal keys has to be remembered.
+    """
+    run, seen = None, set()
+    tagged = heapq.merge(
+        ((point, False) for point in archived),
+        ((point, True) for point in hot),
+        key=lambda item: _order(item[0]),
+    )
+    for point, is_hot in tagged:
+        if _order(point) != run:
+            run, seen = _order(point), set()
+        if not is_hot:
+            seen.add(_key(point))
+        elif _key(point) in seen:
+            continue
+        yield point
+
+
+def archive_day(conn: Connection, day: datetime) -> int:
+    """
+    Move one day of events into its archive file. The file is written
+    before the rows are deleted; a retry after a crash in between
+    merges and de-duplicates instead of losing or doubling rows.
+    """
+    table = LocationEvent.__table__
+    day_end = day + _DAY
+    in_day = (table.c.timestamp >= day, table.c.timestamp < day_end)
+
+    with conn.begin():
+        result = conn.execute(
+            select(table)
+            .where(*in_day)
+            .order_by(func.coalesce(table.c.tourist_id, ANONYMOUS), table.c.timestamp)
+            .execution_options(yield_per=settings.EXPORT_ROW_GROUP_SIZE)
+        )
+        points = map(_archived, result)
+        first = next(points, None)
+        if first is None:
+            return 0
+        points = chain([first], points)
+
+        path = archive_path(day)
+        with DayWriter(path, day) as writer:
+            if os.path.exists(path):
+                with ArchiveDay(path) as existing:
+                    for point in _merge(existing.iter_points(), points):
+                        writer.add(point)
+                    writer.close()
+            else:
+                for point in points:
+                    writer.add(point)
+                writer.close()
+
+        # Archived rows skip the retention rollup, so roll them up here
+        rollup(conn, PARENT, before=day_end, since=day)
+        return conn.execute(delete(table).where(*in_day)).rowcount
+
+
+def run_archive(conn: Connection, now: datetime | None = None) -> dict:
+    summary = {"days": [], "rows": 0}
+    if settings.ARCHIVE_AFTER_DAYS <= 0:
+        return summary
+
+    os.makedirs(settings.ARCHIVE_DIR, exist_ok=True)
+    cutoff = _day((now or datetime.utcnow()) - timedelta(days=settings.ARCHIVE_AFTER_DAYS))
+
+    # One archiver per archive directory
+    with open(os.path.join(settings.ARCHIVE_DIR, ".lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return summary
+
+        with conn.begin():
+            oldest = conn.execute(
+                select(func.min(LocationEvent.timestamp)).where(LocationEvent.timestamp < cutoff)
+            ).scalar()
+
+        day = _day(oldest) if oldest else cutoff
+        while day < cutoff:
+            moved = archive_day(conn, day)
+            if moved:
+                summary["days"].append(f"{day:%Y-%m-%d}")
+                summary["rows"] += moved
+            day += _DAY
+
+    return summary
+
+
+# --------------------------------
+# Trajectory (hot table + archive)
+# --------------------------------
+def get_trajectory(db: Session, tourist_id: int, start: datetime, end: datetime) -> List[ArchivedPoint]:
+    events = (
+        db.query(LocationEvent)
+        .filter(
+            LocationEvent.tourist_id == tourist_id,
+            LocationEvent.timestamp >= start,
+            LocationEvent.timestamp < end,
+        )
+        .order_by(LocationEvent.timestamp)
+        .all()
+    )
+    points = {_key(point): point for point in map(_archived, events)}
+
+    day = _day(start)
+    while day < end:
+        path = archive_path(day)
+        if os.path.exists(path):
+            with ArchiveDay(path) as archive:
+                for point in archive.trajectory(tourist_id, start, end):
+                    points.setdefault(_key(point), point)
+        day += _DAY
+
+    return sorted(points.values(), key=lambda point: point.timestamp)
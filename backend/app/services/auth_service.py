@@ -1,18 +1,19 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from datetime import datetime
 from typing import Optional
 
 from app.models.user import User
-from app.utils.helpers import hash_password, verify_password
+from app.utils.helpers import hash_password_async, verify_and_update_password_async
 
 
 # --------------------------------
 # Create User (Register)
 # --------------------------------
-def create_user(
-    db: Session,
+async def create_user(
+    db: AsyncSession,
     email: str,
     password: str,
     role: str,
@@ -34,7 +35,7 @@ def create_user(
 
         user = User(
             email=email,
-            password=hash_password(password),
+            password=await hash_password_async(password),
             role=role,
             full_name=full_name,
             phone=phone,
@@ -48,13 +49,13 @@ def create_user(
         )
 
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
 
         return user
 
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=409,
             detail="Email already registered"
@@ -64,14 +65,29 @@ def create_user(
 # --------------------------------
 # Authenticate User (Login)
 # --------------------------------
-def authenticate(db: Session, email: str, password: str):
+async def authenticate(db: AsyncSession, email: str, password: str):
 
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
 
     if not user:
         return None
 
-    if not verify_password(password, user.password):
+    # Hand the connection back to the pool while the hash runs;
+    # the loaded user stays usable (detached)
+    await db.close()
+
+    valid, new_hash = await verify_and_update_password_async(password, user.password)
+
+    if not valid:
         return None
 
+    # Stored hash used outdated rounds -> upgrade it transparently
+    if new_hash:
+        await db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(password=new_hash)
+        )
+        await db.commit()
+
     return user
@@ -0,0 +1,292 @@
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.hll import HyperLogLog
+from app.core.zone_features import zone_windows
+from app.database import engine
+from app.models.zone_density_sketch import ZoneDensitySketch
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Any constant; serializes read-merge-write of sketch rows (PostgreSQL)
+_ADVISORY_LOCK_KEY = 0x5354_5344
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_UPSERT_CHUNK = 1000
+
+
+def _bucket_start(index: int) -> datetime:
+    return datetime.fromtimestamp(index * zone_windows.bucket_seconds, timezone.utc).replace(tzinfo=None)
+
+
+def _bucket_index(bucket: datetime) -> int:
+    return int(bucket.replace(tzinfo=timezone.utc).timestamp() // zone_windows.bucket_seconds)
+
+
+def _stored(conn: Connection, zone_ids: Iterable[int] | None, first: int, last: int):
+    """
+    Stored (zone_id, bucket index, devices, tourists) for buckets
+    first..last (every zone without `zone_ids`); rows written with
+    another bucket width are skipped.
+    """
+    table = ZoneDensitySketch.__table__
+    query = select(table.c.zone_id, table.c.bucket, table.c.devices, table.c.tourists).where(
+        table.c.bucket >= _bucket_start(first),
+        table.c.bucket <= _bucket_start(last),
+        table.c.bucket_seconds == zone_windows.bucket_seconds,
+    )
+    if zone_ids is not None:
+        query = query.where(table.c.zone_id.in_(list(zone_ids)))
+    for zone_id, bucket, devices, tourists in conn.execute(query):
+        yield zone_id, _bucket_index(bucket), HyperLogLog.from_bytes(devices), HyperLogLog.from_bytes(tourists)
+
+
+# --------------------------------
+# Persistence (ring -> zone_density_sketches)
+# --------------------------------
+def persist_sketches(conn: Connection) -> int:
+    """
+    Merge every bucket changed since the last run into its stored row.
+    Merging is idempotent, so a retry after a failure never
+    double-counts. Returns the number of buckets written.
+    """
+    dirty = zone_windows.take_dirty()
+    if not dirty:
+        return 0
+
+    dialect = conn.dialect.name
+    if dialect not in _INSERTS:
+        raise RuntimeError(f"Density sketch persistence is not supported on {dialect}")
+
+    try:
+        with conn.begin():
+            if dialect == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+            merged = {(zone_id, index): (devices, tourists) for zone_id, index, devices, tourists in dirty}
+            indexes = [index for _, index in merged]
+            for zone_id, index, devices, tourists in _stored(
+                conn, {zone_id for zone_id, _ in merged}, min(indexes), max(indexes)
+            ):
+                if (zone_id, index) in merged:
+                    mine = merged[(zone_id, index)]
+                    mine[0].merge(devices)
+                    mine[1].merge(tourists)
+
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "zone_id": zone_id,
+                    "bucket": _bucket_start(index),
+                    "bucket_seconds": zone_windows.bucket_seconds,
+                    "devices": devices.to_bytes(),
+                    "tourists": tourists.to_bytes(),
+                    "updated_at": now,
+                }
+                for (zone_id, index), (devices, tourists) in merged.items()
+            ]
+            for start in range(0, len(rows), _UPSERT_CHUNK):
+                statement = _INSERTS[dialect](ZoneDensitySketch).values(rows[start:start + _UPSERT_CHUNK])
+                statement = statement.on_conflict_do_update(
+                    index_elements=[ZoneDensitySketch.zone_id, ZoneDensitySketch.bucket],
+                    set_={
+                        "bucket_seconds": statement.excluded.bucket_seconds,
+                        "devices": statement.excluded.devices,
+                        "tourists": statement.excluded.tourists,
+                        "updated_at": statement.excluded.updated_at,
+                    },
+                )
+                conn.execute(statement)
+    except Exception:
+        # Put them back so the next run retries
+        for zone_id, index, devices, tourists in dirty:
+            zone_windows.restore(zone_id, index, devices, tourists, dirty=True)
+        raise
+
+    return len(rows)
+
+
+def restore_sketches(conn: Connection) -> int:
+    """
+    Reload the buckets still inside the ring after a restart.
+    """
+    table = ZoneDensitySketch.__table__
+    indexes = zone_windows.window_indexes(settings.ZONE_FEATURE_MAX_WINDOW_MINUTES)
+
+    with conn.begin():
+        zone_ids = conn.execute(
+            select(table.c.zone_id).distinct().where(table.c.bucket >= _bucket_start(indexes.start))
+        ).scalars().all()
+        restored = 0
+        for zone_id, index, devices, tourists in _stored(conn, zone_ids, indexes.start, indexes.stop - 1):
+            zone_windows.restore(zone_id, index, devices, tourists)
+            restored += 1
+    return restored
+
+
+def prune_sketches(conn: Connection, now: datetime | None = None) -> int:
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.ZONE_SKETCH_RETENTION_DAYS)
+    with conn.begin():
+        return conn.execute(delete(ZoneDensitySketch).where(ZoneDensitySketch.bucket < cutoff)).rowcount
+
+
+# --------------------------------
+# Queries
+# --------------------------------
+# Earliest stored bucket, once one has been seen; it only moves on
+# retention pruning, days behind any window read here
+_stored_since: datetime | None = None
+
+
+def _covers(conn: Connection, first: int) -> bool:
+    """
+    Whether sketches were being collected when bucket `first` began:
+    by this worker's ring, or by any worker according to the store.
+    """
+    global _stored_since
+    start = _bucket_start(first)
+    if zone_windows.started_at <= start.replace(tzinfo=timezone.utc).timestamp():
+        return True
+    if _stored_since is None:
+        table = ZoneDensitySketch.__table__
+        _stored_since = conn.execute(
+            select(func.min(table.c.bucket)).where(table.c.bucket_seconds == zone_windows.bucket_seconds)
+        ).scalar()
+    return _stored_since is not None and _stored_since <= start
+
+
+def _merged(
+    conn: Connection,
+    zone_ids: Iterable[int] | None,
+    indexes: range,
+    stored: bool = True,
+) -> Dict[int, Tuple[HyperLogLog, HyperLogLog]]:
+    """
+    zone_id -> (devices, tourists) merged over bucket `indexes`: the
+    stored rows (all workers, up to ZONE_SKETCH_PERSIST_SECONDS old)
+    plus this worker's unsaved buckets. Merging is idempotent, so a
+    bucket present in both counts once.
+    """
+    precision = zone_windows.precision
+    sketches = {zone_id: (HyperLogLog(precision), HyperLogLog(precision)) for zone_id in zone_ids or ()}
+
+    def _merge(zone_id: int, devices: HyperLogLog, tourists: HyperLogLog):
+        mine = sketches.get(zone_id)
+        if mine is None:
+            mine = sketches[zone_id] = (HyperLogLog(precision), HyperLogLog(precision))
+        mine[0].merge(devices)
+        mine[1].merge(tourists)
+
+    if stored:
+        for zone_id, _, devices, tourists in _stored(conn, zone_ids, indexes.start, indexes.stop - 1):
+            _merge(zone_id, devices, tourists)
+    for zone_id in zone_windows.zones() if zone_ids is None else zone_ids:
+        for devices, tourists in zone_windows.sketches(zone_id, indexes).values():
+            _merge(zone_id, devices, tourists)
+    return sketches
+
+
+def zone_density(db: Session, zone_ids: List[int], window_minutes: int) -> Tuple[Dict[int, Tuple[int, int]], str]:
+    """
+    zone_id -> (estimated distinct devices, estimated distinct
+    tourists) over the window, and where it was answered from.
+
+    Windows inside the ring are answered from memory when streaming
+    is on; longer windows (or multi-worker ingestion) merge the stored
+    sketches with this worker's unsaved buckets.
+    """
+    indexes = zone_windows.window_indexes(window_minutes)
+    from_memory = settings.ZONE_FEATURES_STREAMING and zone_windows.covers(window_minutes)
+
+    sketches = _merged(db.connection(), zone_ids, indexes, stored=not from_memory)
+    density = {zone_id: (devices.count(), tourists.count()) for zone_id, (devices, tourists) in sketches.items()}
+    return density, "memory" if from_memory else "store"
+
+
+def window_uniques(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    zone_ids: Iterable[int] | None = None,
+) -> Dict[int, Tuple[int, int]] | None:
+    """
+    zone_id -> (estimated distinct devices, estimated distinct
+    tourists) over the buckets spanning [start, end), for zones with a
+    sketch there. None when no sketch reaches back to `start` (cold
+    start, or history from before sketches were kept): callers fall
+    back to exact counts.
+    """
+    width = zone_windows.bucket_seconds
+    first = _bucket_index(start)
+    last = math.ceil(end.replace(tzinfo=timezone.utc).timestamp() / width) - 1
+    conn = db.connection()
+    if not _covers(conn, first):
+        return None
+
+    sketches = _merged(conn, zone_ids, range(first, last + 1))
+    return {zone_id: (devices.count(), tourists.count()) for zone_id, (devices, tourists) in sketches.items()}
+
+
+def standard_error() -> float:
+    return HyperLogLog(zone_windows.precision).standard_error
+
+
+# --------------------------------
+# Background persistence
+# --------------------------------
+_task: asyncio.Task | None = None
+
+
+def _persist():
+    with engine.connect() as conn:
+        written = persist_sketches(conn)
+        prune_sketches(conn)
+        return written
+
+
+async def _persist_loop():
+    def _restore():
+        with engine.connect() as conn:
+            return restore_sketches(conn)
+
+    try:
+        restored = await run_in_threadpool(_restore)
+        if restored:
+            logger.info("Restored %s zone density buckets", restored)
+    except Exception:
+        logger.exception("Restoring zone density sketches failed")
+
+    while True:
+        await asyncio.sleep(settings.ZONE_SKETCH_PERSIST_SECONDS)
+        try:
+            await run_in_threadpool(_persist)
+        except Exception:
+            logger.exception("Persisting zone density sketches failed")
+
+
+def start_density_persistence():
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_persist_loop())
+
+
+async def stop_density_persistence():
+    global _task
+    if _task:
+        _task.cancel()
+        _task = None
+        # Flush what changed since the last run
+        try:
+            await run_in_threadpool(_persist)
+        except Exception:
+            logger.exception("Persisting zone density sketches failed")
@@ -0,0 +1,391 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Set, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.auth_cache import ExpiringCache
+from app.core.timer_wheel import SlidingWindowLimiter, TimerWheel
+from app.database import SessionLocal
+from app.models.escalation import Escalation
+from app.models.location_event import LocationEvent
+from app.models.user import User
+from app.services.notification_service import check_channel, dispatcher, enqueue_notifications, resolve_recipients
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+AUDIENCES = ("zone_operators", "authorities", "emergency_contact")
+
+# How far back the tourist's last zone is looked up when opening
+_ZONE_LOOKBACK = timedelta(hours=1)
+
+# Retry delay for a tier whose send failed (database down, ...)
+_RETRY_SECONDS = 5
+
+
+def parse_tiers(spec: str) -> List[Tuple[str, float]]:
+    """
+    "audience:seconds,..." -> [(audience, seconds)] ordered by delay.
+    """
+    tiers = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        audience, _, delay = part.strip().partition(":")
+        if audience not in AUDIENCES:
+            raise ValueError(f"Unknown escalation audience: {audience}")
+        tiers.append((audience, float(delay or 0)))
+    return sorted(tiers, key=lambda tier: tier[1])
+
+
+def _utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def _ts(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _in_session(fn, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class EscalationEngine:
+    """
+    Notifies widening audiences about an SOS or severe incident until
+    someone acknowledges it. Each worker keeps the pending tier of
+    every active escalation in a timer wheel, so a storm of thousands
+    of open escalations costs one bucket scan per tick rather than a
+    query or a sleeping task each.
+
+    The escalations table is the source of truth: timers are rebuilt
+    from it on start and re-synced periodically (picking up rows other
+    workers opened or acknowledged), and a tier is only sent by the
+    worker whose conditional UPDATE moves `next_tier` past it.
+    """
+
+    def __init__(self):
+        self.tiers = parse_tiers(settings.ESCALATION_TIERS)
+        self.wheel = TimerWheel(tick=1.0)
+        self.limiter = SlidingWindowLimiter(settings.ESCALATION_RATE_LIMIT, settings.ESCALATION_RATE_WINDOW_SECONDS)
+        # (channel, recipient, escalation) -> already alerted
+        self._recent = ExpiringCache(100_000)
+        self._task: asyncio.Task | None = None
+        self._pending: Set[asyncio.Task] = set()
+        self.stats = {
+            "opened": 0, "tiers_sent": 0, "acknowledged": 0, "exhausted": 0,
+            "notified": 0, "deduplicated": 0, "rate_limited": 0, "failed": 0,
+        }
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    async def start(self):
+        if self._task is not None or not settings.ESCALATION_ENABLED:
+            return
+        # Fail at startup, not with alerts silently stuck in the outbox
+        check_channel(settings.ESCALATION_CHANNEL)
+        check_channel(settings.ESCALATION_CONTACT_CHANNEL)
+
+        try:
+            await self._sync()
+        except Exception:
+            logger.exception("Loading active escalations failed")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = list(self._pending)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._pending.clear()
+
+    async def _run(self):
+        last_sync = time.time()
+        while True:
+            await asyncio.sleep(self.wheel.tick)
+            for escalation_id in self.wheel.advance(time.time()):
+                await self._fire(escalation_id)
+
+            if time.time() - last_sync >= settings.ESCALATION_SYNC_SECONDS:
+                last_sync = time.time()
+                try:
+                    await self._sync()
+                except Exception:
+                    logger.exception("Escalation sync failed")
+
+    async def _sync(self):
+        active = dict(await run_in_threadpool(_in_session, _active_timers))
+        for escalation_id in self.wheel.keys():
+            if escalation_id not in active:
+                self.wheel.cancel(escalation_id)
+        for escalation_id, next_at in active.items():
+            if escalation_id not in self.wheel:
+                self.wheel.schedule(escalation_id, next_at)
+
+    # -------------------------
+    # Open / Acknowledge
+    # -------------------------
+    def open_soon(self, *args, **kwargs):
+        """
+        `open` in the background, keeping it off the request path.
+        """
+        if not settings.ESCALATION_ENABLED or not self.tiers:
+            return
+        task = asyncio.ensure_future(self.open(*args, **kwargs))
+        self._pending.add(task)
+        task.add_done_callback(self._opened)
+
+    def _opened(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Opening escalation failed", exc_info=task.exception())
+
+    async def open(
+        self,
+        kind: str,
+        ref: str,
+        tourist_id: int | None,
+        latitude: float | None,
+        longitude: float | None,
+        summary: str,
+    ) -> int | None:
+        """
+        Start escalating; the first tier goes out right away when its
+        delay is 0. None when (kind, ref) is already escalating.
+        """
+        if not settings.ESCALATION_ENABLED or not self.tiers:
+            return None
+
+        now = time.time()
+        escalation_id = await run_in_threadpool(
+            _in_session, self._open, kind, ref, tourist_id, latitude, longitude, summary, now,
+        )
+        if escalation_id is None:
+            return None
+        self.stats["opened"] += 1
+
+        first_at = now + self.tiers[0][1]
+        if first_at <= now:
+            await self._fire(escalation_id)
+        else:
+            self.wheel.schedule(escalation_id, first_at)
+        return escalation_id
+
+    def _open(self, db: Session, kind, ref, tourist_id, latitude, longitude, summary, now) -> int | None:
+        zone_id = None
+        if tourist_id is not None:
+            zone_id = db.execute(
+                select(LocationEvent.zone_id)
+                .where(
+                    LocationEvent.tourist_id == tourist_id,
+                    LocationEvent.zone_id.is_not(None),
+                    LocationEvent.timestamp >= _utc(now) - _ZONE_LOOKBACK,
+                )
+                .order_by(LocationEvent.timestamp.desc())
+                .limit(1)
+            ).scalar()
+
+        statement = _INSERTS[db.get_bind().dialect.name](Escalation).values(
+            kind=kind,
+            ref=ref,
+            tourist_id=tourist_id,
+            zone_id=zone_id,
+            latitude=latitude,
+            longitude=longitude,
+            summary=summary,
+            status="active",
+            next_tier=0,
+            next_at=_utc(now + self.tiers[0][1]),
+            opened_at=_utc(now),
+        )
+        statement = statement.on_conflict_do_nothing(index_elements=["kind", "ref"]).returning(Escalation.id)
+        escalation_id = db.execute(statement).scalar()
+        db.commit()
+        return escalation_id
+
+    async def acknowledge(self, kind: str, ref: str) -> bool:
+        """
+        Stop escalating (kind, ref); False when it was not active.
+        """
+        if not settings.ESCALATION_ENABLED:
+            return False
+        escalation_id = await run_in_threadpool(_in_session, _acknowledge, kind, ref, time.time())
+        if escalation_id is None:
+            return False
+        self.wheel.cancel(escalation_id)
+        self.stats["acknowledged"] += 1
+        return True
+
+    # -------------------------
+    # Tiers
+    # -------------------------
+    async def _fire(self, escalation_id: int):
+        try:
+            next_at = await run_in_threadpool(_in_session, self._advance, escalation_id, time.time())
+        except Exception:
+            self.stats["failed"] += 1
+            logger.exception("Escalation %s failed; retrying", escalation_id)
+            self.wheel.schedule(escalation_id, time.time() + _RETRY_SECONDS)
+            return
+
+        if next_at is not None:
+            self.wheel.schedule(escalation_id, next_at)
+
+    def _advance(self, db: Session, escalation_id: int, now: float) -> float | None:
+        """
+        Send every tier that is due (falling through tiers that reach
+        nobody) and claim them; -> when the next tier is due, or None
+        when there is nothing left to wait for.
+        """
+        row = db.get(Escalation, escalation_id)
+        if row is None or row.status != "active":
+            return None
+        if row.next_at is not None and _ts(row.next_at) > now:
+            # Another worker already sent this tier
+            return _ts(row.next_at)
+
+        elapsed = now - _ts(row.opened_at)
+        tier = row.next_tier
+        batches = []
+        while tier < len(self.tiers):
+            audience, delay = self.tiers[tier]
+            if delay > elapsed and batches:
+                break
+            recipients = self._recipients(db, row, audience)
+            tier += 1
+            if recipients:
+                batches.append((audience, recipients))
+
+        exhausted = tier >= len(self.tiers)
+        next_at = None if exhausted else _ts(row.opened_at) + self.tiers[tier][1]
+        claimed = db.execute(
+            update(Escalation)
+            .where(
+                Escalation.id == escalation_id,
+                Escalation.status == "active",
+                Escalation.next_tier == row.next_tier,
+            )
+            .values(
+                next_tier=tier,
+                next_at=_utc(next_at) if next_at is not None else None,
+                status="exhausted" if exhausted else "active",
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+        if not claimed:
+            db.rollback()
+            return None
+
+        notified = 0
+        alerted = []
+        for _, recipients in batches:
+            items = self._throttle(recipients, row, now, alerted)
+            if items:
+                enqueue_notifications(db, items, self._message(row, elapsed), commit=False)
+                notified += len(items)
+        db.commit()
+
+        # Only once the outbox rows exist: a failed commit is retried
+        # and must find these recipients still to be alerted
+        for key in alerted:
+            self._recent.set(key, True, now + settings.ESCALATION_DEDUP_SECONDS)
+
+        if notified:
+            dispatcher.wake()
+        self.stats["tiers_sent"] += len(batches)
+        self.stats["notified"] += notified
+        if exhausted:
+            self.stats["exhausted"] += 1
+        return next_at
+
+    def _recipients(self, db: Session, row: Escalation, audience: str) -> List[Tuple[int | None, str, str]]:
+        if audience == "emergency_contact":
+            if row.tourist_id is None:
+                return []
+            contact = db.execute(select(User.emergency_contact).where(User.id == row.tourist_id)).scalar()
+            return [(None, settings.ESCALATION_CONTACT_CHANNEL, contact)] if contact else []
+
+        if audience == "zone_operators":
+            user_ids = settings.ESCALATION_ZONE_OPERATORS.get(row.zone_id, []) if row.zone_id is not None else []
+        else:
+            user_ids = db.execute(select(User.id).where(User.role == "authority")).scalars().all()
+        if not user_ids:
+            return []
+
+        channel = settings.ESCALATION_CHANNEL
+        return [(user_id, channel, recipient) for user_id, recipient in resolve_recipients(db, user_ids, channel).items()]
+
+    def _throttle(self, recipients, row: Escalation, now: float, alerted: list) -> List[Tuple[int | None, str, str]]:
+        """
+        Drop recipients this escalation already alerted (someone who is
+        both zone operator and authority hears about it once) or over
+        their rate limit, which is what keeps a burst of SOS presses or
+        incidents from flooding the same people.
+        Dedup keys of the returned items are appended to `alerted`, to
+        be recorded once the outbox rows are committed.
+        """
+        items = []
+        for user_id, channel, recipient in recipients:
+            key = f"{channel}:{recipient}:{row.kind}:{row.ref}"
+            if key in alerted or self._recent.get(key) is not None:
+                self.stats["deduplicated"] += 1
+                continue
+            if not self.limiter.allow((channel, recipient), now):
+                self.stats["rate_limited"] += 1
+                continue
+            items.append((user_id, channel, recipient))
+            alerted.append(key)
+        return items
+
+    @staticmethod
+    def _message(row: Escalation, elapsed: float) -> str:
+        message = row.summary
+        if row.latitude is not None and row.longitude is not None:
+            message += f" at {row.latitude:.5f},{row.longitude:.5f}"
+        if elapsed >= 1:
+            message += f" (unacknowledged for {int(elapsed)}s)"
+        return message
+
+    def report(self) -> dict:
+        return {"enabled": settings.ESCALATION_ENABLED, "scheduled": len(self.wheel), **self.stats}
+
+
+# --------------------------------
+# Queries
+# --------------------------------
+def _active_timers(db: Session) -> List[Tuple[int, float]]:
+    rows = db.execute(
+        select(Escalation.id, Escalation.next_at)
+        .where(Escalation.status == "active", Escalation.next_at.is_not(None))
+    ).all()
+    return [(escalation_id, _ts(next_at)) for escalation_id, next_at in rows]
+
+
+def _acknowledge(db: Session, kind: str, ref: str, now: float) -> int | None:
+    escalation_id = db.execute(
+        update(Escalation)
+        .where(Escalation.kind == kind, Escalation.ref == ref, Escalation.status == "active")
+        .values(status="acknowledged", acknowledged_at=_utc(now), next_at=None)
+        .returning(Escalation.id)
+    ).scalar()
+    db.commit()
+    return escalation_id
+
+
+escalations = EscalationEngine()
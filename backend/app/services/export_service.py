@@ -0,0 +1,165 @@
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+
+from app.config import settings
+from app.models.location_event import LocationEvent
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+_COLUMNS = (
+    "id", "tourist_id", "device_id", "zone_id", "rssi",
+    "latitude", "longitude", "source", "sos_flag", "timestamp",
+)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Columnar export needs pyarrow (pip install pyarrow)")
+
+
+def event_schema() -> "pa.Schema":
+    _require_pyarrow()
+    return pa.schema([
+        ("id", pa.int64()),
+        ("tourist_id", pa.int32()),
+        ("device_id", pa.string()),
+        ("zone_id", pa.int32()),
+        ("rssi", pa.float64()),
+        ("latitude", pa.float64()),
+        ("longitude", pa.float64()),
+        ("source", pa.string()),
+        ("sos_flag", pa.bool_()),
+        ("timestamp", pa.timestamp("us")),
+    ])
+
+
+# --------------------------------
+# Server-side Cursor -> Record Batches
+# --------------------------------
+def iter_event_batches(
+    conn: Connection,
+    start: datetime,
+    end: datetime,
+    zone_id: int | None = None,
+    source: str | None = None,
+    tourist_id: int | None = None,
+    batch_size: int | None = None,
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Events in [start, end) as Arrow record batches of at most
+    `batch_size` rows. Rows stream through a server-side cursor, so
+    only one batch is ever held in memory.
+    """
+    schema = event_schema()
+    batch_size = batch_size or settings.EXPORT_ROW_GROUP_SIZE
+    table = LocationEvent.__table__
+
+    query = (
+        select(*(table.c[name] for name in _COLUMNS))
+        .where(table.c.timestamp >= start, table.c.timestamp < end)
+    )
+    if zone_id is not None:
+        query = query.where(table.c.zone_id == zone_id)
+    if source is not None:
+        query = query.where(table.c.source == source)
+    if tourist_id is not None:
+        query = query.where(table.c.tourist_id == tourist_id)
+
+    result = conn.execute(query.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        columns = zip(*rows)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+# --------------------------------
+# Writers (one row group / IPC batch per record batch)
+# --------------------------------
+class _ChunkSink:
+    """
+    Write-only file object that hands back whatever was written since
+    the last take(), so a writer's output can be streamed as it grows.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _open_writer(fmt: str, sink, schema):
+    if fmt == "parquet":
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    if fmt == "arrow":
+        return pa.ipc.new_stream(sink, schema)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def stream_export(conn: Connection, fmt: str, start: datetime, end: datetime, **filters) -> Iterator[bytes]:
+    """
+    Encoded file bytes, yielded once per row group.
+    """
+    schema = event_schema()
+    sink = _ChunkSink()
+    writer = _open_writer(fmt, sink, schema)
+
+    for batch in iter_event_batches(conn, start, end, **filters):
+        writer.write_batch(batch)
+        chunk = sink.take()
+        if chunk:
+            yield chunk
+
+    writer.close()
+    yield sink.take()
+
+
+def export_to_file(conn: Connection, path: str, fmt: str, start: datetime, end: datetime, **filters) -> int:
+    """
+    Write the export to `path`, returning the number of rows.
+    """
+    schema = event_schema()
+    rows = 0
+
+    with open(path, "wb") as sink:
+        writer = _open_writer(fmt, sink, schema)
+        for batch in iter_event_batches(conn, start, end, **filters):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+        writer.close()
+
+    return rows
@@ -1,9 +1,156 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
 
+from app.config import settings
+from app.core.feature_vector import COUNT_FEATURES, FEATURES, TOURIST_FEATURES, feature_vector
+from app.core.zone_features import zone_windows
 from app.models.location_event import LocationEvent
+from app.models.zone_status import ZoneStatus
+from app.services.density_service import window_uniques
+
+
+@dataclass
+class ZoneFeatureMatrix:
+    """
+    Dense zones x FEATURES matrix; row i belongs to zone_ids[i].
+    """
+    zone_ids: List[int]
+    rows: List[List[float]]
+    window_minutes: int
+    features: tuple = FEATURES
+
+    def to_numpy(self):
+        import numpy as np
+
+        return np.array(self.rows, dtype=np.float64).reshape(len(self.zone_ids), len(self.features))
+
+    def row(self, zone_id: int) -> dict:
+        """
+        One zone's features by name, counts as ints (API responses;
+        the model reads `rows`).
+        """
+        values = self.rows[self.zone_ids.index(zone_id)]
+        return {
+            name: int(value) if name in COUNT_FEATURES else value
+            for name, value in zip(self.features, values)
+        }
+
+
+# --------------------------------
+# Batch: all (or selected) zones
+# --------------------------------
+def compute_zone_feature_matrix(
+    db: Session,
+    window_minutes: int = 10,
+    zone_ids: Iterable[int] | None = None,
+) -> ZoneFeatureMatrix:
+    """
+    Feature vectors for many zones at once, from zone_window_totals
+    (the same aggregate the feature store materializes).
+    Without `zone_ids`, covers every zone with a status row or with
+    events in the window. Zones without events get zero rows.
+    Read-only: callers should pass a ReadSessionLocal() session.
+    """
+
+    since = datetime.utcnow() - timedelta(minutes=window_minutes)
+    wanted = set(zone_ids) if zone_ids is not None else set()
+    totals = zone_window_totals(db, since, zone_ids=list(wanted) if zone_ids is not None else None)
+
+    if zone_ids is None:
+        wanted |= set(totals)
+        wanted |= {zone_id for (zone_id,) in db.query(ZoneStatus.zone_id).all()}
+
+    empty = (0, 0.0, 0.0, 0, 0, 0, 0)
+    ordered = sorted(wanted)
+    return ZoneFeatureMatrix(
+        zone_ids=ordered,
+        rows=[feature_vector(totals.get(zone_id, empty)) for zone_id in ordered],
+        window_minutes=window_minutes,
+    )
+
+
+def zone_window_totals(
+    db: Session,
+    start: datetime,
+    end: datetime | None = None,
+    zone_ids: List[int] | None = None,
+) -> Dict[int, tuple]:
+    """
+    zone_id -> totals (see feature_vector) over events in [start, end)
+    (no upper bound without `end`), for zones with at least one event.
+    Live scoring and the stored zone_activity rows both come from here.
 
+    Unique devices / tourists are merged from the stored HyperLogLog
+    density sketches, as on /zones/{id}/stats, instead of a
+    COUNT(DISTINCT) over location_events; the exact counts are only
+    the fallback when no sketch reaches back to `start`. The other
+    totals are exact: from SQL, or for a live window with
+    ZONE_FEATURES_STREAMING from the sliding window.
+    """
+    counts = None
+    if end is None and settings.ZONE_FEATURES_STREAMING:
+        counts = _streamed_counts(start, zone_ids)
+    if counts is None:
+        counts = _event_counts(db, start, end, zone_ids)
+
+    uniques = window_uniques(db, start, end or datetime.utcnow(), zone_ids)
+    if uniques is None:
+        uniques = _exact_uniques(db, start, end, zone_ids)
+
+    return {zone_id: (*totals, *uniques.get(zone_id, (0, 0))) for zone_id, totals in counts.items()}
+
+
+def _window_query(db: Session, columns: list, start: datetime, end: datetime | None, zone_ids: List[int] | None):
+    query = (
+        db.query(LocationEvent.zone_id, *columns)
+        .filter(
+            LocationEvent.zone_id.isnot(None),
+            LocationEvent.timestamp >= start,
+        )
+        .group_by(LocationEvent.zone_id)
+    )
+    if end is not None:
+        query = query.filter(LocationEvent.timestamp < end)
+    if zone_ids is not None:
+        query = query.filter(LocationEvent.zone_id.in_(zone_ids))
+    return query
+
+
+def _event_counts(db: Session, start: datetime, end: datetime | None, zone_ids: List[int] | None) -> Dict[int, tuple]:
+    query = _window_query(db, [
+        func.count(LocationEvent.id),
+        func.coalesce(func.sum(LocationEvent.rssi), 0.0),
+        func.coalesce(func.sum(LocationEvent.rssi * LocationEvent.rssi), 0.0),
+        func.count(LocationEvent.rssi),
+        func.sum(case((LocationEvent.sos_flag, 1), else_=0)),
+    ], start, end, zone_ids)
+    return {zone_id: tuple(counts) for zone_id, *counts in query.all()}
+
+
+def _streamed_counts(start: datetime, zone_ids: List[int] | None) -> Dict[int, tuple] | None:
+    # None when the sliding window does not cover [start, now)
+    window_minutes = max(1, round((datetime.utcnow() - start).total_seconds() / 60))
+    if not zone_windows.covers(window_minutes):
+        return None
+    totals = zone_windows.totals(zone_ids if zone_ids is not None else zone_windows.zones(), window_minutes)
+    return {zone_id: zone_totals[:5] for zone_id, zone_totals in totals.items() if zone_totals[0]}
 
+
+def _exact_uniques(db: Session, start: datetime, end: datetime | None, zone_ids: List[int] | None) -> Dict[int, tuple]:
+    query = _window_query(db, [
+        func.count(func.distinct(LocationEvent.device_id)),
+        func.count(func.distinct(LocationEvent.tourist_id)),
+    ], start, end, zone_ids)
+    return {zone_id: (devices, tourists) for zone_id, devices, tourists in query.all()}
+
+
+# --------------------------------
+# Single zone
+# --------------------------------
 def aggregate_zone_features(
     db: Session,
     zone_id: int,
@@ -11,21 +158,57 @@ def aggregate_zone_features(
 ) -> dict:
     """
     Aggregate raw location events into ML-ready features.
+    Served from the in-memory sliding window when it covers the
+    window, otherwise from SQL (cold start, long windows).
+    Read-only: callers should pass a ReadSessionLocal() session.
     """
 
-    result = (
+    matrix = compute_zone_feature_matrix(db, window_minutes, zone_ids=[zone_id])
+    return {"zone_id": zone_id, **matrix.row(zone_id)}
+
+
+# --------------------------------
+# Tourists (feature store)
+# --------------------------------
+def tourist_window_features(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    tourist_ids: List[int] | None = None,
+) -> Dict[int, List[float]]:
+    """
+    tourist_id -> values in TOURIST_FEATURES order over events in
+    [start, end), for tourists with at least one event.
+    """
+    query = (
         db.query(
-            func.count(LocationEvent.id).label("event_count"),
-            func.avg(LocationEvent.rssi).label("avg_rssi"),
+            LocationEvent.tourist_id,
+            func.count(LocationEvent.id),
+            func.count(func.distinct(LocationEvent.zone_id)),
+            func.sum(case((LocationEvent.sos_flag, 1), else_=0)),
+            func.avg(LocationEvent.rssi),
+            func.max(LocationEvent.timestamp),
         )
-        .filter(LocationEvent.zone_id == zone_id)
-        .all()
+        .filter(
+            LocationEvent.tourist_id.isnot(None),
+            LocationEvent.timestamp >= start,
+            LocationEvent.timestamp < end,
+        )
+        .group_by(LocationEvent.tourist_id)
     )
+    if tourist_ids is not None:
+        query = query.filter(LocationEvent.tourist_id.in_(tourist_ids))
 
-    event_count, avg_rssi = result[0]
-
-    return {
-        "zone_id": zone_id,
-        "event_count": event_count or 0,
-        "avg_rssi": avg_rssi or 0.0,
-    }
+    features = {}
+    for tourist_id, count, zones, sos, avg_rssi, last_seen in query.all():
+        if isinstance(last_seen, str):
+            # SQLite returns max() over a DateTime column as text
+            last_seen = datetime.fromisoformat(last_seen)
+        features[tourist_id] = [
+            float(count),
+            float(zones),
+            float(sos or 0),
+            float(avg_rssi) if avg_rssi is not None else 0.0,
+            (end - last_seen).total_seconds(),
+        ]
+    return features
@@ -0,0 +1,314 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.feature_row import FeatureRow
+from app.models.feature_watermark import FeatureWatermark
+from app.core.feature_vector import FEATURES, TOURIST_FEATURES, feature_vector
+from app.services.feature_service import tourist_window_features, zone_window_totals
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+@dataclass(frozen=True)
+class FeatureSet:
+    """
+    A versioned feature definition. Every `interval_minutes` tick T
+    gets one row per active entity, computed over [T - window, T).
+    An entity without a row at a materialized tick had no activity in
+    that window and reads as `empty`.
+
+    Change a definition by adding a new version, never in place:
+    stored rows are only meaningful with the code that wrote them.
+    """
+    name: str
+    entity: str
+    features: tuple
+    window_minutes: int
+    interval_minutes: int
+    compute: Callable[[Session, datetime, datetime], Dict[int, List[float]]]
+    empty: tuple
+
+    @property
+    def window(self) -> timedelta:
+        return timedelta(minutes=self.window_minutes)
+
+    @property
+    def interval(self) -> timedelta:
+        return timedelta(minutes=self.interval_minutes)
+
+    def tick(self, ts: datetime) -> datetime:
+        """
+        Latest tick at or before `ts`.
+        """
+        seconds = self.interval_minutes * 60
+        epoch = int(ts.replace(tzinfo=timezone.utc).timestamp())
+        return datetime.fromtimestamp(epoch - epoch % seconds, timezone.utc).replace(tzinfo=None)
+
+
+def _zone_activity(db: Session, start: datetime, end: datetime) -> Dict[int, List[float]]:
+    return {zone_id: feature_vector(totals) for zone_id, totals in zone_window_totals(db, start, end).items()}
+
+
+FEATURE_SETS: Dict[str, FeatureSet] = {
+    feature_set.name: feature_set
+    for feature_set in (
+        # Same vector, window and aggregate (zone_window_totals) the
+        # risk model is scored on, unique_* from the density sketches.
+        # v1 stored exact COUNT(DISTINCT) uniques, which scoring no
+        # longer computes
+        FeatureSet(
+            name="zone_activity_v2",
+            entity="zone",
+            features=FEATURES,
+            window_minutes=10,
+            interval_minutes=5,
+            compute=_zone_activity,
+            empty=(0.0,) * len(FEATURES),
+        ),
+        FeatureSet(
+            name="tourist_activity_v1",
+            entity="tourist",
+            features=TOURIST_FEATURES,
+            window_minutes=60,
+            interval_minutes=5,
+            compute=tourist_window_features,
+            # Not seen in the window: treat as seen at its start
+            empty=(0.0, 0.0, 0.0, 0.0, 3600.0),
+        ),
+    )
+}
+
+
+def get_feature_set(name: str) -> FeatureSet:
+    try:
+        return FEATURE_SETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown feature set: {name}") from None
+
+
+# --------------------------------
+# Materialization (append-only)
+# --------------------------------
+def materialized_range(db: Session, feature_set: FeatureSet) -> Tuple[datetime | None, datetime | None]:
+    """
+    (first, last) tick stored; (None, None) before the first run.
+    """
+    row = db.execute(
+        select(FeatureWatermark.first_as_of, FeatureWatermark.as_of)
+        .where(FeatureWatermark.feature_set == feature_set.name)
+    ).first()
+    return tuple(row) if row else (None, None)
+
+
+def watermark(db: Session, feature_set: FeatureSet) -> datetime | None:
+    return materialized_range(db, feature_set)[1]
+
+
+def materialize(db: Session, feature_set: FeatureSet, now: datetime | None = None, max_ticks: int = 288) -> int:
+    """
+    Append rows for every tick after the watermark up to `now` minus
+    FEATURE_STORE_LATENESS_SECONDS (first run: FEATURE_STORE_BACKFILL_HOURS
+    back), one transaction per tick. Stored ticks are never revisited,
+    so events timestamped before a tick but arriving after it was
+    written are missing from it; the lateness margin bounds that.
+    The watermark row is locked for the tick, so concurrent workers
+    never write the same tick twice. Returns the number of rows.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in _INSERTS:
+        raise RuntimeError(f"Feature store is not supported on {dialect}")
+
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=settings.FEATURE_STORE_LATENESS_SECONDS)
+    last_tick = feature_set.tick(cutoff)
+    written = 0
+
+    db.execute(
+        _INSERTS[dialect](FeatureWatermark)
+        .values(feature_set=feature_set.name, as_of=None)
+        .on_conflict_do_nothing(index_elements=[FeatureWatermark.feature_set])
+    )
+    db.commit()
+
+    for _ in range(max_ticks):
+        current = db.execute(
+            select(FeatureWatermark)
+            .where(FeatureWatermark.feature_set == feature_set.name)
+            .with_for_update()
+        ).scalar_one()
+
+        if current.as_of is None:
+            tick = feature_set.tick(last_tick - timedelta(hours=settings.FEATURE_STORE_BACKFILL_HOURS))
+            current.first_as_of = tick
+        else:
+            tick = current.as_of + feature_set.interval
+        if tick > last_tick:
+            db.rollback()
+            break
+
+        rows = feature_set.compute(db, tick - feature_set.window, tick)
+        if rows:
+            db.execute(insert(FeatureRow), [
+                {"feature_set": feature_set.name, "entity_id": entity_id, "as_of": tick, "values": values}
+                for entity_id, values in rows.items()
+            ])
+        current.as_of = tick
+        db.commit()
+        written += len(rows)
+
+    return written
+
+
+def prune(db: Session, feature_set: FeatureSet, now: datetime | None = None) -> int:
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.FEATURE_STORE_RETENTION_DAYS)
+    deleted = db.execute(
+        delete(FeatureRow).where(FeatureRow.feature_set == feature_set.name, FeatureRow.as_of < cutoff)
+    ).rowcount
+    db.execute(
+        update(FeatureWatermark)
+        .where(FeatureWatermark.feature_set == feature_set.name, FeatureWatermark.first_as_of < cutoff)
+        .values(first_as_of=feature_set.tick(cutoff) + feature_set.interval)
+    )
+    db.commit()
+    return deleted
+
+
+# --------------------------------
+# Reads (online: latest, offline: point-in-time)
+# --------------------------------
+def latest(
+    db: Session,
+    feature_set: FeatureSet,
+    entity_ids: Iterable[int] | None = None,
+) -> Tuple[datetime | None, Dict[int, List[float]]]:
+    """
+    The last materialized tick and its rows; one index range scan.
+    Requested entities without a row get `empty`.
+    """
+    as_of = watermark(db, feature_set)
+    if as_of is None:
+        return None, {}
+
+    query = select(FeatureRow.entity_id, FeatureRow.values).where(
+        FeatureRow.feature_set == feature_set.name,
+        FeatureRow.as_of == as_of,
+    )
+    if entity_ids is not None:
+        entity_ids = list(entity_ids)
+        query = query.where(FeatureRow.entity_id.in_(entity_ids))
+
+    rows = dict(db.execute(query).all())
+    if entity_ids is not None:
+        rows = {entity_id: rows.get(entity_id, list(feature_set.empty)) for entity_id in entity_ids}
+    return as_of, rows
+
+
+def point_in_time(
+    db: Session,
+    feature_set: FeatureSet,
+    lookups: Sequence[Tuple[int, datetime]],
+) -> List[List[float] | None]:
+    """
+    Values each (entity_id, ts) would have been served at `ts`: the
+    row of the latest tick at or before `ts`, whose window ends before
+    `ts`, so nothing from after `ts` leaks into a training example.
+    None where that tick is outside the materialized range.
+    """
+    if not lookups:
+        return []
+
+    first, last = materialized_range(db, feature_set)
+    ticks = [feature_set.tick(ts) for _, ts in lookups]
+    entity_ids = {entity_id for entity_id, _ in lookups}
+
+    stored = {}
+    # Chunked only to stay under driver bind-parameter limits
+    ordered = sorted(entity_ids)
+    for start in range(0, len(ordered), 1000):
+        rows = db.execute(
+            select(FeatureRow.entity_id, FeatureRow.as_of, FeatureRow.values).where(
+                FeatureRow.feature_set == feature_set.name,
+                FeatureRow.entity_id.in_(ordered[start:start + 1000]),
+                FeatureRow.as_of >= min(ticks),
+                FeatureRow.as_of <= max(ticks),
+            )
+        )
+        stored.update({(entity_id, as_of): values for entity_id, as_of, values in rows})
+
+    values = []
+    for (entity_id, _), tick in zip(lookups, ticks):
+        if last is None or not first <= tick <= last:
+            values.append(None)
+        else:
+            values.append(stored.get((entity_id, tick), list(feature_set.empty)))
+    return values
+
+
+def rows_between(db: Session, feature_set: FeatureSet, start: datetime, end: datetime):
+    """
+    (entity_id, as_of, values) for ticks in [start, end), in tick
+    order; for building training sets.
+    """
+    return db.execute(
+        select(FeatureRow.entity_id, FeatureRow.as_of, FeatureRow.values)
+        .where(
+            FeatureRow.feature_set == feature_set.name,
+            FeatureRow.as_of >= start,
+            FeatureRow.as_of < end,
+        )
+        .order_by(FeatureRow.as_of)
+        .execution_options(yield_per=10000)
+    )
+
+
+# --------------------------------
+# Background materialization
+# --------------------------------
+_task: asyncio.Task | None = None
+
+
+def run_materialization() -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        written = {}
+        for name, feature_set in FEATURE_SETS.items():
+            written[name] = materialize(db, feature_set)
+            prune(db, feature_set)
+        return written
+    finally:
+        db.close()
+
+
+async def _materialize_loop():
+    while True:
+        try:
+            written = await run_in_threadpool(run_materialization)
+            if any(written.values()):
+                logger.info("Materialized feature rows: %s", written)
+        except Exception:
+            logger.exception("Feature store materialization failed")
+        await asyncio.sleep(settings.FEATURE_STORE_POLL_SECONDS)
+
+
+def start_feature_store():
+    global _task
+    if _task is None and settings.FEATURE_STORE_ENABLED:
+        _task = asyncio.create_task(_materialize_loop())
+
+
+async def stop_feature_store():
+    global _task
+    if _task:
+        _task.cancel()
+        _task = None
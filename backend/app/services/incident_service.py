@@ -1,26 +1,33 @@
 # app/services/incident_service.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from typing import List
 from datetime import datetime
 
+from app.config import settings
 from app.models.incident import Incident
 from app.core.websocket_manager import manager
+from app.services.escalation_service import escalations
 
 
 VALID_STATUSES = {"open", "in_progress", "resolved"}
 
+# Severities escalated until an authority picks the incident up
+ESCALATED_SEVERITIES = {s.strip() for s in settings.ESCALATION_INCIDENT_SEVERITIES.split(",") if s.strip()}
+
 
 # --------------------------------
 # Create Incident (Tourist)
 # --------------------------------
 async def create_incident(
-    db: Session,
+    db: AsyncSession,
     tourist_id: int,
     description: str,
     latitude: float,
     longitude: float,
+    severity: str = "medium",
 ) -> Incident:
 
     incident = Incident(
@@ -28,19 +35,30 @@ async def create_incident(
         latitude=latitude,
         longitude=longitude,
         tourist_id=tourist_id,
+        severity=severity,
         status="open",
         created_at=datetime.utcnow(),
     )
 
     db.add(incident)
-    db.commit()
-    db.refresh(incident)
+    await db.commit()
+    await db.refresh(incident)
 
     # 🔴 REAL-TIME BROADCAST
-    await manager.broadcast({
-        "type": "incident_created",
-        "data": serialize_incident(incident)
-    })
+    await manager.broadcast(
+        {
+            "type": "incident_created",
+            "data": serialize_incident(incident)
+        },
+        tourist_id=incident.tourist_id,
+        location=(incident.latitude, incident.longitude),
+    )
+
+    if incident.severity in ESCALATED_SEVERITIES:
+        escalations.open_soon(
+            "incident", str(incident.id), incident.tourist_id, incident.latitude, incident.longitude,
+            f"{incident.severity.capitalize()} incident #{incident.id}: {incident.description}",
+        )
 
     return incident
 
@@ -48,24 +66,20 @@ async def create_incident(
 # --------------------------------
 # Authority: Get All Incidents
 # --------------------------------
-def get_all_incidents(db: Session) -> List[Incident]:
-    return (
-        db.query(Incident)
+async def get_all_incidents(db: AsyncSession) -> List[Incident]:
+    result = await db.execute(
+        select(Incident)
         .order_by(Incident.created_at.desc())
-        .all()
     )
+    return list(result.scalars())
 
 
 # --------------------------------
 # Authority: Get Incident By ID
 # --------------------------------
-def get_incident_by_id(db: Session, incident_id: int) -> Incident:
+async def get_incident_by_id(db: AsyncSession, incident_id: int) -> Incident:
 
-    incident = (
-        db.query(Incident)
-        .filter(Incident.id == incident_id)
-        .first()
-    )
+    incident = await db.get(Incident, incident_id)
 
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
@@ -77,7 +91,7 @@ def get_incident_by_id(db: Session, incident_id: int) -> Incident:
 # Authority: Update Status
 # --------------------------------
 async def update_incident_status(
-    db: Session,
+    db: AsyncSession,
     incident_id: int,
     status: str,
 ) -> Incident:
@@ -88,19 +102,27 @@ async def update_incident_status(
             detail=f"Invalid status. Allowed: {VALID_STATUSES}",
         )
 
-    incident = get_incident_by_id(db, incident_id)
+    incident = await get_incident_by_id(db, incident_id)
 
     incident.status = status
     incident.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(incident)
+    await db.commit()
+    await db.refresh(incident)
 
     # 🔴 REAL-TIME BROADCAST
-    await manager.broadcast({
-        "type": "incident_updated",
-        "data": serialize_incident(incident)
-    })
+    await manager.broadcast(
+        {
+            "type": "incident_updated",
+            "data": serialize_incident(incident)
+        },
+        tourist_id=incident.tourist_id,
+        location=(incident.latitude, incident.longitude),
+    )
+
+    # Picked up (or closed): stop escalating
+    if incident.status != "open":
+        await escalations.acknowledge("incident", str(incident.id))
 
     return incident
 
@@ -108,17 +130,17 @@ async def update_incident_status(
 # --------------------------------
 # Tourist: Get My Incidents
 # --------------------------------
-def get_incidents_by_tourist(
-    db: Session,
+async def get_incidents_by_tourist(
+    db: AsyncSession,
     tourist_id: int,
 ) -> List[Incident]:
 
-    return (
-        db.query(Incident)
-        .filter(Incident.tourist_id == tourist_id)
+    result = await db.execute(
+        select(Incident)
+        .where(Incident.tourist_id == tourist_id)
         .order_by(Incident.created_at.desc())
-        .all()
     )
+    return list(result.scalars())
 
 
 # --------------------------------
@@ -131,6 +153,7 @@ def serialize_incident(incident: Incident) -> dict:
         "latitude": incident.latitude,
         "longitude": incident.longitude,
         "tourist_id": incident.tourist_id,
+        "severity": incident.severity,
         "status": incident.status,
         "created_at": incident.created_at.isoformat() if incident.created_at else None,
         "updated_at": incident.updated_at.isoformat() if getattr(incident, "updated_at", None) else None,
@@ -1,3 +1,424 @@
-def send_notification(user_id: int, message: str):
-    # Placeholder for Firebase / SMS / Email
-    print(f"[NOTIFY] User {user_id}: {message}")
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import and_, bindparam, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.notification_providers import NotificationProvider, OutgoingNotification, create_provider
+from app.core.stage_latency import StageLatency
+from app.database import SessionLocal
+from app.models.notification import Notification
+from app.models.user import User
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Channel -> User attribute holding its recipient; others use the user id
+_RECIPIENT_FIELDS = {"sms": "phone", "email": "email"}
+
+
+# --------------------------------
+# Enqueue (request handlers)
+# --------------------------------
+def configured_channels() -> List[str]:
+    return [name.strip() for name in settings.NOTIFY_PROVIDERS.split(",") if name.strip()]
+
+
+def check_channel(channel: str):
+    """
+    ValueError unless a provider sends `channel`; rows for any other
+    channel would never be claimed and stay pending forever.
+    """
+    known = list(dispatcher.providers) or configured_channels()
+    if channel not in known:
+        raise ValueError(f"Unknown notification channel {channel!r}; configured: {', '.join(known)}")
+
+
+def resolve_recipients(db: Session, user_ids: Iterable[int], channel: str) -> Dict[int, str]:
+    """
+    user_id -> recipient on the channel; users without one are left out.
+    """
+    user_ids = list(user_ids)
+    field = _RECIPIENT_FIELDS.get(channel)
+    if field is None:
+        return {user_id: str(user_id) for user_id in user_ids}
+    rows = db.query(User.id, getattr(User, field)).filter(User.id.in_(user_ids)).all()
+    return {user_id: recipient for user_id, recipient in rows if recipient}
+
+
+def enqueue_notifications(
+    db: Session,
+    items: Iterable[Tuple[int | None, str, str]],
+    message: str,
+    commit: bool = True,
+) -> List[Notification]:
+    """
+    One outbox row per (user_id, channel, recipient). With
+    commit=False the rows join the caller's transaction (call
+    `dispatcher.wake()` after committing). Raises ValueError for a
+    channel no provider sends.
+    """
+    items = list(items)
+    for channel in {channel for _, channel, _ in items}:
+        check_channel(channel)
+
+    now = datetime.utcnow()
+    rows = [
+        Notification(
+            user_id=user_id,
+            channel=channel,
+            recipient=recipient,
+            message=message,
+            status="pending",
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        )
+        for user_id, channel, recipient in items
+    ]
+    db.add_all(rows)
+    if commit:
+        db.commit()
+        dispatcher.wake()
+    return rows
+
+
+def send_notifications(
+    db: Session,
+    user_ids: Iterable[int],
+    message: str,
+    channel: str | None = None,
+) -> List[Notification]:
+    """
+    Write one outbox row per user and return; the dispatcher sends
+    them. Raises ValueError for users without a recipient on the
+    channel.
+    """
+    channel = channel or settings.NOTIFY_DEFAULT_CHANNEL
+    check_channel(channel)
+    user_ids = list(dict.fromkeys(user_ids))
+
+    recipients = resolve_recipients(db, user_ids, channel)
+    missing = [user_id for user_id in user_ids if user_id not in recipients]
+    if missing:
+        raise ValueError(f"No {channel} recipient for users {missing}")
+
+    return enqueue_notifications(db, [(user_id, channel, recipients[user_id]) for user_id in user_ids], message)
+
+
+def send_notification(db: Session, user_id: int, message: str, channel: str | None = None) -> Notification:
+    return send_notifications(db, [user_id], message, channel)[0]
+
+
+# --------------------------------
+# Outbox Claims (any number of workers)
+# --------------------------------
+def retry_delay(attempts: int) -> float:
+    # Exponential backoff with jitter, so a provider outage does not
+    # come back as one synchronized burst
+    delay = min(settings.NOTIFY_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.NOTIFY_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim_due(db: Session, channels: List[str], limit: int, token: str) -> list:
+    """
+    Lease up to `limit` due rows to `token` in one UPDATE and return
+    them. Rows locked by another worker's claim are skipped
+    (PostgreSQL), so concurrent dispatchers never share a row.
+    """
+    now = datetime.utcnow()
+    due = (
+        select(Notification.id)
+        .where(
+            Notification.channel.in_(channels),
+            or_(
+                and_(Notification.status == "pending", Notification.next_attempt_at <= now),
+                and_(Notification.status == "sending", Notification.lease_until < now),
+            ),
+        )
+        .order_by(Notification.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(Notification)
+        .where(Notification.id.in_(due))
+        .values(
+            status="sending",
+            claim_token=token,
+            lease_until=now + timedelta(seconds=settings.NOTIFY_LEASE_SECONDS),
+            attempts=Notification.attempts + 1,
+        )
+        .returning(
+            Notification.id, Notification.channel, Notification.recipient,
+            Notification.message, Notification.attempts, Notification.created_at,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return rows
+
+
+def complete(db: Session, token: str, results: List[tuple]):
+    """
+    Record (id, attempts, error) outcomes of a claim. Failed rows are
+    rescheduled with backoff, or marked failed after
+    NOTIFY_MAX_ATTEMPTS. Rows whose lease was taken over are left
+    alone.
+    """
+    now = datetime.utcnow()
+    table = Notification.__table__
+    params = []
+    for notification_id, attempts, error in results:
+        if error is None:
+            status, next_attempt = "sent", now
+        elif attempts >= settings.NOTIFY_MAX_ATTEMPTS:
+            status, next_attempt = "failed", now
+        else:
+            status, next_attempt = "pending", now + timedelta(seconds=retry_delay(attempts))
+        params.append({
+            "b_id": notification_id,
+            "b_status": status,
+            "b_next": next_attempt,
+            "b_error": error,
+            "b_sent": now if error is None else None,
+        })
+
+    db.execute(
+        table.update()
+        .where(table.c.id == bindparam("b_id"), table.c.claim_token == token)
+        .values(
+            status=bindparam("b_status"),
+            next_attempt_at=bindparam("b_next"),
+            last_error=bindparam("b_error"),
+            sent_at=bindparam("b_sent"),
+            claim_token=None,
+            lease_until=None,
+        ),
+        params,
+    )
+    db.commit()
+
+
+def release(db: Session, token: str, ids: List[int]):
+    """
+    Hand claimed but unsent rows back (shutdown), without counting
+    the attempt.
+    """
+    db.execute(
+        update(Notification)
+        .where(Notification.id.in_(ids), Notification.claim_token == token)
+        .values(status="pending", claim_token=None, lease_until=None, attempts=Notification.attempts - 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def prune(db: Session) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=settings.NOTIFY_RETENTION_DAYS)
+    deleted = db.execute(
+        delete(Notification).where(Notification.status.in_(("sent", "failed")), Notification.created_at < cutoff)
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def outbox_depth(db: Session) -> Dict[str, int]:
+    return dict(db.query(Notification.status, func.count()).group_by(Notification.status).all())
+
+
+def _in_session(fn, *args):
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+# --------------------------------
+# Dispatcher
+# --------------------------------
+class NotificationDispatcher:
+    """
+    One poller claims due outbox rows and splits them into provider
+    batches; NOTIFY_WORKERS tasks send the batches concurrently and
+    record the outcome. Provider calls are awaited with a timeout, so
+    a slow provider only ever holds a worker task, never a request.
+
+    The queue between them holds at most one batch per worker, so
+    rows are only claimed (leased) shortly before they are sent.
+    """
+
+    def __init__(self):
+        self.providers: Dict[str, NotificationProvider] = {}
+        self._queue: asyncio.Queue | None = None
+        self._wake: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: List[asyncio.Task] = []
+        self._token = uuid.uuid4().hex
+        self._in_flight = 0
+
+        # Seconds per provider call / from enqueue to delivery
+        self.latency = StageLatency(("provider_call", "delivery"))
+        self.stats = {"claimed": 0, "batches": 0, "sent": 0, "failed_attempts": 0, "gave_up": 0}
+        self.by_channel: Dict[str, Dict[str, int]] = {}
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self, providers: Dict[str, NotificationProvider] | None = None):
+        if self._tasks or not settings.NOTIFY_ENABLED:
+            return
+
+        if providers is None:
+            providers = {name: create_provider(name) for name in configured_channels()}
+        self.providers = providers
+        self.by_channel = {name: {"sent": 0, "failed": 0} for name in providers}
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=settings.NOTIFY_WORKERS)
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._poll())] + [
+            asyncio.create_task(self._work()) for _ in range(settings.NOTIFY_WORKERS)
+        ]
+
+    async def stop(self):
+        if not self._tasks:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        # Batches still queued go back to the outbox for the next worker
+        queued = []
+        while not self._queue.empty():
+            _, batch = self._queue.get_nowait()
+            queued.extend(row.id for row in batch)
+        if queued:
+            try:
+                await run_in_threadpool(_in_session, release, self._token, queued)
+            except Exception:
+                logger.exception("Releasing queued notifications failed")
+
+        for provider in self.providers.values():
+            await provider.close()
+
+    def wake(self):
+        """
+        Poll now instead of at the next interval; callable from
+        request threads.
+        """
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    # -------------------------
+    # Poller
+    # -------------------------
+    async def _poll(self):
+        last_prune = 0.0
+        while True:
+            more = False
+            try:
+                for channel, provider in self.providers.items():
+                    # No more than the workers can take before the lease
+                    # runs out; claiming ahead would only risk resends
+                    size = max(1, provider.max_batch)
+                    limit = min(settings.NOTIFY_CLAIM_BATCH, settings.NOTIFY_WORKERS * size)
+                    claimed = await run_in_threadpool(_in_session, claim_due, [channel], limit, self._token)
+                    self.stats["claimed"] += len(claimed)
+                    more = more or len(claimed) == limit
+
+                    for start in range(0, len(claimed), size):
+                        await self._queue.put((channel, claimed[start:start + size]))
+
+                if time.time() - last_prune >= 3600:
+                    last_prune = time.time()
+                    await run_in_threadpool(_in_session, prune)
+            except Exception:
+                logger.exception("Notification poll failed")
+
+            # A full claim means more is due: go again right away
+            if not more:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), settings.NOTIFY_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    # -------------------------
+    # Workers
+    # -------------------------
+    async def _work(self):
+        while True:
+            channel, batch = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._send(channel, batch)
+            except Exception:
+                # Leases expire, so the rows are retried regardless
+                logger.exception("Sending %s notification batch failed", channel)
+            finally:
+                self._in_flight -= 1
+
+    async def _send(self, channel: str, batch: list):
+        provider = self.providers[channel]
+        outgoing = [OutgoingNotification(row.id, row.recipient, row.message) for row in batch]
+
+        started = time.perf_counter()
+        try:
+            errors = await asyncio.wait_for(provider.send(outgoing), settings.NOTIFY_SEND_TIMEOUT_SECONDS)
+            if len(errors) != len(batch):
+                raise RuntimeError(f"{channel} returned {len(errors)} results for {len(batch)} notifications")
+        except Exception as exc:
+            error = "timed out" if isinstance(exc, asyncio.TimeoutError) else f"{type(exc).__name__}: {exc}"
+            errors = [error] * len(batch)
+        self.latency.record("provider_call", time.perf_counter() - started)
+        self.stats["batches"] += 1
+
+        await run_in_threadpool(
+            _in_session, complete, self._token,
+            [(row.id, row.attempts, error) for row, error in zip(batch, errors)],
+        )
+
+        now = datetime.utcnow()
+        for row, error in zip(batch, errors):
+            if error is None:
+                self.stats["sent"] += 1
+                self.by_channel[channel]["sent"] += 1
+                self.latency.record("delivery", (now - row.created_at).total_seconds())
+            else:
+                self.stats["failed_attempts"] += 1
+                self.by_channel[channel]["failed"] += 1
+                if row.attempts >= settings.NOTIFY_MAX_ATTEMPTS:
+                    self.stats["gave_up"] += 1
+                    logger.warning("Giving up on notification %s after %s attempts: %s", row.id, row.attempts, error)
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def report(self) -> dict:
+        return {
+            **self.stats,
+            "failure_rate": _rate(self.stats["failed_attempts"], self.stats["sent"]),
+            "queued_batches": self._queue.qsize() if self._queue else 0,
+            "in_flight_batches": self._in_flight,
+            "channels": {
+                channel: {**counts, "failure_rate": _rate(counts["failed"], counts["sent"])}
+                for channel, counts in self.by_channel.items()
+            },
+            "latency": self.latency.snapshot(),
+        }
+
+
+def _rate(failed: int, sent: int) -> float:
+    return round(failed / (failed + sent), 4) if failed + sent else 0.0
+
+
+dispatcher = NotificationDispatcher()
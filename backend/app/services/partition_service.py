@@ -0,0 +1,268 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import engine
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PARENT = "location_events"
+DEFAULT_PARTITION = f"{PARENT}_default"
+
+# Any constant; keeps workers from maintaining partitions concurrently
+_ADVISORY_LOCK_KEY = 0x5354_5350
+
+_FORMATS = {"day": "%Y%m%d", "hour": "%Y%m%d%H"}
+
+
+# --------------------------------
+# Partition Bounds / Naming
+# --------------------------------
+def _step() -> timedelta:
+    if settings.LOCATION_PARTITION_INTERVAL not in _FORMATS:
+        raise ValueError("LOCATION_PARTITION_INTERVAL must be 'day' or 'hour'")
+    return timedelta(hours=1) if settings.LOCATION_PARTITION_INTERVAL == "hour" else timedelta(days=1)
+
+
+def partition_start(ts: datetime) -> datetime:
+    if settings.LOCATION_PARTITION_INTERVAL == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def partition_name(start: datetime) -> str:
+    return f"{PARENT}_p{start.strftime(_FORMATS[settings.LOCATION_PARTITION_INTERVAL])}"
+
+
+def parse_partition(name: str) -> Tuple[datetime, datetime] | None:
+    """
+    (start, end) for a partition created by this module, whichever
+    interval was configured when it was created.
+    """
+    suffix = name.rpartition("_p")[2]
+    for fmt, step in (("%Y%m%d%H", timedelta(hours=1)), ("%Y%m%d", timedelta(days=1))):
+        if len(suffix) == len(datetime(2000, 1, 1).strftime(fmt)):
+            try:
+                start = datetime.strptime(suffix, fmt)
+            except ValueError:
+                return None
+            return start, start + step
+    return None
+
+
+def retention_cutoff(now: datetime) -> datetime:
+    """
+    Events before this are rolled up and removed. Aligned to a
+    partition boundary so no minute bucket is split across runs.
+    """
+    return partition_start(now - timedelta(days=settings.LOCATION_RETENTION_DAYS))
+
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE relname = :name"),
+        {"name": PARENT},
+    ).scalar())
+
+
+# --------------------------------
+# PostgreSQL Partitions
+# --------------------------------
+def list_partitions(conn: Connection) -> List[Tuple[str, datetime, datetime]]:
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": PARENT}).scalars()
+
+    partitions = []
+    for name in rows:
+        bounds = parse_partition(name) if name != DEFAULT_PARTITION else None
+        if bounds:
+            partitions.append((name, *bounds))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def ensure_partitions(conn: Connection, start: datetime, end: datetime) -> List[str]:
+    """
+    Create the partitions covering [start, end) that do not exist yet.
+    Ranges already covered (e.g. by partitions made under another
+    interval setting) are skipped rather than overlapped.
+    """
+    existing = list_partitions(conn)
+    created = []
+    step = _step()
+    current = partition_start(start)
+
+    while current < end:
+        upper = current + step
+        if not any(lo < upper and current < hi for _, lo, hi in existing):
+            name = partition_name(current)
+            try:
+                with conn.begin_nested():
+                    conn.execute(text(
+                        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT} '
+                        f"FOR VALUES FROM ('{current.isoformat(' ')}') TO ('{upper.isoformat(' ')}')"
+                    ))
+                created.append(name)
+            except DBAPIError as exc:
+                # Usually rows for this range already sit in the default partition
+                logger.warning("Could not create partition %s: %s", name, exc.orig)
+        current = upper
+
+    conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{DEFAULT_PARTITION}" PARTITION OF {PARENT} DEFAULT'))
+    return created
+
+
+# --------------------------------
+# Rollups
+# --------------------------------
+def rollup(
+    conn: Connection,
+    source: str,
+    before: datetime | None = None,
+    since: datetime | None = None,
+) -> int:
+    """
+    Fold raw events from `source` into per-zone / per-minute rollups.
+    Buckets that already exist are merged (tourist_count keeps the
+    larger value, as distinct counts cannot be added).
+    """
+    if conn.dialect.name == "postgresql":
+        bucket, greatest = "date_trunc('minute', timestamp)", "GREATEST"
+    else:
+        bucket, greatest = "strftime('%Y-%m-%d %H:%M:00', timestamp)", "MAX"
+
+    where = "zone_id IS NOT NULL"
+    params = {}
+    if before is not None:
+        where += " AND timestamp < :before"
+        params["before"] = before
+    if since is not None:
+        where += " AND timestamp >= :since"
+        params["since"] = since
+
+    statement = text(f"""
+        INSERT INTO location_rollups
+            (zone_id, bucket, event_count, tourist_count, sos_count, rssi_sum, rssi_count)
+        SELECT zone_id, {bucket}, count(*), count(DISTINCT tourist_id),
+               sum(CASE WHEN sos_flag THEN 1 ELSE 0 END),
+               coalesce(sum(rssi), 0), count(rssi)
+        FROM "{source}"
+        WHERE {where}
+        GROUP BY 1, 2
+        ON CONFLICT (zone_id, bucket) DO UPDATE SET
+            event_count = location_rollups.event_count + excluded.event_count,
+            tourist_count = {greatest}(location_rollups.tourist_count, excluded.tourist_count),
+            sos_count = location_rollups.sos_count + excluded.sos_count,
+            rssi_sum = location_rollups.rssi_sum + excluded.rssi_sum,
+            rssi_count = location_rollups.rssi_count + excluded.rssi_count
+    """)
+    statement = statement.bindparams(*(bindparam(name, type_=DateTime) for name in params))
+    return conn.execute(statement, params).rowcount
+
+
+def _delete_before(conn: Connection, table: str, cutoff: datetime) -> int:
+    statement = text(f'DELETE FROM "{table}" WHERE timestamp < :cutoff').bindparams(
+        bindparam("cutoff", type_=DateTime)
+    )
+    return conn.execute(statement, {"cutoff": cutoff}).rowcount
+
+
+# --------------------------------
+# Maintenance (create ahead, roll up + drop behind)
+# --------------------------------
+def run_maintenance(conn: Connection, now: datetime | None = None) -> dict:
+    now = now or datetime.utcnow()
+    cutoff = retention_cutoff(now)
+    summary = {"created": [], "dropped": [], "rollup_buckets": 0, "deleted_rows": 0}
+
+    with conn.begin():
+        partitioned = is_partitioned(conn)
+
+    if not partitioned:
+        # SQLite / unpartitioned fallback: same rollups, row deletes
+        with conn.begin():
+            summary["rollup_buckets"] += rollup(conn, PARENT, before=cutoff)
+            summary["deleted_rows"] = _delete_before(conn, PARENT, cutoff)
+        return summary
+
+    with conn.begin():
+        locked = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}).scalar()
+    if not locked:
+        return summary
+
+    try:
+        with conn.begin():
+            ahead = _step() * (settings.LOCATION_PARTITIONS_AHEAD + 1)
+            summary["created"] = ensure_partitions(conn, now - _step(), now + ahead)
+
+        with conn.begin():
+            partitions = list_partitions(conn)
+
+        # One transaction per partition: rollup and drop commit together
+        for name, _, end in partitions:
+            if end > cutoff:
+                break
+            with conn.begin():
+                summary["rollup_buckets"] += rollup(conn, name)
+                conn.execute(text(f'DROP TABLE "{name}"'))
+            summary["dropped"].append(name)
+
+        # Stragglers with timestamps no partition covered
+        with conn.begin():
+            summary["rollup_buckets"] += rollup(conn, DEFAULT_PARTITION, before=cutoff)
+            summary["deleted_rows"] = _delete_before(conn, DEFAULT_PARTITION, cutoff)
+    finally:
+        with conn.begin():
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+    return summary
+
+
+_task: asyncio.Task | None = None
+
+
+async def _maintenance_loop():
+    while True:
+        def _run():
+            # Imported here: the archiver builds on this module's rollups
+            from app.services.archive_service import run_archive
+
+            with engine.connect() as conn:
+                # Archive first so archived days are not rolled up twice
+                return run_archive(conn), run_maintenance(conn)
+
+        try:
+            archived, summary = await run_in_threadpool(_run)
+            if archived["rows"]:
+                logger.info("Archived location events: %s", archived)
+            if summary["created"] or summary["dropped"] or summary["deleted_rows"]:
+                logger.info("Location event maintenance: %s", summary)
+        except Exception:
+            logger.exception("Location event maintenance failed")
+
+        await asyncio.sleep(settings.LOCATION_MAINTENANCE_SECONDS)
+
+
+def start_partition_maintenance():
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_maintenance_loop())
+
+
+async def stop_partition_maintenance():
+    global _task
+    if _task:
+        _task.cancel()
+        _task = None
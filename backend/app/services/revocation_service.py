@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.auth_cache import invalidate_principal
+from app.core.revocation import revocations
+from app.database import SessionLocal
+from app.models.token_revocation import TokenRevocation
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _unix(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _apply(row: TokenRevocation):
+    if row.jti:
+        revocations.revoke_jti(row.jti, _unix(row.expires_at))
+    if row.subject:
+        revocations.revoke_subject(row.subject, _unix(row.revoked_at), _unix(row.expires_at))
+        invalidate_principal(row.subject)
+
+
+# --------------------------------
+# Revoke One Token (logout / stolen device)
+# --------------------------------
+def revoke_token(db: Session, payload: dict) -> TokenRevocation:
+    """
+    Idempotent: revoking an already revoked token is a no-op.
+    """
+    row = TokenRevocation(
+        jti=payload["jti"],
+        revoked_at=datetime.utcnow(),
+        expires_at=datetime.utcfromtimestamp(payload["exp"]),
+    )
+    db.execute(
+        _INSERTS[db.get_bind().dialect.name](TokenRevocation)
+        .values(jti=row.jti, revoked_at=row.revoked_at, expires_at=row.expires_at)
+        .on_conflict_do_nothing(index_elements=[TokenRevocation.jti])
+    )
+    db.commit()
+
+    _apply(row)
+    return row
+
+
+# --------------------------------
+# Revoke Every Token of a User (deactivation)
+# --------------------------------
+def revoke_user_tokens(db: Session, email: str) -> TokenRevocation:
+    now = datetime.utcnow()
+    row = TokenRevocation(
+        subject=email,
+        revoked_at=now,
+        expires_at=now + timedelta(minutes=settings.JWT_EXPIRE_MINUTES),
+    )
+    db.add(row)
+    db.commit()
+
+    _apply(row)
+    return row
+
+
+# --------------------------------
+# Cross-Worker Sync
+# --------------------------------
+def sync_revocations(db: Session, since: datetime | None) -> datetime:
+    """
+    Pull revocations made by any worker since `since`, prune expired
+    ones from memory and the table. Returns the new high-water mark.
+    """
+    now = datetime.utcnow()
+
+    query = db.query(TokenRevocation).filter(TokenRevocation.expires_at > now)
+    if since is not None:
+        # Overlap one interval: rows from slower transactions may carry
+        # an older revoked_at than the last one we saw
+        overlap = timedelta(seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS)
+        query = query.filter(TokenRevocation.revoked_at > since - overlap)
+
+    high_water = since
+    for row in query.all():
+        _apply(row)
+        if high_water is None or row.revoked_at > high_water:
+            high_water = row.revoked_at
+
+    db.query(TokenRevocation).filter(TokenRevocation.expires_at <= now).delete()
+    db.commit()
+    revocations.prune()
+
+    return high_water
+
+
+_task: asyncio.Task | None = None
+
+
+async def _sync_loop():
+    since = None
+    while True:
+        def _sync():
+            db = SessionLocal()
+            try:
+                return sync_revocations(db, since)
+            finally:
+                db.close()
+
+        try:
+            since = await run_in_threadpool(_sync)
+        except Exception:
+            logger.exception("Token revocation sync failed")
+
+        await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+
+
+def start_revocation_sync():
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_sync_loop())
+
+
+async def stop_revocation_sync():
+    global _task
+    if _task:
+        _task.cancel()
+        _task = None
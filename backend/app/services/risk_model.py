@@ -0,0 +1,87 @@
+import math
+import os
+from pathlib import Path
+from typing import List, Sequence
+
+from app.config import settings
+from app.core.feature_vector import FEATURES
+from app.core.inference import InferenceBatcher, LogisticRiskModel
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Trained by ai-engine/train_baseline.py
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parents[3] / "ai-engine" / "models" / "zone_risk_baseline.json"
+
+
+class BaselineRiskModel:
+    """
+    Hand-weighted logistic score over the zone feature vector: crowd
+    size and SOS activity push risk up. Used when no trained model
+    file is available; anything with the same predict() fits.
+    """
+
+    name = "baseline-heuristic"
+    features = FEATURES
+
+    _EVENTS = FEATURES.index("event_count")
+    _TOURISTS = FEATURES.index("unique_tourists")
+    _DEVICES = FEATURES.index("unique_devices")
+    _SOS = FEATURES.index("sos_count")
+    _SOS_RATE = FEATURES.index("sos_rate")
+
+    def predict(self, rows: Sequence[Sequence[float]]) -> List[float]:
+        scores = []
+        for row in rows:
+            crowd = max(row[self._TOURISTS], row[self._DEVICES])
+            z = (
+                -4.0
+                + 0.35 * math.log1p(row[self._EVENTS])
+                + 0.45 * math.log1p(crowd)
+                + 1.5 * min(row[self._SOS], 3)
+                + 8.0 * row[self._SOS_RATE]
+            )
+            scores.append(1.0 / (1.0 + math.exp(-z)))
+        return scores
+
+
+def load_risk_model():
+    path = settings.RISK_MODEL_PATH or str(DEFAULT_MODEL_PATH)
+    if not os.path.exists(path):
+        logger.warning("Risk model %s not found, using the baseline heuristic", path)
+        return BaselineRiskModel()
+
+    try:
+        model = LogisticRiskModel.load(path)
+    except Exception:
+        logger.exception("Could not load risk model %s, using the baseline heuristic", path)
+        return BaselineRiskModel()
+
+    if model.features != FEATURES:
+        logger.warning("Risk model %s was trained on other features, using the baseline heuristic", path)
+        return BaselineRiskModel()
+
+    logger.info("Loaded risk model %s from %s", model.name, path)
+    return model
+
+
+_model = None
+
+
+def get_risk_model():
+    global _model
+    if _model is None:
+        _model = load_risk_model()
+    return _model
+
+
+# Micro-batched scoring for concurrent single-zone requests
+risk_inference = InferenceBatcher(settings.INFERENCE_MAX_BATCH, settings.INFERENCE_MAX_WAIT_MS)
+
+
+def start_risk_inference():
+    risk_inference.start(get_risk_model())
+
+
+async def stop_risk_inference():
+    await risk_inference.stop()
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import ReadSessionLocal, SessionLocal
+from app.services.feature_service import compute_zone_feature_matrix
+from app.services.risk_model import get_risk_model
+from app.services.zone_service import bulk_upsert_zone_status
+from app.services.zone_status_service import publish_zone_changes
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Any constant; one scoring cycle at a time across workers (PostgreSQL)
+_ADVISORY_LOCK_KEY = 0x5354_5352
+
+
+class RiskScheduler:
+    """
+    Every RISK_SCORING_INTERVAL_SECONDS: features for all zones ->
+    one batched model call -> one bulk upsert (which also refreshes
+    the zone status snapshot) -> broadcast of zones whose risk level
+    changed.
+
+    Runs at a fixed rate. A cycle never overlaps the previous one;
+    ticks that pass while a cycle is still running are skipped and
+    counted.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._running = threading.Lock()
+        self.stats = {
+            "cycles": 0,
+            "skipped": 0,
+            "failed": 0,
+            "zones": 0,
+            "changed": 0,
+            "last_cycle_ms": 0.0,
+            "max_cycle_ms": 0.0,
+            "last_scoring_ms": 0.0,
+            "max_scoring_ms": 0.0,
+        }
+
+    # -------------------------
+    # Loop
+    # -------------------------
+    def start(self):
+        if self._task is None and settings.RISK_SCORING_ENABLED:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        interval = settings.RISK_SCORING_INTERVAL_SECONDS
+        next_at = time.monotonic()
+        while True:
+            next_at += interval
+            try:
+                await self.run_cycle()
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception("Risk scoring cycle failed")
+
+            now = time.monotonic()
+            if now > next_at:
+                missed = int((now - next_at) // interval) + 1
+                self.stats["skipped"] += missed
+                next_at += missed * interval
+            await asyncio.sleep(next_at - now)
+
+    # -------------------------
+    # One Cycle
+    # -------------------------
+    async def run_cycle(self) -> int:
+        """
+        Score every zone once. Returns the number of zones whose
+        level changed (-1 when skipped because a cycle is running).
+        """
+        if not self._running.acquire(blocking=False):
+            self.stats["skipped"] += 1
+            return -1
+
+        try:
+            started = time.perf_counter()
+            changes = await run_in_threadpool(self._score_and_store)
+            if changes is None:
+                self.stats["skipped"] += 1
+                return -1
+
+            # Queued by the upsert; sent now rather than on the next sync tick
+            await publish_zone_changes()
+
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stats["cycles"] += 1
+            self.stats["changed"] += len(changes)
+            self.stats["last_cycle_ms"] = round(elapsed, 3)
+            self.stats["max_cycle_ms"] = max(self.stats["max_cycle_ms"], round(elapsed, 3))
+            return len(changes)
+        finally:
+            self._running.release()
+
+    def _score_and_store(self):
+        db = SessionLocal()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                locked = db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"),
+                    {"key": _ADVISORY_LOCK_KEY},
+                ).scalar()
+                if not locked:
+                    return None
+
+            read_db = ReadSessionLocal()
+            try:
+                matrix = compute_zone_feature_matrix(read_db, settings.RISK_FEATURE_WINDOW_MINUTES)
+            finally:
+                read_db.close()
+            if not matrix.zone_ids:
+                return []
+
+            scoring_started = time.perf_counter()
+            scores = get_risk_model().predict(matrix.rows)
+            scoring_ms = round((time.perf_counter() - scoring_started) * 1000, 3)
+            self.stats["last_scoring_ms"] = scoring_ms
+            self.stats["max_scoring_ms"] = max(self.stats["max_scoring_ms"], scoring_ms)
+            self.stats["zones"] = len(matrix.zone_ids)
+
+            # Advisory xact lock is released by this commit
+            results = bulk_upsert_zone_status(db, dict(zip(matrix.zone_ids, scores)))
+            return [change for change in results if change[1] != change[2]]
+        finally:
+            db.close()
+
+
+risk_scheduler = RiskScheduler()
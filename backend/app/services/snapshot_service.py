@@ -0,0 +1,64 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import List, Tuple
+
+from app.config import settings
+from app.models.incident import Incident
+from app.models.location_event import LocationEvent
+from app.models.user import User
+from app.services.incident_service import serialize_incident
+from app.services.tourist_service import _calculate_activity_status, serialize_tourist
+
+
+# --------------------------------
+# Dashboard State (stream snapshot seed)
+# --------------------------------
+def load_dashboard_state(db: Session) -> List[Tuple[tuple, dict, dict]]:
+    """
+    Current tourists and incidents as (entity key, data, routing)
+    entries, in the same shape the live stream compacts them into.
+    """
+
+    limit = settings.WS_SNAPSHOT_MAX_ENTITIES
+    entries = []
+
+    # Last seen per tourist in one grouped query instead of one per row
+    last_seen = dict(
+        db.query(LocationEvent.tourist_id, func.max(LocationEvent.timestamp))
+        .filter(LocationEvent.tourist_id.isnot(None))
+        .group_by(LocationEvent.tourist_id)
+        .all()
+    )
+
+    tourists = (
+        db.query(User)
+        .filter(User.role == "tourist")
+        .order_by(User.id.desc())
+        .limit(limit)
+        .all()
+    )
+    for tourist in tourists:
+        tourist.activity_status = _calculate_activity_status(last_seen.get(tourist.id))
+        entries.append((
+            ("tourist", tourist.id),
+            serialize_tourist(tourist),
+            {"tourist_id": tourist.id},
+        ))
+
+    incidents = (
+        db.query(Incident)
+        .order_by(Incident.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    for incident in incidents:
+        entries.append((
+            ("incident", incident.id),
+            serialize_incident(incident),
+            {
+                "tourist_id": incident.tourist_id,
+                "location": (incident.latitude, incident.longitude),
+            },
+        ))
+
+    return entries
@@ -0,0 +1,298 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.core.auth_cache import ExpiringCache
+from app.core.position_stream import positions
+from app.core.stage_latency import StageLatency
+from app.core.websocket_manager import manager
+from app.database import SOSSessionLocal
+from app.models.iot_device import IoTDevice
+from app.models.location_event import LocationEvent
+from app.models.sos_event import SOSEvent
+from app.services.escalation_service import escalations
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds from receipt to each stage
+latency = StageLatency(("broadcast", "persisted", "acknowledged"), settings.SOS_LATENCY_WINDOW)
+stats = {
+    "received": 0, "duplicates": 0, "broadcast_failed": 0,
+    "persisted": 0, "persist_failed": 0, "acknowledged": 0,
+}
+
+# api key digest -> device_id of an active device
+_devices = ExpiringCache(10000)
+
+# device + idempotency key (or tourist) -> future of the SOS response,
+# so retries within SOS_DEDUP_SECONDS repeat it instead of raising a
+# second alert
+_recent = ExpiringCache(10000)
+
+# Reserved threads: SOS work never waits behind the shared threadpool
+_executor: ThreadPoolExecutor | None = None
+
+
+def _utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+async def _run(fn, *args):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.SOS_WORKERS, thread_name_prefix="sos")
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+# --------------------------------
+# Device Authentication (cached)
+# --------------------------------
+def _lookup_device(api_key: str) -> str | None:
+    db = SOSSessionLocal()
+    try:
+        device = db.query(IoTDevice).filter(IoTDevice.api_key == api_key).first()
+        return device.device_id if device and device.status == "active" else None
+    finally:
+        db.close()
+
+
+async def authenticate_device(api_key: str) -> str | None:
+    """
+    device_id for an active device's API key. Cached for
+    SOS_DEVICE_CACHE_SECONDS; misses use the SOS pool.
+    """
+    digest = hashlib.sha256(api_key.encode()).hexdigest()
+    device_id = _devices.get(digest)
+    if device_id is None:
+        device_id = await _run(_lookup_device, api_key)
+        if device_id is not None:
+            _devices.set(digest, device_id, time.time() + settings.SOS_DEVICE_CACHE_SECONDS)
+    return device_id
+
+
+# --------------------------------
+# Fast Lane
+# --------------------------------
+def _persist(sos: dict, received: float, broadcast: float | None) -> tuple:
+    """
+    -> (location event id, received_at, created). An SOS id that is
+    already stored (a retry handled by another worker) is not written
+    again.
+    """
+    db = SOSSessionLocal()
+    try:
+        event = LocationEvent(
+            tourist_id=sos["tourist_id"],
+            device_id=sos["device_id"],
+            source="SOS",
+            sos_flag=True,
+            timestamp=_utc(received),
+        )
+        db.add(event)
+        db.flush()
+        event_id = event.id
+
+        db.add(SOSEvent(
+            id=sos["id"],
+            location_event_id=event_id,
+            tourist_id=sos["tourist_id"],
+            device_id=sos["device_id"],
+            message=sos["message"],
+            latitude=sos["latitude"],
+            longitude=sos["longitude"],
+            located_at=sos["located_at"],
+            received_at=_utc(received),
+            broadcast_at=_utc(broadcast) if broadcast is not None else None,
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            existing = db.get(SOSEvent, sos["id"])
+            if existing is None:
+                raise
+            return existing.location_event_id, existing.received_at, False
+        return event_id, sos["received_at"], True
+    finally:
+        db.close()
+
+
+def _mark_persisted(sos_id: str, persisted: float):
+    db = SOSSessionLocal()
+    try:
+        db.execute(update(SOSEvent).where(SOSEvent.id == sos_id).values(persisted_at=_utc(persisted)))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def raise_sos(
+    device_id: str,
+    tourist_id: int | None,
+    message: str | None,
+    idempotency_key: str | None = None,
+) -> dict:
+    """
+    Broadcast to dashboards first, then write on the reserved pool.
+    The alert carries the tourist's last position from memory, so
+    nothing is read from the database on this path.
+
+    A retry (same idempotency key, or without one the same tourist
+    within SOS_DEDUP_SECONDS) returns the first SOS with
+    `duplicate: true` and raises no new alert.
+    """
+    scope = idempotency_key if idempotency_key is not None else f"tourist:{tourist_id}"
+    dedup_key = f"{device_id}:{scope}"
+    pending = _recent.get(dedup_key)
+    if pending is not None:
+        stats["duplicates"] += 1
+        return {**await asyncio.shield(pending), "duplicate": True}
+
+    future = asyncio.get_running_loop().create_future()
+    future.add_done_callback(_retrieve)
+    _recent.set(dedup_key, future, time.time() + settings.SOS_DEDUP_SECONDS)
+    try:
+        result = await _raise(device_id, tourist_id, message, idempotency_key)
+    except BaseException as exc:
+        # Not stored: the device's retry must go through
+        _recent.pop(dedup_key)
+        future.set_exception(exc)
+        raise
+    future.set_result(result)
+    return result
+
+
+def _retrieve(future: asyncio.Future):
+    # Failures are raised to the first caller; waiting retries re-raise
+    # them, and without any this keeps asyncio from warning
+    if not future.cancelled():
+        future.exception()
+
+
+async def _raise(device_id: str, tourist_id: int | None, message: str | None, idempotency_key: str | None) -> dict:
+    received = time.time()
+    stats["received"] += 1
+
+    if idempotency_key is not None:
+        # Deterministic, so a retry on another worker hits the same row
+        sos_id = hashlib.sha256(f"{device_id}:{idempotency_key}".encode()).hexdigest()[:32]
+    else:
+        sos_id = uuid.uuid4().hex
+
+    position = positions.latest.get(tourist_id) if tourist_id is not None else None
+    sos = {
+        "id": sos_id,
+        "tourist_id": tourist_id,
+        "device_id": device_id,
+        "message": message,
+        "latitude": position[0] if position else None,
+        "longitude": position[1] if position else None,
+        "located_at": _utc(position[2]) if position else None,
+        "received_at": _utc(received),
+    }
+
+    # Unscoped: every dashboard interested in SOS gets it, whatever
+    # zones it follows. A failing backplane or socket must not keep
+    # the SOS from being stored.
+    broadcast = None
+    try:
+        await manager.broadcast({"type": "sos_alert", "data": sos})
+    except Exception:
+        stats["broadcast_failed"] += 1
+        logger.exception("Broadcasting SOS %s failed", sos_id)
+    else:
+        broadcast = time.time()
+        latency.record("broadcast", broadcast - received)
+
+    try:
+        event_id, received_at, created = await _run(_persist, sos, received, broadcast)
+    except Exception:
+        stats["persist_failed"] += 1
+        raise
+    if not created:
+        stats["duplicates"] += 1
+        return {"sos_id": sos_id, "event_id": event_id, "received_at": received_at, "duplicate": True}
+
+    persisted = time.time()
+    latency.record("persisted", persisted - received)
+    stats["persisted"] += 1
+
+    # Off the response path
+    task = asyncio.ensure_future(_run(_mark_persisted, sos_id, persisted))
+    task.add_done_callback(_log_failure)
+    escalations.open_soon(
+        "sos", sos_id, tourist_id, sos["latitude"], sos["longitude"],
+        f"SOS from tourist {tourist_id}" + (f": {message}" if message else ""),
+    )
+
+    return {"sos_id": sos_id, "event_id": event_id, "received_at": sos["received_at"], "duplicate": False}
+
+
+def _log_failure(task: asyncio.Future):
+    if not task.cancelled() and task.exception():
+        logger.error("Recording SOS persisted_at failed", exc_info=task.exception())
+
+
+# --------------------------------
+# Acknowledgement (any worker)
+# --------------------------------
+def _acknowledge(sos_id: str, user_id: int, now: float):
+    """
+    -> (found, first acknowledgement, received_at, acknowledged_at,
+    acknowledged_by).
+    """
+    db = SOSSessionLocal()
+    try:
+        first = db.execute(
+            update(SOSEvent)
+            .where(SOSEvent.id == sos_id, SOSEvent.acknowledged_at.is_(None))
+            .values(acknowledged_at=_utc(now), acknowledged_by=user_id)
+        ).rowcount == 1
+        db.commit()
+
+        row = db.get(SOSEvent, sos_id)
+        if row is None:
+            return False, False, None, None, None
+        return True, first, row.received_at, row.acknowledged_at, row.acknowledged_by
+    finally:
+        db.close()
+
+
+async def acknowledge_sos(sos_id: str, user_id: int) -> dict | None:
+    """
+    Record the first authority acknowledgement and tell dashboards.
+    None when the SOS does not exist.
+    """
+    found, first, received_at, acknowledged_at, acknowledged_by = await _run(
+        _acknowledge, sos_id, user_id, time.time()
+    )
+    if not found:
+        return None
+
+    data = {"id": sos_id, "acknowledged_at": acknowledged_at, "acknowledged_by": acknowledged_by}
+    if first:
+        stats["acknowledged"] += 1
+        received = received_at.replace(tzinfo=timezone.utc).timestamp()
+        latency.record("acknowledged", acknowledged_at.replace(tzinfo=timezone.utc).timestamp() - received)
+        await manager.broadcast({"type": "sos_acknowledged", "data": data})
+        await escalations.acknowledge("sos", sos_id)
+    return {**data, "already_acknowledged": not first}
+
+
+def latency_report() -> dict:
+    return {**stats, "latency": latency.snapshot()}
+
+
+def shutdown_sos_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = None
@@ -0,0 +1,213 @@
+import csv
+import json
+from typing import AsyncIterator, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.websocket_manager import manager
+from app.models.user import User
+from app.schemas.tourist_schema import TouristImportRow
+from app.utils.helpers import hash_passwords_async
+
+# (row number, parsed fields) / (row number, email, error)
+ParsedRow = Tuple[int, dict]
+RowError = Tuple[int, str | None, str]
+
+
+# =========================================================
+# 🔵 Incremental Parsing
+# =========================================================
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into text lines without buffering the body.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    header = None
+    record: List[str] = []
+    row_number = 0
+
+    async for line in lines:
+        record.append(line)
+
+        # A record is complete once its quotes balance (quoted newlines)
+        if sum(part.count('"') for part in record) % 2:
+            continue
+
+        text, record = "\n".join(record), []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+
+        row_number += 1
+        yield row_number, {
+            key: value or None
+            for key, value in zip(header, values)
+        }
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = {"__error__": "Invalid JSON"}
+        if not isinstance(data, dict):
+            data = {"__error__": "Each line must be a JSON object"}
+        yield row_number, data
+
+
+# =========================================================
+# 🟢 Import
+# =========================================================
+async def import_tourists(db: AsyncSession, rows: AsyncIterator[ParsedRow]) -> dict:
+    """
+    Validate, hash and insert tourists in batches. Bad or duplicate
+    rows are reported individually and never abort a batch.
+    """
+
+    imported = 0
+    errors: List[RowError] = []
+    batch: List[ParsedRow] = []
+
+    async for item in rows:
+        batch.append(item)
+        if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+            imported += await _import_batch(db, batch, errors)
+            batch = []
+
+    if batch:
+        imported += await _import_batch(db, batch, errors)
+
+    if imported:
+        await manager.broadcast({
+            "type": "tourists_imported",
+            "data": {"count": imported}
+        })
+
+    return {
+        "imported": imported,
+        "failed": len(errors),
+        "errors": [
+            {"row": row, "email": email, "error": error}
+            for row, email, error in sorted(errors, key=lambda e: e[0])
+        ],
+    }
+
+
+async def _import_batch(db: AsyncSession, batch: List[ParsedRow], errors: List[RowError]) -> int:
+    valid: List[Tuple[int, TouristImportRow]] = []
+    seen = set()
+
+    for row, data in batch:
+        if "__error__" in data:
+            errors.append((row, None, data["__error__"]))
+            continue
+        try:
+            tourist = TouristImportRow(**data)
+        except ValidationError as exc:
+            errors.append((row, data.get("email"), _first_error(exc)))
+            continue
+
+        email = tourist.email.lower()
+        if email in seen:
+            errors.append((row, tourist.email, "Duplicate email in upload"))
+            continue
+        seen.add(email)
+        valid.append((row, tourist))
+
+    if not valid:
+        return 0
+
+    # One IN query for the whole batch
+    existing = {
+        email.lower()
+        for email in await db.scalars(
+            select(User.email)
+            .where(User.email.in_([t.email for _, t in valid]))
+        )
+    }
+    # Release the connection before the (slow) hashing step
+    await db.rollback()
+
+    fresh = []
+    for row, tourist in valid:
+        if tourist.email.lower() in existing:
+            errors.append((row, tourist.email, "Email already registered"))
+        else:
+            fresh.append((row, tourist))
+
+    if not fresh:
+        return 0
+
+    hashes = await hash_passwords_async([t.password for _, t in fresh])
+    users = [
+        (row, _to_user(tourist, hashed))
+        for (row, tourist), hashed in zip(fresh, hashes)
+    ]
+
+    try:
+        db.add_all([user for _, user in users])
+        await db.commit()
+        return len(users)
+    except IntegrityError:
+        # Lost a race with a concurrent registration; retry row by row
+        await db.rollback()
+        return await _insert_one_by_one(db, users, errors)
+
+
+async def _insert_one_by_one(db: AsyncSession, users: Iterable[Tuple[int, User]], errors: List[RowError]) -> int:
+    inserted = 0
+    for row, user in users:
+        try:
+            async with db.begin_nested():
+                db.add(user)
+            inserted += 1
+        except IntegrityError:
+            errors.append((row, user.email, "Email already registered"))
+    await db.commit()
+    return inserted
+
+
+def _to_user(tourist: TouristImportRow, hashed: str) -> User:
+    return User(
+        email=tourist.email,
+        password=hashed,
+        role="tourist",
+        full_name=tourist.full_name,
+        phone=tourist.phone,
+        emergency_contact=tourist.emergency_contact,
+        blood_group=tourist.blood_group,
+        medical_conditions=tourist.medical_conditions,
+        allergies=tourist.allergies,
+        date_of_birth=tourist.date_of_birth,
+        gender=tourist.gender,
+        nationality=tourist.nationality,
+    )
+
+
+def _first_error(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error.get("loc", ()))
+    return f"{field}: {error.get('msg')}" if field else error.get("msg", "Invalid row")
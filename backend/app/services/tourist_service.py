@@ -1,12 +1,14 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from typing import List
 from datetime import date, datetime, timedelta
 
 from app.models.user import User
 from app.models.location_event import LocationEvent
+from app.core.auth_cache import invalidate_principal
 from app.core.websocket_manager import manager
-from app.utils.helpers import hash_password
+from app.utils.helpers import hash_password_async
 
 
 # =========================================================
@@ -31,19 +33,16 @@ def _calculate_activity_status(last_seen: datetime | None) -> str:
         return "offline"
 
 
-def _attach_activity_status(db: Session, tourist: User) -> User:
+async def _attach_activity_status(db: AsyncSession, tourist: User) -> User:
     """
     Fetch latest location event and attach dynamic activity_status attribute.
     """
 
-    last_event = (
-        db.query(LocationEvent)
-        .filter(LocationEvent.tourist_id == tourist.id)
-        .order_by(LocationEvent.timestamp.desc())
-        .first()
+    last_seen = await db.scalar(
+        select(func.max(LocationEvent.timestamp))
+        .where(LocationEvent.tourist_id == tourist.id)
     )
 
-    last_seen = last_event.timestamp if last_event else None
     tourist.activity_status = _calculate_activity_status(last_seen)
 
     return tourist
@@ -53,7 +52,7 @@ def _attach_activity_status(db: Session, tourist: User) -> User:
 # 🟢 Create Tourist
 # =========================================================
 async def create_tourist(
-    db: Session,
+    db: AsyncSession,
     email: str,
     password: str,
     full_name: str | None = None,
@@ -67,13 +66,13 @@ async def create_tourist(
     nationality: str | None = None,
 ) -> User:
 
-    existing = db.query(User).filter(User.email == email).first()
+    existing = await db.scalar(select(User.id).where(User.email == email))
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     tourist = User(
         email=email,
-        password=hash_password(password),
+        password=await hash_password_async(password),
         role="tourist",
         full_name=full_name,
         phone=phone,
@@ -87,30 +86,17 @@ async def create_tourist(
     )
 
     db.add(tourist)
-    db.commit()
-    db.refresh(tourist)
+    await db.commit()
+    await db.refresh(tourist)
 
     # Attach activity status
-    tourist = _attach_activity_status(db, tourist)
+    tourist = await _attach_activity_status(db, tourist)
 
     # 🔴 WebSocket broadcast
     await manager.broadcast({
         "type": "tourist_created",
-        "data": {
-            "id": tourist.id,
-            "email": tourist.email,
-            "full_name": tourist.full_name,
-            "phone": tourist.phone,
-            "emergency_contact": tourist.emergency_contact,
-            "blood_group": tourist.blood_group,
-            "medical_conditions": tourist.medical_conditions,
-            "allergies": tourist.allergies,
-            "date_of_birth": str(tourist.date_of_birth) if tourist.date_of_birth else None,
-            "gender": tourist.gender,
-            "nationality": tourist.nationality,
-            "activity_status": tourist.activity_status,
-        }
-    })
+        "data": serialize_tourist(tourist)
+    }, tourist_id=tourist.id)
 
     return tourist
 
@@ -118,40 +104,49 @@ async def create_tourist(
 # =========================================================
 # 🟡 Get All Tourists (Authority)
 # =========================================================
-def get_all_tourists(db: Session) -> List[User]:
+async def get_all_tourists(db: AsyncSession) -> List[User]:
 
-    tourists = (
-        db.query(User)
-        .filter(User.role == "tourist")
+    result = await db.execute(
+        select(User)
+        .where(User.role == "tourist")
         .order_by(User.id.desc())
-        .all()
     )
+    tourists = list(result.scalars())
 
-    return [_attach_activity_status(db, t) for t in tourists]
+    # Last seen for every tourist in one grouped query
+    last_seen = dict((await db.execute(
+        select(LocationEvent.tourist_id, func.max(LocationEvent.timestamp))
+        .where(LocationEvent.tourist_id.isnot(None))
+        .group_by(LocationEvent.tourist_id)
+    )).all())
+
+    for tourist in tourists:
+        tourist.activity_status = _calculate_activity_status(last_seen.get(tourist.id))
+
+    return tourists
 
 
 # =========================================================
 # 🔵 Get Tourist By ID
 # =========================================================
-def get_tourist_by_id(db: Session, tourist_id: int) -> User:
+async def get_tourist_by_id(db: AsyncSession, tourist_id: int) -> User:
 
-    tourist = (
-        db.query(User)
-        .filter(User.id == tourist_id, User.role == "tourist")
-        .first()
+    tourist = await db.scalar(
+        select(User)
+        .where(User.id == tourist_id, User.role == "tourist")
     )
 
     if not tourist:
         raise HTTPException(status_code=404, detail="Tourist not found")
 
-    return _attach_activity_status(db, tourist)
+    return await _attach_activity_status(db, tourist)
 
 
 # =========================================================
 # 🟣 Update Tourist Profile
 # =========================================================
 async def update_tourist_profile(
-    db: Session,
+    db: AsyncSession,
     tourist_id: int,
     full_name: str | None = None,
     phone: str | None = None,
@@ -164,7 +159,7 @@ async def update_tourist_profile(
     nationality: str | None = None,
 ) -> User:
 
-    tourist = get_tourist_by_id(db, tourist_id)
+    tourist = await get_tourist_by_id(db, tourist_id)
 
     if full_name is not None:
         tourist.full_name = full_name
@@ -185,27 +180,36 @@ async def update_tourist_profile(
     if nationality is not None:
         tourist.nationality = nationality
 
-    db.commit()
-    db.refresh(tourist)
+    await db.commit()
+    await db.refresh(tourist)
+    invalidate_principal(tourist.email)
 
-    tourist = _attach_activity_status(db, tourist)
+    tourist = await _attach_activity_status(db, tourist)
 
     # 🔴 WebSocket broadcast
     await manager.broadcast({
         "type": "tourist_updated",
-        "data": {
-            "id": tourist.id,
-            "full_name": tourist.full_name,
-            "phone": tourist.phone,
-            "emergency_contact": tourist.emergency_contact,
-            "blood_group": tourist.blood_group,
-            "medical_conditions": tourist.medical_conditions,
-            "allergies": tourist.allergies,
-            "date_of_birth": str(tourist.date_of_birth) if tourist.date_of_birth else None,
-            "gender": tourist.gender,
-            "nationality": tourist.nationality,
-            "activity_status": tourist.activity_status,
-        }
-    })
+        "data": serialize_tourist(tourist)
+    }, tourist_id=tourist.id)
 
     return tourist
+
+
+# =========================================================
+# 🔧 Helper: Serialize Tourist
+# =========================================================
+def serialize_tourist(tourist: User) -> dict:
+    return {
+        "id": tourist.id,
+        "email": tourist.email,
+        "full_name": tourist.full_name,
+        "phone": tourist.phone,
+        "emergency_contact": tourist.emergency_contact,
+        "blood_group": tourist.blood_group,
+        "medical_conditions": tourist.medical_conditions,
+        "allergies": tourist.allergies,
+        "date_of_birth": str(tourist.date_of_birth) if tourist.date_of_birth else None,
+        "gender": tourist.gender,
+        "nationality": tourist.nationality,
+        "activity_status": getattr(tourist, "activity_status", None),
+    }
@@ -1,7 +1,19 @@
 from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.models.zone_status import ZoneStatus
+from app.services.zone_status_service import record_zone_statuses, serialize_zone_status
+
+
+def risk_level(risk_score: float) -> str:
+    if risk_score > 0.7:
+        return "high"
+    if risk_score > 0.4:
+        return "medium"
+    return "low"
 
 
 def update_zone_status(
@@ -13,14 +25,10 @@ def update_zone_status(
     Store ML inference output for dashboard & alerts.
     """
 
-    if risk_score > 0.7:
-        level = "high"
-    elif risk_score > 0.4:
-        level = "medium"
-    else:
-        level = "low"
+    level = risk_level(risk_score)
 
     zone = db.query(ZoneStatus).filter_by(zone_id=zone_id).first()
+    previous = zone.risk_level if zone else None
 
     if not zone:
         zone = ZoneStatus(
@@ -37,4 +45,78 @@ def update_zone_status(
 
     db.commit()
     db.refresh(zone)
+
+    record_zone_statuses(
+        [serialize_zone_status(zone.zone_id, zone.risk_level, zone.risk_score, zone.updated_at)],
+        [(zone_id, previous, level, risk_score)] if level != previous else [],
+    )
     return zone
+
+
+# --------------------------------
+# Bulk Upsert (risk scoring cycles)
+# --------------------------------
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_UPSERT_CHUNK = 2000
+
+
+def bulk_upsert_zone_status(
+    db: Session,
+    scores: Dict[int, float],
+) -> List[Tuple[int, str | None, str, float]]:
+    """
+    Write every zone's score in one INSERT .. ON CONFLICT statement
+    and queue `zone_risk_changed` for zones whose level changed.
+    Zones whose level and score are unchanged are not rewritten, so
+    their updated_at (and the status map's ETag) stays put.
+    Returns (zone_id, previous level, new level, score) per zone;
+    previous level is None for zones seen for the first time.
+    """
+    if not scores:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect not in _INSERTS:
+        raise RuntimeError(f"Bulk zone status upsert is not supported on {dialect}")
+
+    stored = {
+        zone_id: (level, score)
+        for zone_id, level, score in db.query(ZoneStatus.zone_id, ZoneStatus.risk_level, ZoneStatus.risk_score)
+        .filter(ZoneStatus.zone_id.in_(list(scores)))
+        .all()
+    }
+    previous = {zone_id: level for zone_id, (level, _) in stored.items()}
+
+    now = datetime.utcnow()
+    rows = [
+        {"zone_id": zone_id, "risk_score": score, "risk_level": risk_level(score), "updated_at": now}
+        for zone_id, score in scores.items()
+    ]
+    written = [row for row in rows if stored.get(row["zone_id"]) != (row["risk_level"], row["risk_score"])]
+
+    # Chunked only to stay under driver bind-parameter limits
+    for start in range(0, len(written), _UPSERT_CHUNK):
+        statement = _INSERTS[dialect](ZoneStatus).values(written[start:start + _UPSERT_CHUNK])
+        statement = statement.on_conflict_do_update(
+            index_elements=[ZoneStatus.zone_id],
+            set_={
+                "risk_score": statement.excluded.risk_score,
+                "risk_level": statement.excluded.risk_level,
+                "updated_at": statement.excluded.updated_at,
+            },
+            # A row written since the read above may already match
+            where=(ZoneStatus.risk_level != statement.excluded.risk_level)
+            | (ZoneStatus.risk_score != statement.excluded.risk_score),
+        )
+        db.execute(statement)
+    db.commit()
+
+    results = [
+        (row["zone_id"], previous.get(row["zone_id"]), row["risk_level"], row["risk_score"])
+        for row in rows
+    ]
+    record_zone_statuses(
+        [serialize_zone_status(**row) for row in written],
+        [result for result in results if result[1] != result[2]],
+    )
+    return results
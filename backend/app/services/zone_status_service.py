@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Iterable, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.websocket_manager import manager
+from app.core.zone_status_cache import zone_statuses
+from app.database import SessionLocal
+from app.models.zone_status import ZoneStatus
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (previous level, serialized row) waiting to be broadcast
+_changes: deque = deque()
+
+
+def serialize_zone_status(zone_id: int, risk_level: str, risk_score: float, updated_at: datetime) -> dict:
+    # Same fields as ZoneStatusResponse
+    return {
+        "zone_id": zone_id,
+        "risk_level": risk_level,
+        "risk_score": float(risk_score),
+        "updated_at": updated_at,
+    }
+
+
+def _serialize(zone: ZoneStatus) -> dict:
+    return serialize_zone_status(zone.zone_id, zone.risk_level, zone.risk_score, zone.updated_at)
+
+
+# --------------------------------
+# Writes (called by zone_service after its commit)
+# --------------------------------
+def record_zone_statuses(rows: Iterable[dict], changes: Iterable[Tuple[int, str | None, str, float]] = ()):
+    """
+    Refresh this worker's snapshot and queue `zone_risk_changed` for
+    zones whose level changed. Other workers apply the changed rows
+    when the broadcast reaches them through the backplane, and the
+    rest on their next sync.
+    """
+    rows = {row["zone_id"]: row for row in rows}
+    zone_statuses.apply(rows.values())
+    _changes.extend((previous, rows[zone_id]) for zone_id, previous, _, _ in changes)
+
+
+async def publish_zone_changes() -> int:
+    sent = 0
+    while _changes:
+        previous, row = _changes.popleft()
+        await manager.broadcast(
+            {
+                "type": "zone_risk_changed",
+                "data": {**row, "previous_level": previous},
+            },
+            zone_id=row["zone_id"],
+        )
+        sent += 1
+    return sent
+
+
+# --------------------------------
+# Cross-Worker Sync
+# --------------------------------
+def load_zone_statuses(db: Session) -> datetime | None:
+    zones = db.query(ZoneStatus).all()
+    zone_statuses.replace(_serialize(zone) for zone in zones)
+    return max((zone.updated_at for zone in zones), default=None)
+
+
+def sync_zone_statuses(db: Session, since: datetime | None) -> datetime | None:
+    """
+    Apply rows written by any worker since `since`. Returns the new
+    high-water mark.
+    """
+    if since is None:
+        return load_zone_statuses(db)
+
+    # Overlap one interval: rows from slower transactions may carry
+    # an older updated_at than the last one we saw
+    overlap = timedelta(seconds=settings.ZONE_STATUS_SYNC_SECONDS)
+    zones = db.query(ZoneStatus).filter(ZoneStatus.updated_at > since - overlap).all()
+    zone_statuses.apply(_serialize(zone) for zone in zones)
+    return max([since, *(zone.updated_at for zone in zones)])
+
+
+def _apply_remote_change(message: dict):
+    # Another worker's change, so /zones/status matches the push
+    # here too instead of waiting for the next sync
+    data = message["data"]
+    zone_statuses.apply([serialize_zone_status(
+        data["zone_id"],
+        data["risk_level"],
+        data["risk_score"],
+        datetime.fromisoformat(data["updated_at"]),
+    )])
+
+
+_task: asyncio.Task | None = None
+
+
+def _sync(since: datetime | None) -> datetime | None:
+    db = SessionLocal()
+    try:
+        return sync_zone_statuses(db, since)
+    finally:
+        db.close()
+
+
+async def _sync_loop(since: datetime | None):
+    last_sync = time.monotonic()
+    while True:
+        await asyncio.sleep(1.0)
+        try:
+            await publish_zone_changes()
+            if time.monotonic() - last_sync >= settings.ZONE_STATUS_SYNC_SECONDS:
+                last_sync = time.monotonic()
+                since = await run_in_threadpool(_sync, since)
+        except Exception:
+            logger.exception("Zone status sync failed")
+
+
+async def start_zone_status_sync():
+    """
+    Load the snapshot before serving, then keep it in sync.
+    """
+    global _task
+    if _task is not None:
+        return
+
+    manager.on_remote("zone_risk_changed", _apply_remote_change)
+    since = None
+    try:
+        since = await run_in_threadpool(_sync, None)
+    except Exception:
+        logger.exception("Loading zone status snapshot failed")
+    _task = asyncio.create_task(_sync_loop(since))
+
+
+async def stop_zone_status_sync():
+    global _task
+    if _task:
+        _task.cancel()
+        _task = None
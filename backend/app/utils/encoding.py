@@ -0,0 +1,69 @@
+import json
+import zlib
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """
+    Fast JSON encoding to UTF-8 bytes (orjson when installed).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+
+def loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def with_field(raw: bytes, key: str, value) -> bytes:
+    """
+    Prepend one field to an encoded JSON object without re-encoding
+    the rest of it.
+    """
+    field = dumps(key) + b":" + dumps(value)
+    if raw == b"{}":
+        return b"{" + field + b"}"
+    return b"{" + field + b"," + raw[1:]
+
+
+class EncodedMessage:
+    """
+    A message serialized once and shared by every connection; pass
+    `raw` when it is already encoded.
+
+    The deflated frame is only built the first time a client that
+    negotiated compression asks for it, then reused for the rest.
+    """
+
+    __slots__ = ("raw", "_text", "_deflated")
+
+    def __init__(self, message: dict | None = None, raw: bytes | None = None):
+        self.raw = raw if raw is not None else dumps(message)
+        self._text: str | None = None
+        self._deflated: bytes | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.raw.decode()
+        return self._text
+
+    @property
+    def deflated(self) -> bytes:
+        if self._deflated is None:
+            self._deflated = zlib.compress(self.raw, 6)
+        return self._deflated
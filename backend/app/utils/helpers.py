@@ -1,9 +1,19 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
 from passlib.context import CryptContext
 
-# Use pbkdf2_sha256 to avoid Windows bcrypt issues
+from app.config import settings
+
+# Use pbkdf2_sha256 to avoid Windows bcrypt issues.
+# min/max pinned to the configured rounds so hashes made with other
+# settings are flagged for a transparent rehash on the next login.
 pwd_context = CryptContext(
     schemes=["pbkdf2_sha256"],
-    deprecated="auto"
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=settings.PASSWORD_HASH_ROUNDS,
 )
 
 def hash_password(password: str) -> str:
@@ -11,3 +21,75 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
+
+def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    (valid, new_hash) - new_hash is set when the stored hash
+    should be replaced with one using the current settings.
+    """
+    return pwd_context.verify_and_update(password, hashed)
+
+
+# =========================================================
+# Process Pool (keeps pbkdf2 off the event loop)
+# =========================================================
+_pool: ProcessPoolExecutor | None = None
+_slots: asyncio.Semaphore | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool, _slots
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        # Bound in-flight jobs; the rest wait on the loop, not in the pool queue
+        _slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS * 2)
+    return _pool
+
+
+async def _run_hashing(fn, *args):
+    pool = _get_pool()
+    if pool is None:
+        return fn(*args)
+
+    async with _slots:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+def _hash_many(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(p) for p in passwords]
+
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Hash a batch, split into one chunk per pool worker so IPC
+    overhead is paid per chunk rather than per password. Each chunk
+    takes a slot like any other hashing job, so bulk imports share
+    the bound with logins instead of bypassing it.
+    """
+    pool = _get_pool()
+    if pool is None:
+        return _hash_many(passwords)
+
+    size = max(1, -(-len(passwords) // settings.PASSWORD_HASH_WORKERS))
+    chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+
+    results = await asyncio.gather(*(_run_hashing(_hash_many, chunk) for chunk in chunks))
+    return [hashed for chunk in results for hashed in chunk]
+
+
+async def verify_and_update_password_async(password: str, hashed: str) -> tuple[bool, str | None]:
+    return await _run_hashing(verify_and_update_password, password, hashed)
+
+
+def shutdown_hash_pool():
+    global _pool, _slots
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _slots = None
@@ -1,12 +1,19 @@
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from jose import jwt
 from app.config import settings
 
 def create_token(data: dict):
     payload = data.copy()
-    payload["exp"] = datetime.utcnow() + timedelta(
+    now = datetime.utcnow()
+    # Millisecond iat: a token issued right after "revoke all tokens"
+    # must compare as newer than the revocation, even in the same second
+    payload["iat"] = round(now.replace(tzinfo=timezone.utc).timestamp(), 3)
+    payload["exp"] = now + timedelta(
         minutes=settings.JWT_EXPIRE_MINUTES
     )
+    # Unique id so a single token can be revoked
+    payload["jti"] = uuid.uuid4().hex
     return jwt.encode(
         payload,
         settings.JWT_SECRET,
@@ -0,0 +1,280 @@
+"""
+Replay a location event log through the trajectory anomaly detector.
+
+With no source, a synthetic day is simulated: tourists rest at their
+hotel, then walk between attractions; some get an injected anomaly
+(vehicle-speed travel, straying far away, a long stop or going silent
+away from the hotel). Precision / recall / detection delay are scored
+against those labels. With --export (a Parquet / Arrow file from
+GET /exports/location-events) or --db, the real log is replayed and
+detections are counted.
+
+Run from backend/:
+    python -m benchmarks.anomaly_replay [--tourists 1000] [--export FILE | --db]
+"""
+import argparse
+import math
+import os
+import random
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timezone
+from statistics import median
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from app.config import settings
+from app.core.trajectory_anomaly import KINDS, TrajectoryAnomalyDetector
+
+PING_SECONDS = 60
+SWEEP_SECONDS = 60
+# A detection of the labelled kind counts up to this long after it starts
+TOLERANCE_SECONDS = 90 * 60
+
+_M_PER_DEG = 111_320.0
+
+
+def detector() -> TrajectoryAnomalyDetector:
+    return TrajectoryAnomalyDetector(
+        max_tourists=settings.ANOMALY_MAX_TOURISTS,
+        warmup_points=settings.ANOMALY_WARMUP_POINTS,
+        speed_mps=settings.ANOMALY_SPEED_MPS,
+        stray_m=settings.ANOMALY_STRAY_METERS,
+        stray_z=settings.ANOMALY_STRAY_Z,
+        idle_minutes=settings.ANOMALY_IDLE_MINUTES,
+        rest_minutes=settings.ANOMALY_REST_MINUTES,
+        cooldown_minutes=settings.ANOMALY_COOLDOWN_MINUTES,
+    )
+
+
+# --------------------------------
+# Synthetic day
+# --------------------------------
+class _Walker:
+    def __init__(self, rng, tourist_id, lat, lng, t):
+        self.rng, self.tourist_id = rng, tourist_id
+        self.lat, self.lng, self.t = lat, lng, t
+        self.events = []
+
+    def _ping(self, jitter_m=8.0):
+        j = jitter_m / _M_PER_DEG
+        self.events.append((
+            self.t, self.tourist_id,
+            self.lat + self.rng.gauss(0, j),
+            self.lng + self.rng.gauss(0, j / math.cos(math.radians(self.lat))),
+        ))
+
+    def stay(self, seconds, silent=False):
+        end = self.t + seconds
+        while self.t + PING_SECONDS <= end:
+            self.t += PING_SECONDS
+            if not silent:
+                self._ping()
+
+    def move_to(self, lat, lng, speed):
+        while True:
+            dy = (lat - self.lat) * _M_PER_DEG
+            dx = (lng - self.lng) * _M_PER_DEG * math.cos(math.radians(self.lat))
+            remaining = math.hypot(dx, dy)
+            step = speed * PING_SECONDS
+            self.t += PING_SECONDS
+            if remaining <= step:
+                self.lat, self.lng = lat, lng
+                self._ping()
+                return
+            self.lat += dy / remaining * step / _M_PER_DEG
+            self.lng += dx / remaining * step / (_M_PER_DEG * math.cos(math.radians(self.lat)))
+            self._ping()
+
+    def offset(self, north_m, east_m):
+        return (
+            self.lat + north_m / _M_PER_DEG,
+            self.lng + east_m / (_M_PER_DEG * math.cos(math.radians(self.lat))),
+        )
+
+
+def simulate(tourists: int, seed: int = 7):
+    """
+    -> (events sorted by time, labels [(tourist_id, kind, start)]).
+    An injected anomaly ends the tourist's log, as a lost phone would.
+    """
+    rng = random.Random(seed)
+    start = time.time() - 86400
+    events, labels = [], []
+
+    for tourist_id in range(1, tourists + 1):
+        hotel = (12.97 + rng.uniform(-0.05, 0.05), 77.59 + rng.uniform(-0.05, 0.05))
+        walker = _Walker(rng, tourist_id, *hotel, start + rng.uniform(0, 3600))
+        walker._ping()
+        # Night at the hotel, long enough to be learned as the rest place
+        walker.stay(rng.uniform(5, 7) * 3600)
+
+        inject = rng.choice(KINDS + (None,) * 5)
+        inject_at = rng.randint(2, 6)
+        for stop in range(8):
+            # Attractions within ~1.5 km of the hotel, 5-40 minute visits
+            target = (
+                hotel[0] + rng.uniform(-1500, 1500) / _M_PER_DEG,
+                hotel[1] + rng.uniform(-1500, 1500) / _M_PER_DEG,
+            )
+            walker.move_to(*target, speed=rng.uniform(0.9, 1.5))
+
+            if stop == inject_at and inject == "speed":
+                # Driven away: ~54 km/h for 10 minutes
+                labels.append((tourist_id, "speed", walker.t))
+                walker.move_to(*walker.offset(rng.uniform(-1, 1) * 9000, 9000), speed=15.0)
+                walker.stay(1800)
+                break
+            if stop == inject_at and inject == "stray":
+                # Wanders off on foot, well outside the usual area
+                labels.append((tourist_id, "stray", walker.t))
+                walker.move_to(*walker.offset(6000, rng.uniform(-1, 1) * 2000), speed=1.4)
+                walker.stay(1200)
+                break
+            if stop == inject_at and inject == "inactivity":
+                # Stops (or the phone goes quiet) away from the hotel
+                labels.append((tourist_id, "inactivity", walker.t))
+                walker.stay(2 * 3600, silent=rng.random() < 0.5)
+                break
+
+            walker.stay(rng.uniform(5, 40) * 60)
+        else:
+            walker.move_to(*hotel, speed=1.2)
+
+        events.extend(walker.events)
+
+    events.sort()
+    return events, labels
+
+
+# --------------------------------
+# Replay sources
+# --------------------------------
+def _batches_to_events(batches):
+    for batch in batches:
+        columns = batch.to_pydict()
+        for tourist_id, lat, lng, ts in zip(
+            columns["tourist_id"], columns["latitude"], columns["longitude"], columns["timestamp"]
+        ):
+            if tourist_id is not None and lat is not None and lng is not None:
+                yield ts.replace(tzinfo=timezone.utc).timestamp(), tourist_id, lat, lng
+
+
+def load_export(path: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(".parquet"):
+        batches = pq.ParquetFile(path).iter_batches()
+    else:
+        batches = pa.ipc.open_stream(open(path, "rb"))
+    return sorted(_batches_to_events(batches))
+
+
+def load_db():
+    from sqlalchemy import select
+
+    from app.database import engine
+    from app.models.location_event import LocationEvent
+
+    table = LocationEvent.__table__
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(table.c.timestamp, table.c.tourist_id, table.c.latitude, table.c.longitude)
+            .where(table.c.tourist_id.is_not(None), table.c.latitude.is_not(None), table.c.longitude.is_not(None))
+            .order_by(table.c.timestamp)
+        )
+        return [(ts.replace(tzinfo=timezone.utc).timestamp(), tourist_id, lat, lng) for ts, tourist_id, lat, lng in rows]
+
+
+# --------------------------------
+# Replay + scoring
+# --------------------------------
+def replay(events):
+    det = detector()
+    found = []
+    next_sweep = events[0][0] + SWEEP_SECONDS if events else 0
+
+    started = time.perf_counter()
+    for ts, tourist_id, lat, lng in events:
+        if ts >= next_sweep:
+            found.extend(det.sweep(ts))
+            next_sweep = ts + SWEEP_SECONDS
+        found.extend(det.observe(tourist_id, lat, lng, ts))
+    if events:
+        found.extend(det.sweep(events[-1][0] + settings.ANOMALY_IDLE_MINUTES * 60 * 2))
+    return found, time.perf_counter() - started
+
+
+def score(found, labels):
+    """
+    Recall: labels flagged with their own kind within
+    TOLERANCE_SECONDS. Precision: flags raised for tourists after their
+    anomaly started (any kind; a tourist driven away also strays).
+    """
+    started = {tourist_id: start for tourist_id, _, start in labels}
+    true_flags = [anomaly for anomaly in found if anomaly.timestamp >= started.get(anomaly.tourist_id, math.inf)]
+
+    print(f"\n{'kind':>12} {'labels':>8} {'detected':>9} {'recall':>8} {'delay min':>10}")
+    for kind in KINDS:
+        kind_labels = [label for label in labels if label[1] == kind]
+        delays = []
+        for tourist_id, _, start in kind_labels:
+            hits = [
+                anomaly.timestamp - start for anomaly in found
+                if anomaly.tourist_id == tourist_id and anomaly.kind == kind
+                and start <= anomaly.timestamp <= start + TOLERANCE_SECONDS
+            ]
+            if hits:
+                delays.append(min(hits))
+        recall = len(delays) / len(kind_labels) if kind_labels else float("nan")
+        delay = median(delays) / 60 if delays else float("nan")
+        print(f"{kind:>12} {len(kind_labels):>8} {len(delays):>9} {recall:>8.2f} {delay:>10.1f}")
+
+    false_flags = Counter(anomaly.kind for anomaly in found if anomaly not in true_flags)
+    print(f"\nprecision {len(true_flags) / len(found) if found else float('nan'):.3f} "
+          f"({len(found) - len(true_flags)} false flags: {dict(false_flags)})")
+
+
+def state_bytes(tourists: int = 100_000) -> float:
+    det = detector()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for tourist_id in range(tourists):
+        det.observe(tourist_id, 12.97, 77.59, 1.0)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / tourists
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tourists", type=int, default=1000)
+    parser.add_argument("--export")
+    parser.add_argument("--db", action="store_true")
+    args = parser.parse_args()
+
+    labels = None
+    if args.export:
+        events = load_export(args.export)
+    elif args.db:
+        events = load_db()
+    else:
+        events, labels = simulate(args.tourists)
+
+    found, seconds = replay(events)
+    print(f"{len(events)} events, {len({event[1] for event in events})} tourists")
+    print(f"replay {len(events) / seconds:,.0f} events/s, {seconds:.2f}s")
+    print(f"flags by kind: {dict(Counter(anomaly.kind for anomaly in found))}")
+    if labels is not None:
+        score(found, labels)
+
+    per_tourist = state_bytes()
+    print(f"\nstate {per_tourist:.0f} bytes/tourist, "
+          f"{per_tourist * settings.ANOMALY_MAX_TOURISTS / 2 ** 20:,.0f} MiB at ANOMALY_MAX_TOURISTS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Redis backplane round trip against a local stand-in (fakeredis):
+a broadcast on one manager reaches a dashboard on another, a bad
+message does not stop the listener, and the listener resubscribes
+after its connection is dropped.
+
+Run from backend/ (needs `pip install fakeredis`):
+    python -m benchmarks.backplane_check
+"""
+import asyncio
+import json
+import time
+
+from app.core.backplane import RedisBackplane
+from app.core.websocket_manager import ConnectionManager
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.received.append(json.loads(data))
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+
+async def _wait_for(websocket: RecordingWebSocket, message_type: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for message in websocket.received:
+            if message.get("type") == message_type:
+                return message
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{message_type} not delivered within {timeout}s")
+
+
+async def _worker(server) -> tuple:
+    import fakeredis
+
+    client = fakeredis.FakeAsyncRedis(server=server)
+    manager = ConnectionManager()
+    await manager.start(RedisBackplane(client=client))
+    websocket = RecordingWebSocket()
+    await manager.connect(websocket)
+    return manager, websocket, client
+
+
+async def main():
+    try:
+        import fakeredis
+    except ImportError:
+        raise SystemExit("backplane_check needs fakeredis: pip install fakeredis")
+
+    server = fakeredis.FakeServer()
+    (a, _, client), (b, dashboard, _) = await _worker(server), await _worker(server)
+    backplane = b.backplane
+
+    try:
+        started = time.perf_counter()
+        await a.broadcast({"type": "incident_created", "data": {"id": 1}}, zone_id=3)
+        message = await _wait_for(dashboard, "incident_created")
+        print(f"round trip        ok  {(time.perf_counter() - started) * 1000:.1f}ms  {message}")
+
+        await client.publish("sts:broadcast", b"not an envelope")
+        await a.broadcast({"type": "incident_updated", "data": {"id": 1}}, zone_id=3)
+        await _wait_for(dashboard, "incident_updated")
+        print("bad message       ok  listener still delivering")
+
+        # Drop the subscriber's connection under the running listener
+        await backplane._pubsub.aclose()
+        deadline = time.monotonic() + 10
+        while True:
+            await a.broadcast({"type": "tourist_created", "data": {"id": 2}}, tourist_id=2)
+            try:
+                await _wait_for(dashboard, "tourist_created", timeout=0.5)
+                break
+            except AssertionError:
+                if time.monotonic() > deadline:
+                    raise
+        print("connection drop   ok  resubscribed and delivering")
+    finally:
+        await a.stop()
+        await b.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Broadcast CPU cost: per-client send_json vs encode-once.
+
+Run from backend/:
+    python -m benchmarks.broadcast_bench
+"""
+import asyncio
+import json
+import time
+
+from app.core.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """
+    Mirrors starlette's WebSocket send path without a network.
+    """
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        await self._send({"type": "websocket.send", "text": data})
+
+    async def send_bytes(self, data: bytes):
+        await self._send({"type": "websocket.send", "bytes": data})
+
+    async def send_json(self, data):
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        await self._send({"type": "websocket.send", "text": text})
+
+    async def _send(self, message: dict):
+        pass
+
+
+def sample_message(i: int) -> dict:
+    return {
+        "type": "tourist_updated",
+        "data": {
+            "id": i,
+            "email": f"tourist{i}@example.com",
+            "full_name": "Jane Traveller",
+            "phone": "+91 98450 00000",
+            "emergency_contact": "+91 98450 11111",
+            "blood_group": "O+",
+            "medical_conditions": "Asthma; carries inhaler. " * 40,
+            "allergies": "Penicillin, peanuts",
+            "date_of_birth": "1990-04-12",
+            "gender": "female",
+            "nationality": "IN",
+            "activity_status": "active",
+        },
+    }
+
+
+async def per_client_send_json(manager: ConnectionManager, message: dict):
+    # The original broadcast loop
+    for connection in manager.active_connections:
+        await connection.send_json(message)
+
+
+async def bench(clients: int, broadcasts: int, compressed: bool = False) -> tuple[float, float]:
+    manager = ConnectionManager()
+    for _ in range(clients):
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        manager.set_compression(ws, compressed)
+
+    start = time.process_time()
+    for i in range(broadcasts):
+        await per_client_send_json(manager, sample_message(i))
+    baseline = time.process_time() - start
+
+    start = time.process_time()
+    for i in range(broadcasts):
+        await manager.broadcast(sample_message(i), tourist_id=i)
+    encoded = time.process_time() - start
+
+    return baseline / broadcasts, encoded / broadcasts
+
+
+async def main():
+    print(f"{'clients':>8} {'send_json/bcast':>16} {'encode-once':>12} {'+deflate':>10} {'speedup':>8}")
+    for clients, broadcasts in ((1, 5000), (100, 500), (1000, 100)):
+        baseline, encoded = await bench(clients, broadcasts)
+        _, deflated = await bench(clients, broadcasts, compressed=True)
+        print(
+            f"{clients:>8} {baseline * 1e6:>14.1f}us {encoded * 1e6:>10.1f}us "
+            f"{deflated * 1e6:>8.1f}us {baseline / encoded:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
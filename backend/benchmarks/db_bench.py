@@ -0,0 +1,114 @@
+"""
+Concurrent incident writes: legacy sync Session inside async
+handlers (blocks the event loop) vs the AsyncSession path.
+
+Run from backend/ (needs httpx; DATABASE_URL may point at Postgres):
+    python -m benchmarks.db_bench [concurrency] [requests]
+
+Above the sync pool size (5 + 10 overflow) the sync path stalls:
+checkouts block the loop that would return connections, until the
+30s pool timeout fires.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{tempfile.gettempdir()}/db_bench.db",
+)
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import Base, engine
+from app.dependencies import get_async_db, get_db
+from app.models.incident import Incident
+from app.schemas.incident_schema import IncidentCreate
+from app.services.incident_service import create_incident
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/")
+async def health():
+    return {"status": "ok"}
+
+
+@bench_app.post("/sync")
+async def create_sync(data: IncidentCreate, db: Session = Depends(get_db)):
+    # The pre-async pattern: blocking commit on the event loop
+    incident = Incident(**data.model_dump(), tourist_id=1, status="open")
+    db.add(incident)
+    db.commit()
+    db.refresh(incident)
+    return {"id": incident.id}
+
+
+@bench_app.post("/async")
+async def create_async(data: IncidentCreate, db: AsyncSession = Depends(get_async_db)):
+    incident = await create_incident(db, 1, data.description, data.latitude, data.longitude)
+    return {"id": incident.id}
+
+
+async def run(path: str, concurrency: int, requests: int) -> tuple[float, float, float]:
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+        latencies = []
+        done = asyncio.Event()
+
+        # A cheap request racing the writes shows event-loop stalls
+        async def health_probe():
+            worst = 0.0
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/")
+                worst = max(worst, time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+            return worst
+
+        async def worker():
+            for i in remaining:
+                start = time.perf_counter()
+                response = await client.post(path, json={
+                    "description": f"bench {i}",
+                    "latitude": 12.97,
+                    "longitude": 77.59,
+                })
+                assert response.status_code == 200, response.text
+                latencies.append(time.perf_counter() - start)
+
+        probe = asyncio.create_task(health_probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        worst_probe = await probe
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return requests / elapsed, p99, worst_probe
+
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    print(f"{requests} incident writes, concurrency {concurrency}, {engine.url.get_backend_name()}")
+    print(f"{'path':>6} {'req/sec':>9} {'p99':>9} {'worst GET /':>12}")
+    for path in ("/sync", "/async"):
+        rate, p99, probe = await run(path, concurrency, requests)
+        print(f"{path:>6} {rate:>9.1f} {p99 * 1000:>7.1f}ms {probe * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
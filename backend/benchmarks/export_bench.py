@@ -0,0 +1,99 @@
+"""
+Columnar export throughput and peak memory: streaming row groups
+versus loading the whole range with a plain SELECT *.
+
+Run from backend/ (DATABASE_URL may point at Postgres with data):
+    python -m benchmarks.export_bench [rows] [--naive]
+
+Each mode runs in a fresh process so peak RSS is its own. The naive
+mode is opt-in: at 50M rows it needs tens of GB.
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{tempfile.gettempdir()}/export_bench.db",
+)
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from sqlalchemy import func, insert, select
+
+from app.database import Base, engine
+from app.models.location_event import LocationEvent
+from app.models.user import User  # noqa: F401  (FK target)
+from app.services.export_service import export_to_file
+
+START = datetime(2026, 1, 1)
+END = datetime(2027, 1, 1)
+SEED_CHUNK = 100000
+
+
+def seed(rows: int):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        have = conn.execute(select(func.count()).select_from(LocationEvent.__table__)).scalar()
+    if have >= rows:
+        return
+
+    rng = random.Random(42)
+    step = (END - START) / rows
+    table = LocationEvent.__table__
+    for offset in range(have, rows, SEED_CHUNK):
+        chunk = [
+            {
+                "tourist_id": rng.randint(1, 5000),
+                "device_id": f"gw-{rng.randint(1, 200)}",
+                "zone_id": rng.randint(1, 50),
+                "rssi": rng.uniform(-90, -40),
+                "latitude": 12.9 + rng.random() / 10,
+                "longitude": 77.5 + rng.random() / 10,
+                "source": rng.choice(("BLE", "GNSS", "RFID")),
+                "sos_flag": False,
+                "timestamp": START + step * i,
+            }
+            for i in range(offset, min(offset + SEED_CHUNK, rows))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(table), chunk)
+
+
+def measure(mode: str):
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        if mode == "streaming":
+            rows = export_to_file(conn, os.devnull, "parquet", START, END)
+        else:
+            rows = len(conn.execute(select(LocationEvent.__table__)).fetchall())
+    elapsed = time.perf_counter() - started
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>10} {rows:>11} {rows / elapsed:>10.0f} {peak_mb:>10.0f}MB")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        measure(sys.argv[2])
+        return
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 50_000_000
+    modes = ["streaming"] + (["naive"] if "--naive" in sys.argv else [])
+
+    seed(rows)
+    print(f"{rows} location events, {engine.url.get_backend_name()}")
+    print(f"{'mode':>10} {'rows':>11} {'rows/sec':>10} {'peak RSS':>12}")
+    for mode in modes:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.export_bench", "--measure", mode],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
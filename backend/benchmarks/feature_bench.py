@@ -0,0 +1,95 @@
+"""
+All-zone feature computation: one query per zone versus one grouped
+pass (SQL) versus the in-memory sliding window.
+
+Run from backend/ (DATABASE_URL may point at Postgres):
+    python -m benchmarks.feature_bench [zones] [events_per_zone]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{tempfile.gettempdir()}/feature_bench.db",
+)
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.core.zone_features import zone_windows
+from app.database import Base, SessionLocal, engine
+from app.models.location_event import LocationEvent
+from app.models.user import User  # noqa: F401  (FK target)
+from app.models.zone_status import ZoneStatus  # noqa: F401
+from app.services.feature_service import aggregate_zone_features, compute_zone_feature_matrix
+
+WINDOW_MINUTES = 10
+
+
+def seed(zones: int, per_zone: int):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    rows = []
+    for zone_id in range(1, zones + 1):
+        for _ in range(per_zone):
+            # Half inside the window, half older history
+            age = rng.uniform(0, WINDOW_MINUTES * 60 * 0.9) if rng.random() < 0.5 else rng.uniform(3600, 86400 * 7)
+            ts = now - timedelta(seconds=age)
+            row = {
+                "tourist_id": None,
+                "device_id": f"gw-{rng.randint(1, 300)}",
+                "zone_id": zone_id,
+                "rssi": rng.uniform(-90, -40),
+                "source": "BLE",
+                "sos_flag": rng.random() < 0.01,
+                "timestamp": ts,
+            }
+            rows.append(row)
+            zone_windows.record(zone_id, row["device_id"], row["rssi"], row["sos_flag"], ts.replace(tzinfo=timezone.utc).timestamp())
+
+    with engine.begin() as conn:
+        conn.execute(insert(LocationEvent.__table__), rows)
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    zones = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    per_zone = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    seed(zones, per_zone)
+    zone_ids = list(range(1, zones + 1))
+    db = SessionLocal()
+
+    settings.ZONE_FEATURES_STREAMING = False
+    per_zone_loop = timed(lambda: [aggregate_zone_features(db, z, WINDOW_MINUTES) for z in zone_ids])
+    grouped = timed(lambda: compute_zone_feature_matrix(db, WINDOW_MINUTES, zone_ids))
+
+    settings.ZONE_FEATURES_STREAMING = True
+    zone_windows.started_at -= WINDOW_MINUTES * 60
+    window = timed(lambda: compute_zone_feature_matrix(db, WINDOW_MINUTES, zone_ids))
+    db.close()
+
+    print(f"{zones} zones x {per_zone} events, {WINDOW_MINUTES}-minute window, {engine.url.get_backend_name()}")
+    print(f"{'path':>16} {'ms':>10}")
+    for label, seconds in (("per-zone loop", per_zone_loop), ("grouped SQL", grouped), ("sliding window", window)):
+        print(f"{label:>16} {seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
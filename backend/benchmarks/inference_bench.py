@@ -0,0 +1,79 @@
+"""
+Risk model inference: per-row predict() calls versus batched calls,
+and the micro-batcher under concurrent single-row requests.
+
+Run from backend/:
+    python -m benchmarks.inference_bench [rows]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from app.core.inference import InferenceBatcher
+from app.services.feature_service import FEATURES
+from app.services.risk_model import get_risk_model
+
+BATCH_SIZES = (1, 8, 32, 128, 512)
+
+
+def sample_rows(n: int):
+    rng = random.Random(7)
+    rows = []
+    for _ in range(n):
+        count = rng.randint(0, 400)
+        sos = rng.randint(0, 2) if rng.random() < 0.05 else 0
+        devices = rng.randint(0, max(count // 3, 1))
+        rows.append([count, rng.uniform(-90, -40), rng.uniform(0, 300), devices, devices, sos, sos / count if count else 0.0])
+    return rows
+
+
+def direct(model, rows, batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        model.predict(rows[i:i + batch_size])
+    return time.perf_counter() - start
+
+
+async def batched(model, rows, concurrency: int):
+    batcher = InferenceBatcher(max_batch=512, max_wait_ms=2)
+    batcher.start(model)
+    queue = iter(rows)
+
+    async def client():
+        for row in queue:
+            await batcher.score(row)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = dict(batcher.stats)
+    await batcher.stop()
+    return elapsed, stats
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    model = get_risk_model()
+    rows = sample_rows(n)
+    assert len(rows[0]) == len(FEATURES)
+    model.predict(rows[:1])
+
+    print(f"model {model.name}, {n} rows")
+    print(f"{'batch size':>12} {'rows/s':>12} {'us/row':>10}")
+    for size in BATCH_SIZES:
+        seconds = direct(model, rows, size)
+        print(f"{size:>12} {n / seconds:>12.0f} {seconds / n * 1e6:>10.2f}")
+
+    print(f"\n{'concurrency':>12} {'rows/s':>12} {'avg batch':>10}")
+    for concurrency in (1, 32, 256):
+        seconds, stats = asyncio.run(batched(model, rows, concurrency))
+        print(f"{concurrency:>12} {n / seconds:>12.0f} {stats['requests'] / max(stats['batches'], 1):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Login throughput under concurrent load, with and without the
+password-hashing process pool.
+
+Run from backend/ (needs httpx):
+    python -m benchmarks.login_bench [concurrency] [logins]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{tempfile.gettempdir()}/login_bench.db",
+)
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+import httpx
+
+from app.config import settings
+from app.database import Base, engine
+from app.main import app
+from app.utils import helpers
+
+USERS = 50
+
+
+async def run(concurrency: int, logins: int, workers: int) -> tuple[float, float, float]:
+    settings.PASSWORD_HASH_WORKERS = workers
+    helpers.shutdown_hash_pool()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+        queue = asyncio.Queue()
+        for i in range(logins):
+            queue.put_nowait(i % USERS)
+
+        # A cheap request racing the logins shows event-loop starvation
+        async def health_probe():
+            worst = 0.0
+            while not queue.empty():
+                start = time.perf_counter()
+                await client.get("/")
+                worst = max(worst, time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+            return worst
+
+        async def worker():
+            while not queue.empty():
+                i = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post(
+                    "/login",
+                    json={"email": f"bench{i}@example.com", "password": "secret"},
+                )
+                assert response.status_code == 200, response.text
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        probe = asyncio.create_task(health_probe())
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        worst_probe = await probe
+
+    helpers.shutdown_hash_pool()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return logins / elapsed, p99, worst_probe
+
+
+async def setup():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    settings.PASSWORD_HASH_WORKERS = 0
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(USERS):
+            await client.post("/register", json={
+                "email": f"bench{i}@example.com",
+                "password": "secret",
+                "role": "tourist",
+            })
+
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    pool_size = os.cpu_count() or 4
+
+    await setup()
+
+    print(f"{logins} logins, concurrency {concurrency}, {settings.PASSWORD_HASH_ROUNDS} rounds")
+    print(f"{'mode':>14} {'logins/sec':>11} {'p99':>9} {'worst GET /':>12}")
+    for label, workers in (("inline", 0), (f"pool x{pool_size}", pool_size)):
+        rate, p99, probe = await run(concurrency, logins, workers)
+        print(f"{label:>14} {rate:>11.1f} {p99 * 1000:>7.1f}ms {probe * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
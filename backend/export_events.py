@@ -0,0 +1,49 @@
+"""
+Export location events to a Parquet / Arrow IPC file.
+
+    python export_events.py --start 2026-06-01 --end 2026-07-01 \
+        --format parquet --zone 7 --out events.parquet
+"""
+import argparse
+import time
+from datetime import datetime
+
+from app.database import ReadSessionLocal
+from app.services.export_service import FORMATS, export_to_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--end", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet")
+    parser.add_argument("--zone", type=int, dest="zone_id")
+    parser.add_argument("--source")
+    parser.add_argument("--tourist", type=int, dest="tourist_id")
+    parser.add_argument("--batch-size", type=int, help="rows per row group")
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = ReadSessionLocal()
+    try:
+        rows = export_to_file(
+            db.connection(),
+            args.out,
+            args.format,
+            args.start,
+            args.end,
+            zone_id=args.zone_id,
+            source=args.source,
+            tourist_id=args.tourist_id,
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"{rows} rows -> {args.out} in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,20 @@ import alertSound from "../assets/alert.mp3";
 
 const WebSocketContext = createContext();
 
+// Upsert stream entities (incidents, tourists) into a REST-loaded list
+export const mergeById = (list, items = []) => {
+  if (!items.length) return list;
+  const byId = new Map(list.map((item) => [item.id, item]));
+  items.forEach((item) => byId.set(item.id, { ...byId.get(item.id), ...item }));
+  return [...byId.values()];
+};
+
 export const WebSocketProvider = ({ children }) => {
   const socketRef = useRef(null);
+  const streamRef = useRef({ epoch: null, seq: 0 });
   const [notifications, setNotifications] = useState([]);
+  const [snapshot, setSnapshot] = useState(null);
+  const [resyncedAt, setResyncedAt] = useState(0);
   const playSound = useSound(alertSound);
 
   useEffect(() => {
@@ -18,6 +29,7 @@ export const WebSocketProvider = ({ children }) => {
     if (socketRef.current) return;
 
     const ws = new WebSocket("ws://localhost:8000/ws/dashboard");
+    let serverEpoch = null;
 
     ws.onopen = () => {
       console.log("WebSocket connected");
@@ -26,6 +38,35 @@ export const WebSocketProvider = ({ children }) => {
     ws.onmessage = (event) => {
       const data = JSON.parse(event.data);
 
+      // Resume from the last seen message after a reconnect
+      if (data.type === "hello") {
+        serverEpoch = data.epoch;
+        if (streamRef.current.epoch) {
+          ws.send(JSON.stringify({ action: "resume", ...streamRef.current }));
+        } else {
+          streamRef.current = { epoch: data.epoch, seq: data.seq };
+        }
+        return;
+      }
+
+      // Entities changed while disconnected; pages merge them in
+      if (data.type === "snapshot") {
+        streamRef.current = { epoch: data.epoch, seq: data.seq };
+        setSnapshot(data);
+        return;
+      }
+
+      // The server cannot catch us up: continue live and refetch
+      if (data.type === "resync_required") {
+        streamRef.current = { epoch: serverEpoch, seq: data.seq };
+        setResyncedAt(Date.now());
+        return;
+      }
+
+      if (data.seq) {
+        streamRef.current.seq = data.seq;
+      }
+
       if (data.type === "incident_created") {
         addNotification("New Incident Reported");
         playSound();
@@ -73,6 +114,8 @@ export const WebSocketProvider = ({ children }) => {
       value={{
         notifications,
         clearNotifications,
+        snapshot,
+        resyncedAt,
       }}
     >
       {children}
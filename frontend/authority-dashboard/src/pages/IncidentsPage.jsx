@@ -4,10 +4,10 @@ import IncidentCard from "../components/IncidentCard";
 import LoadingSpinner from "../components/LoadingSpinner";
 import IncidentDetailModal from "../components/IncidentDetailModal";
 import incidentService from "../services/incidentService";
-import { useWebSocket } from "../context/WebSocketContext";
+import { mergeById, useWebSocket } from "../context/WebSocketContext";
 
 const IncidentsPage = () => {
-  const { notifications } = useWebSocket();
+  const { notifications, snapshot, resyncedAt } = useWebSocket();
 
   const [incidents, setIncidents] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -32,6 +32,15 @@ const IncidentsPage = () => {
     }
   };
 
+  useEffect(() => {
+    if (!snapshot) return;
+    setIncidents((prev) => mergeById(prev, snapshot.data.incidents));
+  }, [snapshot]);
+
+  useEffect(() => {
+    if (resyncedAt) loadIncidents();
+  }, [resyncedAt]);
+
   // 🔴 Live Update Listener
   useEffect(() => {
     if (!notifications.length) return;
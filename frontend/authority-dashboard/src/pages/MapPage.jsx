@@ -12,7 +12,7 @@ import incidentService from "../services/incidentService";
 import touristService from "../services/touristService";
 import LoadingSpinner from "../components/LoadingSpinner";
 import { MAP_CONFIG } from "../constants/config";
-import { useWebSocket } from "../context/WebSocketContext";
+import { mergeById, useWebSocket } from "../context/WebSocketContext";
 
 import markerIcon from "leaflet/dist/images/marker-icon.png";
 import markerShadow from "leaflet/dist/images/marker-shadow.png";
@@ -43,7 +43,7 @@ const MapController = ({ position }) => {
 };
 
 const MapPage = () => {
-  const { notifications } = useWebSocket();
+  const { notifications, snapshot, resyncedAt } = useWebSocket();
 
   const [incidents, setIncidents] = useState([]);
   const [tourists, setTourists] = useState([]);
@@ -57,6 +57,16 @@ const MapPage = () => {
     loadData();
   }, []);
 
+  useEffect(() => {
+    if (!snapshot) return;
+    setIncidents((prev) => mergeById(prev, snapshot.data.incidents));
+    setTourists((prev) => mergeById(prev, snapshot.data.tourists));
+  }, [snapshot]);
+
+  useEffect(() => {
+    if (resyncedAt) loadData();
+  }, [resyncedAt]);
+
   useEffect(() => {
     if (!notifications.length) return;
     loadData();
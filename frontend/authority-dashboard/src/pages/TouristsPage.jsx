@@ -2,10 +2,10 @@ import React, { useEffect, useMemo, useState } from "react";
 import touristService from "../services/touristService";
 import incidentService from "../services/incidentService";
 import LoadingSpinner from "../components/LoadingSpinner";
-import { useWebSocket } from "../context/WebSocketContext";
+import { mergeById, useWebSocket } from "../context/WebSocketContext";
 
 const TouristsPage = () => {
-  const { notifications } = useWebSocket();
+  const { notifications, snapshot, resyncedAt } = useWebSocket();
 
   const [tourists, setTourists] = useState([]);
   const [incidents, setIncidents] = useState([]);
@@ -27,6 +27,16 @@ const TouristsPage = () => {
     setLoading(false);
   };
 
+  useEffect(() => {
+    if (!snapshot) return;
+    setTourists((prev) => mergeById(prev, snapshot.data.tourists));
+    setIncidents((prev) => mergeById(prev, snapshot.data.incidents));
+  }, [snapshot]);
+
+  useEffect(() => {
+    if (resyncedAt) loadData();
+  }, [resyncedAt]);
+
   useEffect(() => {
     if (!notifications.length) return;
     loadData();